@@ -6,14 +6,28 @@ bridge logic for use by the Explorer agent.
 
 from __future__ import annotations
 
-import re
+import heapq
+from operator import itemgetter
 from pathlib import Path
 
 from crewai.tools import tool
 
-from hammy.schema.models import Node, NodeType
-from hammy.tools.ast_tools import extract_symbols
+from hammy.indexer.ast_cache import AstCache
+from hammy.schema.models import Edge, Node, NodeType, RelationType
+from hammy.tools.brain_batch import BatchingBrain, unsaved_warning
+from hammy.tools.bridge import resolve_bridges
+from hammy.tools.diff_analysis import analyze_diff
+from hammy.tools.hotspot import compute_hotspots
+from hammy.tools.hybrid_search import BM25Index, build_bm25_index, hybrid_search
 from hammy.tools.parser import ParserFactory
+from hammy.tools.recall_cache import RecallCache
+from hammy.tools.symbol_index import (
+    build_symbol_index,
+    name_filter,
+    names_matcher,
+    strip_qualifier,
+    word_pattern,
+)
 
 
 def make_explorer_tools(
@@ -23,29 +37,50 @@ def make_explorer_tools(
     all_edges: list,
     qdrant=None,
     bm25_index=None,
+    brain_batch_size: int = 0,
+    brain_flush_ms: int = 100,
 ) -> list:
-    """Create Explorer agent tools bound to the current project context."""
-
-    @tool("AST Query")
-    def ast_query(file_path: str, query_type: str = "all") -> str:
-        """You know the file — now see what's in it. Returns every class, function, method, endpoint,
-        and import with line numbers, visibility, and LLM summaries. Use query_type to focus:
-        'classes', 'functions', 'methods', 'endpoints', or 'imports'.
-
-        Args:
-            file_path: Path to the file (relative to project root).
-            query_type: What to extract - 'all', 'classes', 'functions', 'methods', 'endpoints', or 'imports'.
-        """
-        full_path = project_root / file_path
-        if not full_path.exists():
-            return f"File not found: {file_path}"
-
-        result = parser_factory.parse_file(full_path)
+    """Create Explorer agent tools bound to the current project context.
+
+    With brain_batch_size > 0, store_context queues writes and flushes them
+    to Qdrant in batches (see BatchingBrain).
+    """
+    index = build_symbol_index(all_nodes, all_edges)
+    ast_cache = AstCache(project_root, parser_factory)
+    bm25_cache: list[BM25Index] = []
+
+    def _search_line(n: Node) -> str:
+        """One-line rendering of a symbol for search_symbols."""
+        summary = f" | {n.summary}" if n.summary else ""
+        return f"{n.type.value}: {n.name} ({n.loc.file}:{n.loc.lines[0]}){summary}"
+
+    def _definition(n: Node) -> str:
+        """Multi-line definition block for lookup_symbol."""
+        parts = [
+            f"{n.type.value}: {n.name}",
+            f"  file: {n.loc.file}:{n.loc.lines[0]}-{n.loc.lines[1]}",
+            f"  language: {n.language}",
+        ]
+        if n.meta.visibility:
+            parts.append(f"  visibility: {n.meta.visibility}")
+        if n.meta.parameters:
+            parts.append(f"  params: {', '.join(n.meta.parameters)}")
+        if n.meta.return_type:
+            parts.append(f"  returns: {n.meta.return_type}")
+        if n.meta.is_async:
+            parts.append("  async: true")
+        if n.summary:
+            parts.append(f"  summary: {n.summary}")
+        return "\n".join(parts)
+
+    def _ast_report(
+        file_path: str, result: tuple[list[Node], list[Edge]] | None, query_type: str
+    ) -> str:
+        """Format one file's extracted symbols for ast_query / ast_query_batch."""
         if result is None:
             return f"Unsupported file type: {file_path}"
 
-        tree, lang = result
-        nodes, edges = extract_symbols(tree, lang, file_path)
+        nodes, edges = result
 
         type_filter = {
             "classes": NodeType.CLASS,
@@ -58,7 +93,6 @@ def make_explorer_tools(
             nodes = [n for n in nodes if n.type == type_filter]
 
         if query_type == "imports":
-            from hammy.schema.models import RelationType
             import_edges = [e for e in edges if e.relation == RelationType.IMPORTS]
             return "\n".join(
                 f"import: {e.metadata.context}" for e in import_edges
@@ -66,19 +100,57 @@ def make_explorer_tools(
 
         lines = []
         for n in nodes:
-            line = f"{n.type.value}: {n.name} ({n.loc.file}:{n.loc.lines[0]}-{n.loc.lines[1]})"
-            if n.meta.visibility:
-                line += f" [{n.meta.visibility}]"
-            if n.meta.is_async:
-                line += " [async]"
-            if n.meta.return_type:
-                line += f" -> {n.meta.return_type}"
-            if n.summary:
-                line += f" | {n.summary}"
-            lines.append(line)
+            vis = f" [{n.meta.visibility}]" if n.meta.visibility else ""
+            is_async = " [async]" if n.meta.is_async else ""
+            ret = f" -> {n.meta.return_type}" if n.meta.return_type else ""
+            summary = f" | {n.summary}" if n.summary else ""
+            lines.append(
+                f"{n.type.value}: {n.name} ({n.loc.file}:{n.loc.lines[0]}-{n.loc.lines[1]})"
+                f"{vis}{is_async}{ret}{summary}"
+            )
 
         return "\n".join(lines) or "No symbols found."
 
+    @tool("AST Query")
+    def ast_query(file_path: str, query_type: str = "all") -> str:
+        """You know the file — now see what's in it. Returns every class, function, method, endpoint,
+        and import with line numbers, visibility, and LLM summaries. Use query_type to focus:
+        'classes', 'functions', 'methods', 'endpoints', or 'imports'.
+
+        Args:
+            file_path: Path to the file (relative to project root).
+            query_type: What to extract - 'all', 'classes', 'functions', 'methods', 'endpoints', or 'imports'.
+        """
+        full_path = project_root / file_path
+        if not full_path.exists():
+            return f"File not found: {file_path}"
+
+        return _ast_report(file_path, ast_cache.extract(file_path), query_type)
+
+    @tool("AST Query Batch")
+    def ast_query_batch(file_paths: str, query_type: str = "all") -> str:
+        """ast_query for several files at once — pass a comma-separated list of paths.
+        Files are parsed in parallel, so this beats N×ast_query when opening a module. Cap: 20 files.
+
+        Args:
+            file_paths: Comma-separated paths relative to project root (e.g. 'app/User.php, app/Plan.php').
+            query_type: What to extract - 'all', 'classes', 'functions', 'methods', 'endpoints', or 'imports'.
+        """
+        paths = [p.strip() for p in file_paths.split(",") if p.strip()][:20]
+        if not paths:
+            return "Provide at least one file path."
+
+        found = [p for p in paths if (project_root / p).exists()]
+        extracted = dict(zip(found, ast_cache.extract_many(found)))
+        sections = []
+        for path in paths:
+            if path in extracted:
+                report = _ast_report(path, extracted[path], query_type)
+            else:
+                report = f"File not found: {path}"
+            sections.append(f"=== {path} ===\n{report}")
+        return "\n\n".join(sections)
+
     @tool("Search Code Symbols")
     def search_symbols(
         query: str,
@@ -97,44 +169,19 @@ def make_explorer_tools(
             node_type: Optional type filter ('class', 'function', 'method', 'endpoint').
             file_filter: Optional path substring to restrict results (e.g. 'controllers/').
         """
-        query_lower = query.lower()
-        scored: list[tuple[int, Node]] = []
-
-        for node in all_nodes:
-            if node.type == NodeType.COMMENT:
-                continue
-            if language and node.language != language:
-                continue
-            if node_type and node.type.value != node_type:
-                continue
-            if file_filter and file_filter.lower() not in node.loc.file.lower():
-                continue
-
-            name_lower = node.name.lower()
-            if name_lower == query_lower:
-                scored.append((4, node))
-            elif name_lower.startswith(query_lower):
-                scored.append((3, node))
-            elif query_lower in name_lower:
-                scored.append((2, node))
-            elif query_lower in node.summary.lower():
-                scored.append((1, node))
-
-        if not scored:
+        results, total = index.search(query, language, node_type, file_filter)
+        if not results:
             return f"No symbols matching '{query}' found."
 
-        scored.sort(key=lambda x: (-x[0], len(x[1].name)))
-        results = [n for _, n in scored]
+        lines = [index.render("search", n, _search_line) for n in results]
 
-        lines = []
-        for n in results[:25]:
-            line = f"{n.type.value}: {n.name} ({n.loc.file}:{n.loc.lines[0]})"
-            if n.summary:
-                line += f" | {n.summary}"
-            lines.append(line)
-
-        if len(results) > 25:
-            lines.append(f"\n... and {len(results) - 25} more. Use file_filter or node_type to narrow.")
+        if total is None:
+            lines.append(
+                f"\n... and possibly more (at least {len(results)} symbols are named '{query}'). "
+                "Use file_filter or node_type to narrow."
+            )
+        elif total > len(results):
+            lines.append(f"\n... and {total - len(results)} more. Use file_filter or node_type to narrow.")
 
         return "\n".join(lines)
 
@@ -148,22 +195,10 @@ def make_explorer_tools(
             name: Exact symbol name to look up (case-insensitive).
             node_type: Optional type filter ('class', 'function', 'method', 'endpoint').
         """
-        name_lower = name.lower()
-        matches = [
-            n for n in all_nodes
-            if n.type != NodeType.COMMENT
-            and n.name.lower() == name_lower
-            and (not node_type or n.type.value == node_type)
-        ]
+        matches = index.named(name.casefold(), node_type=node_type)
 
         if not matches:
-            pattern = re.compile(r"\b" + re.escape(name) + r"\b", re.IGNORECASE)
-            matches = [
-                n for n in all_nodes
-                if n.type != NodeType.COMMENT
-                and pattern.search(n.name)
-                and (not node_type or n.type.value == node_type)
-            ]
+            matches = index.word_matches(name, node_type, limit=20)
             if not matches:
                 return (
                     f"Symbol '{name}' not found. "
@@ -175,20 +210,7 @@ def make_explorer_tools(
 
         lines = [prefix] if prefix else []
         for n in matches[:20]:
-            line = f"{n.type.value}: {n.name}"
-            line += f"\n  file: {n.loc.file}:{n.loc.lines[0]}-{n.loc.lines[1]}"
-            line += f"\n  language: {n.language}"
-            if n.meta.visibility:
-                line += f"\n  visibility: {n.meta.visibility}"
-            if n.meta.parameters:
-                line += f"\n  params: {', '.join(n.meta.parameters)}"
-            if n.meta.return_type:
-                line += f"\n  returns: {n.meta.return_type}"
-            if n.meta.is_async:
-                line += "\n  async: true"
-            if n.summary:
-                line += f"\n  summary: {n.summary}"
-            lines.append(line)
+            lines.append(index.render("definition", n, _definition))
 
         return "\n\n".join(lines)
 
@@ -202,23 +224,16 @@ def make_explorer_tools(
         Args:
             name: Exact symbol name to explain (case-insensitive).
         """
-        from hammy.schema.models import RelationType
-
-        name_lower = name.lower()
-        node_index = {n.id: n for n in all_nodes}
-        name_index: dict[str, list[Node]] = {}
-        for n in all_nodes:
-            if n.type != NodeType.COMMENT:
-                name_index.setdefault(n.name.lower(), []).append(n)
+        name_lower = name.casefold()
+        node_index = index.by_id
+        name_index = index.by_name
 
         matches = name_index.get(name_lower, [])
         if not matches:
-            pattern = re.compile(r"\b" + re.escape(name) + r"\b", re.IGNORECASE)
-            matches = [n for n in all_nodes if pattern.search(n.name)]
+            matches = index.word_matches(name, limit=5)
             if not matches:
                 return f"Symbol '{name}' not found."
 
-        call_edges = [e for e in all_edges if e.relation == RelationType.CALLS]
         sections: list[str] = []
 
         for sym in matches[:5]:
@@ -238,16 +253,14 @@ def make_explorer_tools(
 
             # Use bare name (last segment after :: or \) since call expressions
             # contain only the method name, not the fully-qualified node name
-            bare_name = re.split(r"::|\\", sym.name)[-1]
-            caller_pattern = re.compile(r"\b" + re.escape(bare_name) + r"\b", re.IGNORECASE)
+            bare_name = strip_qualifier(sym.name, split_dots=False)
             callers = []
-            for edge in call_edges:
-                ctx = edge.metadata.context or ""
-                if caller_pattern.search(ctx):
-                    caller_node = node_index.get(edge.source)
-                    if caller_node:
-                        callers.append(caller_node)
-            callers = callers[:10]
+            for source, _, _ in index.calls_naming(bare_name):
+                caller_node = node_index.get(source)
+                if caller_node:
+                    callers.append(caller_node)
+                    if len(callers) == 10:
+                        break
             if callers:
                 lines.append(f"\nCallers ({len(callers)} shown):")
                 for c in callers:
@@ -256,15 +269,12 @@ def make_explorer_tools(
                 lines.append("\nCallers: none found")
 
             callees = []
-            for edge in call_edges:
-                if edge.source == sym.id:
-                    ctx = edge.metadata.context or ""
-                    m = re.findall(r'\b(\w+)\s*\(', ctx)
-                    callee_name_raw = m[-1] if m else re.split(r"[:\.\s]", ctx)[-1].strip()
-                    for n in name_index.get(callee_name_raw.lower(), []):
-                        callees.append((n, ctx))
-                        break
-            callees = callees[:10]
+            for _, ctx, callee in index.calls_from((sym.id,)):
+                for n in name_index.get(callee, []):
+                    callees.append((n, ctx))
+                    break
+                if len(callees) == 10:
+                    break
             if callees:
                 lines.append(f"\nCallees ({len(callees)} shown):")
                 for c, ctx in callees:
@@ -274,22 +284,20 @@ def make_explorer_tools(
 
             type_priority = {NodeType.CLASS: 0, NodeType.METHOD: 1, NodeType.FUNCTION: 2}
             siblings = [
-                n for n in all_nodes
-                if n.loc.file == sym.loc.file and n.id != sym.id and n.type != NodeType.COMMENT
+                n for n in index.by_file.get(sym.loc.file, [])
+                if n.id != sym.id and n.type != NodeType.COMMENT
             ]
-            siblings.sort(key=lambda n: (type_priority.get(n.type, 3), n.loc.lines[0]))
-            siblings = siblings[:10]
+            siblings = heapq.nsmallest(
+                10, siblings, key=lambda n: (type_priority.get(n.type, 3), n.loc.lines[0])
+            )
             if siblings:
                 lines.append(f"\nSiblings in {sym.loc.file} ({len(siblings)} shown):")
                 for s in siblings:
                     vis = f" [{s.meta.visibility}]" if s.meta.visibility else ""
                     lines.append(f"  {s.type.value}: {s.name}{vis} (line {s.loc.lines[0]})")
 
-            bare_name = re.split(r"::|\\|\.", sym.name)[-1]
-            attached_comments = [
-                n for n in all_nodes
-                if n.type == NodeType.COMMENT and n.meta.parent_symbol == sym.name
-            ]
+            bare_name = strip_qualifier(sym.name)
+            attached_comments = index.comments_by_parent.get(sym.name, [])
             if attached_comments:
                 lines.append(f"\nComments: {len(attached_comments)} attached — call search_comments(symbol='{bare_name}') for full context")
 
@@ -317,17 +325,18 @@ def make_explorer_tools(
         """
         dir_norm = directory.rstrip("/") + "/"
         by_file: dict[str, list[Node]] = {}
-        for n in all_nodes:
-            if n.type == NodeType.COMMENT:
-                continue
-            file = n.loc.file
-            if not (file.startswith(dir_norm) or file.startswith(directory)):
-                continue
-            if node_type and n.type.value != node_type:
-                continue
-            if language and n.language != language:
-                continue
-            by_file.setdefault(file, []).append(n)
+        files = index.files_with_prefix(directory)
+        if dir_norm != directory:
+            files += index.files_with_prefix(dir_norm)
+        for file in dict.fromkeys(files):
+            kept = [
+                n for n in index.by_file[file]
+                if n.type != NodeType.COMMENT
+                and (not node_type or n.type.value == node_type)
+                and (not language or n.language == language)
+            ]
+            if kept:
+                by_file[file] = kept
 
         if not by_file:
             return f"No symbols found under '{directory}'."
@@ -401,29 +410,16 @@ def make_explorer_tools(
 
         results: list[str] = []
         for name in name_list:
-            name_lower = name.lower()
-            matches = [n for n in all_nodes if n.type != NodeType.COMMENT and n.name.lower() == name_lower]
+            name_lower = name.casefold()
+            matches = index.by_name.get(name_lower, [])
             if not matches:
-                pattern = re.compile(r"\b" + re.escape(name) + r"\b", re.IGNORECASE)
-                matches = [n for n in all_nodes if n.type != NodeType.COMMENT and pattern.search(n.name)]
+                matches = index.word_matches(name, limit=5)
             if not matches:
                 results.append(f"Symbol '{name}' not found.")
                 continue
             lines = []
             for n in matches[:5]:
-                line = f"{n.type.value}: {n.name}"
-                line += f"\n  file: {n.loc.file}:{n.loc.lines[0]}-{n.loc.lines[1]}"
-                line += f"\n  language: {n.language}"
-                if n.meta.visibility:
-                    line += f"\n  visibility: {n.meta.visibility}"
-                if n.meta.parameters:
-                    line += f"\n  params: {', '.join(n.meta.parameters)}"
-                if n.meta.return_type:
-                    line += f"\n  returns: {n.meta.return_type}"
-                if n.meta.is_async:
-                    line += "\n  async: true"
-                if n.summary:
-                    line += f"\n  summary: {n.summary}"
+                line = index.render("definition", n, _definition)
                 lines.append(line)
             results.append("\n\n".join(lines))
 
@@ -461,41 +457,28 @@ def make_explorer_tools(
             min_complexity: Minimum complexity score.
             limit: Maximum results (capped at 200).
         """
-        name_re = re.compile(name_pattern, re.IGNORECASE) if name_pattern else None
+        name_re = name_filter(name_pattern) if name_pattern else None
         limit = min(limit, 200)
-        results: list[Node] = []
-
-        for node in all_nodes:
-            if node.type == NodeType.COMMENT:
-                continue
-            if node_type and node.type.value != node_type:
-                continue
-            if language and node.language != language:
-                continue
-            if visibility and (node.meta.visibility or "").lower() != visibility.lower():
-                continue
-            if async_only and not node.meta.is_async:
-                continue
-            param_count = len(node.meta.parameters)
-            if param_count < min_params:
-                continue
-            if max_params >= 0 and param_count > max_params:
-                continue
-            if return_type and return_type.lower() not in (node.meta.return_type or "").lower():
-                continue
-            if name_re and not name_re.search(node.name):
-                continue
-            if file_filter and file_filter.lower() not in node.loc.file.lower():
-                continue
-            if min_complexity > 0 and (node.meta.complexity_score or 0) < min_complexity:
-                continue
-            results.append(node)
+        matched = index.structural_filter(
+            language,
+            node_type,
+            visibility=visibility,
+            async_only=async_only,
+            min_params=min_params,
+            max_params=max_params,
+            return_type=return_type,
+            name_re=name_re,
+            file_filter=file_filter,
+            min_complexity=min_complexity,
+        )
+        lowered = index.lowered
+        results = [lowered[i][0] for i in matched[:limit]]
 
-        if not results:
+        if not matched:
             return "No symbols matched the given filters."
 
-        lines = [f"{len(results)} symbol(s) matched:\n"]
-        for n in results[:limit]:
+        lines = [f"{len(matched)} symbol(s) matched:\n"]
+        for n in results:
             parts = [f"{n.type.value}: {n.name} ({n.loc.file}:{n.loc.lines[0]})"]
             attrs: list[str] = []
             if n.meta.visibility:
@@ -514,8 +497,8 @@ def make_explorer_tools(
                 parts.append(f"  {n.summary}")
             lines.append("\n".join(parts))
 
-        if len(results) > limit:
-            lines.append(f"\n... and {len(results) - limit} more. Narrow with additional filters.")
+        if len(matched) > limit:
+            lines.append(f"\n... and {len(matched) - limit} more. Narrow with additional filters.")
 
         return "\n\n".join(lines)
 
@@ -531,26 +514,7 @@ def make_explorer_tools(
             file_filter: Optional path substring to restrict results (e.g. 'controllers/').
             argument_filter: Optional substring to match against the call expression (e.g. 'Issue_Builder').
         """
-        from hammy.schema.models import RelationType
-
-        pattern = re.compile(r"\b" + re.escape(symbol_name) + r"\b", re.IGNORECASE)
-        node_index = {n.id: n for n in all_nodes}
-
-        callers = []
-        for edge in all_edges:
-            if edge.relation != RelationType.CALLS:
-                continue
-            context = edge.metadata.context or ""
-            if not pattern.search(context):
-                continue
-            if argument_filter and argument_filter.lower() not in context.lower():
-                continue
-            source_node = node_index.get(edge.source)
-            if source_node is None:
-                continue
-            if file_filter and file_filter.lower() not in source_node.loc.file.lower():
-                continue
-            callers.append((source_node, context))
+        callers = index.usages(symbol_name, argument_filter, file_filter)
 
         if not callers:
             return (
@@ -588,13 +552,15 @@ def make_explorer_tools(
             node_type: Optional type filter ('class', 'function', 'method', 'endpoint').
             limit: Maximum results to return.
         """
-        from hammy.tools.hybrid_search import hybrid_search
+        # Built on first use when the caller did not pass one, then reused.
+        if not bm25_cache:
+            bm25_cache.append(bm25_index or build_bm25_index(all_nodes))
 
         limit = min(limit, 25)
         results = hybrid_search(
             query,
             all_nodes,
-            bm25_index=bm25_index,
+            bm25_index=bm25_cache[0],
             qdrant=qdrant,
             limit=limit,
             language=language or None,
@@ -607,13 +573,11 @@ def make_explorer_tools(
         lines = []
         for r in results:
             score = r.get("score", 0)
-            line = (
+            summary = f" | {r['summary']}" if r.get("summary") else ""
+            lines.append(
                 f"[{score:.3f}] {r.get('type', '?')}: {r.get('name', '?')} "
-                f"({r.get('file', '?')}:{r.get('lines', [0])[0]})"
+                f"({r.get('file', '?')}:{r.get('lines', [0])[0]}){summary}"
             )
-            if r.get("summary"):
-                line += f" | {r['summary']}"
-            lines.append(line)
 
         if len(results) >= limit:
             lines.append(f"\n... showing top {limit}. Use language/node_type to narrow.")
@@ -636,52 +600,40 @@ def make_explorer_tools(
             depth: How many hops to traverse (1=direct only, default 3).
             direction: 'callers' (what depends on X), 'callees' (what X depends on), or 'both'.
         """
-        from hammy.schema.models import RelationType
-
         depth = max(1, min(depth, 6))
-        pattern = re.compile(r"\b" + re.escape(symbol_name) + r"\b", re.IGNORECASE)
-        node_index = {n.id: n for n in all_nodes}
-        name_index: dict[str, list[Node]] = {}
-        for n in all_nodes:
-            name_index.setdefault(n.name.lower(), []).append(n)
-
-        call_edges = [e for e in all_edges if e.relation == RelationType.CALLS]
+        name_index = index.by_name
 
-        def _find_callers(names: set[str], visited: set[str]) -> list[tuple[Node, str]]:
-            """Return (caller_node, callee_name) pairs for a set of callee names."""
+        def _find_callers(names: set[str], visited: set[str]) -> list[tuple[str, Node, str]]:
+            """Return (file, caller_node, callee_name) triples sorted by file."""
             found = []
             # Call contexts contain only the bare method name, not the fully-qualified name,
             # so strip namespace/class prefix before matching.
-            pats = {
-                n: re.compile(r"\b" + re.escape(re.split(r"::|\\|\.", n)[-1]) + r"\b", re.IGNORECASE)
-                for n in names
-            }
-            for edge in call_edges:
-                ctx = edge.metadata.context or ""
-                for callee_name, p in pats.items():
-                    if p.search(ctx):
-                        caller = node_index.get(edge.source)
-                        if caller and caller.id not in visited:
-                            found.append((caller, callee_name))
-                            break
+            bare_names: dict[str, str] = {}
+            for n in names:
+                bare_names.setdefault(strip_qualifier(n).casefold(), n)
+            # Only calls whose context mentions one of the names are visited, and
+            # each is matched once against all of them.
+            match = names_matcher(bare_names)
+            if match is None:
+                return found
+            for caller, ctx in index.callers_mentioning(bare_names):
+                hit = match(ctx)
+                if hit is not None and caller.id not in visited:
+                    found.append((caller.loc.file, caller, bare_names.get(hit, hit)))
+            found.sort(key=itemgetter(0))
             return found
 
-        def _find_callees(node_ids: set[str], visited: set[str]) -> list[tuple[Node, str]]:
-            """Return (callee_node, context) pairs for a set of source node IDs."""
+        def _find_callees(node_ids: set[str], visited: set[str]) -> list[tuple[str, Node, str]]:
+            """Return (file, callee_node, context) triples sorted by file."""
             found = []
-            for edge in call_edges:
-                if edge.source not in node_ids:
+            for _, ctx, callee in index.calls_from(node_ids):
+                if not callee:
                     continue
-                ctx = edge.metadata.context or ""
-                # Extract callee name: last function name before '(' in the call expression
-                _m = re.findall(r'\b(\w+)\s*\(', ctx)
-                callee_name = _m[-1] if _m else re.split(r"[:\.\s]", ctx)[-1].strip()
-                if not callee_name:
-                    continue
-                for n in name_index.get(callee_name.lower(), []):
+                for n in name_index.get(callee, []):
                     if n.id not in visited:
-                        found.append((n, ctx))
+                        found.append((n.loc.file, n, ctx))
                         break
+            found.sort(key=itemgetter(0))
             return found
 
         lines: list[str] = []
@@ -697,14 +649,14 @@ def make_explorer_tools(
                     break
                 lines.append(f"\nHop {hop}:")
                 next_names: set[str] = set()
-                for caller, callee in sorted(results, key=lambda x: x[0].loc.file):
+                for _, caller, callee in results:
                     visited.add(caller.id)
                     lines.append(
                         f"  {'  ' * (hop - 1)}{caller.type.value}: {caller.name} "
                         f"({caller.loc.file}:{caller.loc.lines[0]}) calls {callee}"
                     )
                     if hop == 1:
-                        coms = [n for n in all_nodes if n.type == NodeType.COMMENT and n.meta.parent_symbol == caller.name]
+                        coms = index.comments_by_parent.get(caller.name, [])
                         for c in coms:
                             lines.append(f"    ⚑ {c.loc.lines[0]}: {c.name}")
                     next_names.add(caller.name)
@@ -718,7 +670,7 @@ def make_explorer_tools(
         if direction in ("callees", "both"):
             lines.append(f"\n=== Callees of '{symbol_name}' (what it depends on) ===")
             # Find the starting node(s) by name
-            start_nodes = name_index.get(symbol_name.lower(), [])
+            start_nodes = name_index.get(symbol_name.casefold(), [])
             if not start_nodes:
                 lines.append(f"  Definition of '{symbol_name}' not found in index.")
             else:
@@ -731,7 +683,7 @@ def make_explorer_tools(
                         break
                     lines.append(f"\nHop {hop}:")
                     next_ids: set[str] = set()
-                    for callee, ctx in sorted(results_c, key=lambda x: x[0].loc.file):
+                    for _, callee, ctx in results_c:
                         visited_c.add(callee.id)
                         next_ids.add(callee.id)
                         lines.append(
@@ -765,45 +717,48 @@ def make_explorer_tools(
             language: Optional language filter.
             file_filter: Optional path substring to restrict results.
         """
-        from hammy.tools.hotspot import compute_hotspots
-
         top_n = min(top_n, 50)
-        results = compute_hotspots(
-            all_nodes,
-            all_edges,
-            node_type=node_type,
-            language=language,
-            file_filter=file_filter,
-            top_n=top_n,
-        )
 
-        if not results:
-            return "No symbols found matching the given filters."
+        def _report() -> str:
+            results = compute_hotspots(
+                all_nodes,
+                all_edges,
+                node_type=node_type,
+                language=language,
+                file_filter=file_filter,
+                top_n=top_n,
+                index=index,
+            )
 
-        has_churn = any(r["churn_rate"] > 0 for r in results)
-        note = "" if has_churn else " (no churn data — scoring by caller count only)"
-        lines = [f"Top {len(results)} hotspots{note}:\n"]
+            if not results:
+                return "No symbols found matching the given filters."
 
-        for rank, r in enumerate(results, 1):
-            attrs = []
-            if r["visibility"]:
-                attrs.append(r["visibility"])
-            if r["is_async"]:
-                attrs.append("async")
-            attr_str = f" [{', '.join(attrs)}]" if attrs else ""
-            lines.append(
-                f"#{rank:2d} [score={r['score']:.1f}] "
-                f"{r['type']}: {r['name']}{attr_str} "
-                f"({r['file']}:{r['lines'][0]})  "
-                f"callers={r['caller_count']}  churn={r['churn_rate']}"
-            )
-            if r["summary"]:
-                lines.append(f"     {r['summary']}")
-            coms = [n for n in all_nodes if n.type == NodeType.COMMENT and n.meta.parent_symbol == r["name"]]
-            for c in coms:
-                lines.append(f"     ⚑ {c.loc.lines[0]}: {c.name}")
+            has_churn = any(r["churn_rate"] > 0 for r in results)
+            note = "" if has_churn else " (no churn data — scoring by caller count only)"
+            lines = [f"Top {len(results)} hotspots{note}:\n"]
 
-        return "\n".join(lines)
+            for rank, r in enumerate(results, 1):
+                attrs = []
+                if r["visibility"]:
+                    attrs.append(r["visibility"])
+                if r["is_async"]:
+                    attrs.append("async")
+                attr_str = f" [{', '.join(attrs)}]" if attrs else ""
+                lines.append(
+                    f"#{rank:2d} [score={r['score']:.1f}] "
+                    f"{r['type']}: {r['name']}{attr_str} "
+                    f"({r['file']}:{r['lines'][0]})  "
+                    f"callers={r['caller_count']}  churn={r['churn_rate']}"
+                )
+                if r["summary"]:
+                    lines.append(f"     {r['summary']}")
+                coms = index.comments_by_parent.get(r["name"], [])
+                for c in coms:
+                    lines.append(f"     ⚑ {c.loc.lines[0]}: {c.name}")
+
+            return "\n".join(lines)
+
+        return index.cached(("hotspot_score", top_n, node_type, language, file_filter), _report)
 
     @tool("PR Diff Analysis")
     def pr_diff(
@@ -819,13 +774,11 @@ def make_explorer_tools(
             diff_text: Raw unified diff text (paste from 'git diff' or GitHub PR).
             depth: Caller traversal depth for impact analysis (default 2).
         """
-        from hammy.tools.diff_analysis import analyze_diff
-
         raw_diff = diff_text.strip()
         if not raw_diff:
             return "diff_text is empty. Paste a unified diff (output of 'git diff')."
 
-        report = analyze_diff(raw_diff, all_nodes, all_edges, depth=depth)
+        report = analyze_diff(raw_diff, all_nodes, all_edges, depth=depth, index=index)
 
         if not report.changed_files:
             return "Could not parse any changed files from the diff."
@@ -858,10 +811,7 @@ def make_explorer_tools(
                     )
                 if caller_count > 4:
                     lines.append(f"         … and {caller_count - 4} more")
-                sym_comments = [
-                    n for n in all_nodes
-                    if n.type == NodeType.COMMENT and n.meta.parent_symbol == r["symbol"]
-                ]
+                sym_comments = index.comments_by_parent.get(r["symbol"], [])
                 if sym_comments:
                     lines.append(f"  Comments on {r['symbol']}:")
                     for c in sym_comments:
@@ -882,21 +832,19 @@ def make_explorer_tools(
         or vice versa. Resolves cross-language endpoint connections by matching URL patterns
         across frontend calls and backend Route definitions.
         """
-        from hammy.tools.bridge import resolve_bridges
-
-        bridges = resolve_bridges(all_nodes, all_edges)
-
-        if not bridges:
-            return "No cross-language bridges found."
-
-        lines = []
-        for bridge in bridges:
-            lines.append(
+        def _report() -> str:
+            # Nodes and edges are fixed for the life of these tools, so resolve once.
+            if index.bridges is None:
+                index.bridges = resolve_bridges(all_nodes, all_edges)
+            if not index.bridges:
+                return "No cross-language bridges found."
+            return "\n".join(
                 f"BRIDGE: {bridge.metadata.context} "
                 f"(confidence: {bridge.metadata.confidence:.0%})"
+                for bridge in index.bridges
             )
 
-        return "\n".join(lines)
+        return index.cached(("find_bridges",), _report)
 
     @tool("List Files")
     def list_files(language: str = "") -> str:
@@ -907,21 +855,16 @@ def make_explorer_tools(
         Args:
             language: Optional language filter ('php', 'javascript', 'python', etc.).
         """
-        files: dict[str, set[str]] = {}
-        for node in all_nodes:
-            if language and node.language != language:
-                continue
-            files.setdefault(node.loc.file, set()).add(node.language)
-
-        if not files:
-            return "No files found."
-
-        lines = []
-        for f in sorted(files.keys()):
-            langs = ", ".join(sorted(files[f]))
-            lines.append(f"{f} [{langs}]")
+        def _list() -> str:
+            if language:
+                lines = [f"{f} [{language}]" for f in index.files_by_language.get(language, [])]
+            else:
+                lines = [f"{f} [{', '.join(langs)}]" for f, langs in index.file_languages.items()]
+            if not lines:
+                return "No files found."
+            return "\n".join(lines)
 
-        return "\n".join(lines)
+        return index.cached(("list_files", language), _list)
 
     @tool("Search Comments")
     def search_comments(
@@ -940,15 +883,20 @@ def make_explorer_tools(
             file_filter: Filter by file path substring.
             limit: Maximum results to return (default 50).
         """
-        comment_nodes = [n for n in all_nodes if n.type == NodeType.COMMENT]
+        rows = index.select(node_type=NodeType.COMMENT.value)
 
         if pattern:
-            comment_nodes = [n for n in comment_nodes if pattern.lower() in n.name.lower()]
-        if symbol:
-            sym_re = re.compile(r"\b" + re.escape(symbol) + r"\b", re.IGNORECASE)
-            comment_nodes = [n for n in comment_nodes if sym_re.search(n.meta.parent_symbol)]
+            pattern_lower = pattern.casefold()
+            rows = [r for r in rows if pattern_lower in r[1]]
         if file_filter:
-            comment_nodes = [n for n in comment_nodes if file_filter.lower() in n.loc.file.lower()]
+            file_lower = file_filter.casefold()
+            rows = [r for r in rows if file_lower in r[3]]
+        comment_nodes = [r[0] for r in rows]
+        if symbol:
+            # Many comments share a parent, so match each distinct parent once.
+            sym_re = word_pattern(symbol)
+            parents = {p for p in index.comments_by_parent if sym_re.search(p)}
+            comment_nodes = [n for n in comment_nodes if n.meta.parent_symbol in parents]
 
         comment_nodes = comment_nodes[:limit]
 
@@ -962,13 +910,18 @@ def make_explorer_tools(
             lines.append(f"  {c.name}")
         return "\n".join(lines)
 
-    core_tools = [ast_query, search_symbols, search_code_hybrid, lookup_symbol, explain_symbol, module_summary, lookup_symbols_batch, structural_search, find_usages, impact_analysis, hotspot_score, pr_diff, find_bridges, list_files, search_comments]
+    core_tools = [ast_query, ast_query_batch, search_symbols, search_code_hybrid, lookup_symbol, explain_symbol, module_summary, lookup_symbols_batch, structural_search, find_usages, impact_analysis, hotspot_score, pr_diff, find_bridges, list_files, search_comments]
 
     if qdrant is None:
         return core_tools
 
     # --- Brain tools (require Qdrant) ---
 
+    recall_cache = RecallCache()
+    brain = qdrant
+    if brain_batch_size > 0:
+        brain = BatchingBrain(qdrant, brain_batch_size, brain_flush_ms / 1000)
+
     @tool("Store Context")
     def store_context(
         key: str,
@@ -990,9 +943,13 @@ def make_explorer_tools(
         """
         tag_list = [t.strip() for t in tags.split(",") if t.strip()] if tags else []
         file_list = [f.strip() for f in source_files.split(",") if f.strip()] if source_files else []
-        qdrant.upsert_brain_entry(key, content, tags=tag_list, source_files=file_list)
+        brain.upsert_brain_entry(key, content, tags=tag_list, source_files=file_list)
+        recall_cache.clear()
         tag_note = f" [tags: {', '.join(tag_list)}]" if tag_list else ""
-        return f"Stored '{key}'{tag_note}. Retrieve with: recall_context(key='{key}')"
+        return (
+            f"Stored '{key}'{tag_note}. Retrieve with: recall_context(key='{key}')"
+            + unsaved_warning(brain)
+        )
 
     @tool("Recall Context")
     def recall_context(
@@ -1015,12 +972,16 @@ def make_explorer_tools(
         if not query and not key:
             return "Provide either a key (exact lookup) or a query (semantic search)."
 
-        results = qdrant.search_brain(query, key=key, tag=tag, limit=min(limit, 10))
+        limit = min(limit, 10)
+        results = recall_cache.get(query, key, tag, limit)
+        if results is None:
+            results = brain.search_brain(query, key=key, tag=tag, limit=limit)
+            recall_cache.put(query, key, tag, limit, results)
 
         if not results:
             if key:
-                return f"No brain entry found for key '{key}'."
-            return f"No brain entries found matching '{query}'."
+                return f"No brain entry found for key '{key}'." + unsaved_warning(brain)
+            return f"No brain entries found matching '{query}'." + unsaved_warning(brain)
 
         lines = []
         for r in results:
@@ -1037,7 +998,7 @@ def make_explorer_tools(
             lines.append(f"  stored: {r.get('created_at', '?')[:19]}")
             lines.append("")
 
-        return "\n".join(lines).strip()
+        return "\n".join(lines).strip() + unsaved_warning(brain)
 
     @tool("List Context")
     def list_context(tag: str = "") -> str:
@@ -1049,22 +1010,24 @@ def make_explorer_tools(
         Args:
             tag: Optional tag to restrict results.
         """
-        entries = qdrant.list_brain_entries(tag=tag)
+        entries = brain.list_brain_entries(tag=tag)
 
         if not entries:
             note = f" with tag '{tag}'" if tag else ""
-            return f"No brain entries{note}. Use store_context to save findings."
+            return f"No brain entries{note}. Use store_context to save findings." + unsaved_warning(brain)
 
         lines = [f"{len(entries)} brain {'entry' if len(entries) == 1 else 'entries'}:\n"]
         for e in entries:
             created = e.get("created_at", "")[:10]
             tag_note = f" [{', '.join(e['tags'])}]" if e.get("tags") else ""
-            summary = e["content"].splitlines()[0][:80]
+            # The first line of the first 80 characters is the first line cut at 80,
+            # without splitting the whole (possibly long) entry.
+            summary = (e["content"][:80].splitlines() or [""])[0]
             if len(e["content"]) > 80:
                 summary += "…"
             lines.append(f"  {e['key']}{tag_note}  ({created})")
             lines.append(f"    {summary}")
 
-        return "\n".join(lines)
+        return "\n".join(lines) + unsaved_warning(brain)
 
     return [*core_tools, store_context, recall_context, list_context]
@@ -4,11 +4,15 @@ from __future__ import annotations
 
 import shutil
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import typer
 from rich.console import Console
 from rich.table import Table
 
+if TYPE_CHECKING:
+    from hammy.schema.models import Node
+
 app = typer.Typer(
     name="hammy",
     help="Hammy: Codebase Intelligence Engine",
@@ -183,6 +187,7 @@ def index(
             def _on_progress(completed: int, _total: int) -> None:
                 progress.update(task, completed=completed)
 
+            summaries_before = [n.summary for n in nodes]
             enriched_count, enrich_errors = enrich_nodes(
                 nodes, path, config.enrichment, progress_callback=_on_progress
             )
@@ -195,7 +200,9 @@ def index(
 
         # Re-upsert only the enriched nodes so embeddings reflect new summaries
         if qdrant is not None and enriched_count > 0:
-            enriched_nodes = [n for n in nodes if n.summary]
+            enriched_nodes = [
+                n for n, before in zip(nodes, summaries_before) if n.summary != before
+            ]
             with console.status(f"[bold blue]Re-indexing {len(enriched_nodes)} enriched symbols in Qdrant..."):
                 try:
                     upserted = qdrant.upsert_nodes(enriched_nodes)
@@ -243,7 +250,7 @@ def query(
     """Query the codebase using AI agents."""
     from dotenv import load_dotenv
 
-    from hammy.config import HammyConfig
+    from hammy.config import HammyConfig, load_yaml
     from hammy.core.crew import HammyCrew
     from hammy.indexer.code_indexer import index_codebase
     from hammy.tools.qdrant_tools import QdrantManager
@@ -258,9 +265,7 @@ def query(
     # Check that LLM is configured
     agents_yaml = path / "config" / "agents.yaml"
     if agents_yaml.exists():
-        import yaml
-        with open(agents_yaml) as f:
-            agents_config = yaml.safe_load(f) or {}
+        agents_config = load_yaml(agents_yaml)
         for agent_name, agent_cfg in agents_config.items():
             if agent_cfg.get("llm") is None:
                 console.print(
@@ -269,9 +274,11 @@ def query(
                 )
                 raise typer.Exit(1)
 
-    # Load from cache or fall back to full parse
+    # Load from cache or fall back to full parse. The parse is not saved:
+    # the cache has no freshness check, so only hammy index (and the
+    # server's reindex) write it.
     from hammy.indexer.index_cache import load_index
-    cached = load_index(path)
+    cached = load_index(path, pause_gc=True)
     if cached:
         nodes, edges = cached
         console.print(f"Loaded {len(nodes)} symbols from cache.\n")
@@ -300,16 +307,12 @@ def query(
         console.print("[yellow]Falling back to simple search...[/yellow]\n")
         
         # Simple fallback: keyword search over parsed nodes
-        keywords = question.lower().split()
-        matched = [
-            n for n in nodes
-            if any(kw in n.name.lower() or (n.summary and kw in n.summary.lower()) for kw in keywords)
-        ]
+        matched = _keyword_matches(nodes, question, limit=20)
         if not matched:
             matched = nodes[:20]
 
         console.print("[bold]Relevant code entities found:[/bold]\n")
-        for node in matched[:20]:
+        for node in matched:
             console.print(f"  • {node.type.value}: [cyan]{node.name}[/cyan]")
             console.print(f"    Location: {node.loc.file}:{node.loc.lines[0]}-{node.loc.lines[1]}")
             if node.summary:
@@ -317,6 +320,20 @@ def query(
             console.print()
 
 
+def _keyword_matches(nodes: list[Node], question: str, limit: int) -> list[Node]:
+    """Return the first ``limit`` nodes whose name or summary contains a word of the question."""
+    keywords = list(dict.fromkeys(question.lower().split()))
+    matched: list[Node] = []
+    for n in nodes:
+        # Keywords hold no whitespace, so they cannot match across the newline
+        text = f"{n.name}\n{n.summary}".lower()
+        if any(kw in text for kw in keywords):
+            matched.append(n)
+            if len(matched) == limit:
+                break
+    return matched
+
+
 @app.command()
 def status(
     path: Path = typer.Argument(
@@ -618,7 +635,7 @@ def export_redis(
     actual_depth = commit_depth if commit_depth is not None else rc.commit_depth
 
     # Load index cache
-    cached = load_index(path)
+    cached = load_index(path, pause_gc=True)
     if cached is None:
         console.print(
             "[red]Error:[/red] No index cache found at .hammy/index.json\n"
@@ -1,11 +1,38 @@
 """Configuration loading for Hammy."""
 
+import copy
+from functools import lru_cache
 from pathlib import Path
+from typing import Any, Literal
 
 import yaml
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from pydantic_settings import BaseSettings
 
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    _SafeLoader = yaml.SafeLoader
+
+
+@lru_cache(maxsize=16)
+def _parse_yaml(path: str, mtime_ns: int) -> dict[str, Any]:
+    # Bytes let libyaml detect the encoding itself, skipping Python's decoder
+    with open(path, "rb") as f:
+        return yaml.load(f, Loader=_SafeLoader) or {}
+
+
+def load_yaml(path: Path) -> dict[str, Any]:
+    """Parse a YAML file, reusing the parse until the file's mtime changes.
+
+    Returns a fresh copy each time, so callers may modify the result.
+    Raises FileNotFoundError if the file does not exist.
+    """
+    # Keyed on the absolute path, so a relative path stays correct if the
+    # working directory changes.
+    path = Path(path).absolute()
+    return copy.deepcopy(_parse_yaml(str(path), path.stat().st_mtime_ns))
+
 
 class IgnoreConfig(BaseModel):
     """Settings for the ignore system."""
@@ -23,6 +50,8 @@ class ParsingConfig(BaseModel):
         default_factory=lambda: ["php", "javascript", "python", "typescript", "go", "csharp"]
     )
     max_file_size_kb: int = 500
+    # Processes index_codebase parses files in (0 = one per CPU, 1 = in-process)
+    workers: int = Field(0, ge=0)
 
 
 class QdrantConfig(BaseModel):
@@ -32,6 +61,10 @@ class QdrantConfig(BaseModel):
     port: int = 6333
     collection_prefix: str = "hammy"
     embedding_model: str = "all-MiniLM-L6-v2"
+    # Queue brain writes and upsert up to this many at once (0 = write immediately)
+    brain_batch_size: int = 0
+    # Flush queued brain writes after this many milliseconds
+    brain_flush_ms: int = 100
 
 
 class VCSConfig(BaseModel):
@@ -50,6 +83,22 @@ class EnrichmentConfig(BaseModel):
     batch_size: int = 10
     skip_if_summary: bool = True
     max_symbols: int = 0  # 0 = no limit
+    concurrency: int = 4  # batches in flight at once
+    requests_per_minute: int = 0  # 0 = no limit
+    max_retries: int = 3  # retries of a rate-limited call
+    mode: Literal["online", "batch"] = "online"  # "batch" uses the provider's Batch API
+    batch_poll_interval: float = 30.0  # seconds between batch job status checks
+    batch_timeout: float = 0.0  # seconds to wait for a submitted job (0 = submit and return)
+    cache: bool = True  # reuse stored summaries of unchanged symbols
+    fuzzy_cache: bool = False  # ignore comment/whitespace edits when matching the cache
+
+    @model_validator(mode="after")
+    def _batch_mode_needs_cache(self) -> "EnrichmentConfig":
+        # Batch results reach the nodes through the summary cache, often on
+        # a later run than the one that submitted the job.
+        if self.mode == "batch" and not self.cache:
+            raise ValueError("enrichment.mode 'batch' requires enrichment.cache: true")
+        return self
 
 
 class RedisExportConfig(BaseModel):
@@ -92,11 +141,7 @@ class HammyConfig(BaseSettings):
     @classmethod
     def from_yaml(cls, path: Path) -> "HammyConfig":
         """Load configuration from a YAML file."""
-        with open(path) as f:
-            data = yaml.safe_load(f)
-        if data is None:
-            data = {}
-        return cls(**data)
+        return cls(**load_yaml(path))
 
     @classmethod
     def load(cls, project_root: Path | None = None) -> "HammyConfig":
@@ -6,93 +6,123 @@ historical context, and warnings.
 
 from __future__ import annotations
 
+import io
+from collections import defaultdict
+
 from hammy.schema.models import ContextPack, Edge, Node, NodeType
 
+# Sections follow the enum's declaration order
+_NODE_TYPE_INDEX = {t: i for i, t in enumerate(NodeType)}
+
+# NodeMeta fields listed on a node's detail line, in order, when set
+# (list values are comma-joined; "async" takes no value)
+_DETAIL_SPECS = (
+    ("visibility", "visibility: {}"),
+    ("is_async", "async"),
+    ("return_type", "returns: {}"),
+    ("parameters", "params: {}"),
+)
+
 
 def generate_context_pack_markdown(pack: ContextPack) -> str:
     """Convert a ContextPack into a Markdown document optimized for LLM consumption."""
-    sections = []
+    # Written straight into one buffer: large packs produce thousands of
+    # lines, and this avoids keeping each as a separate string until a join.
+    buf = io.StringIO()
+    w = buf.write
 
     # Header
-    sections.append(f"# Hammy Context Pack\n\n**Query:** {pack.query}\n")
+    w("# Hammy Context Pack\n\n**Query:** ")
+    w(pack.query)
+    w("\n\n")
 
     # Summary
     if pack.summary:
-        sections.append(f"## Summary\n\n{pack.summary}\n")
+        w("## Summary\n\n")
+        w(pack.summary)
+        w("\n\n")
 
     # Warnings
     if pack.warnings:
-        sections.append("## Warnings\n")
+        w("## Warnings\n\n")
         for warning in pack.warnings:
-            sections.append(f"- {warning}")
-        sections.append("")
+            w("- ")
+            w(warning)
+            w("\n")
+        w("\n")
 
     # Nodes by type
     if pack.nodes:
-        sections.append("## Code Entities\n")
+        w("## Code Entities\n\n")
 
-        # Group by type
-        by_type: dict[NodeType, list[Node]] = {}
+        # Group by type; only the types present get a section
+        by_type: dict[NodeType, list[Node]] = defaultdict(list)
         for node in pack.nodes:
-            by_type.setdefault(node.type, []).append(node)
+            by_type[node.type].append(node)
 
-        for node_type in NodeType:
-            type_nodes = by_type.get(node_type, [])
-            if not type_nodes:
-                continue
-
-            sections.append(f"### {node_type.value.title()}s\n")
+        for node_type, type_nodes in sorted(
+            by_type.items(), key=lambda item: _NODE_TYPE_INDEX[item[0]]
+        ):
+            w(f"### {node_type.value.title()}s\n\n")
             for node in type_nodes:
-                loc = f"{node.loc.file}:{node.loc.lines[0]}-{node.loc.lines[1]}"
-                sections.append(f"- **{node.name}** (`{loc}`, {node.language})")
-
-                details = []
-                if node.meta.visibility:
-                    details.append(f"visibility: {node.meta.visibility}")
-                if node.meta.is_async:
-                    details.append("async")
-                if node.meta.return_type:
-                    details.append(f"returns: {node.meta.return_type}")
-                if node.meta.parameters:
-                    details.append(f"params: {', '.join(node.meta.parameters)}")
+                loc = node.loc
+                w(f"- **{node.name}** (`{loc.file}:{loc.lines[0]}-{loc.lines[1]}`, {node.language})\n")
+
+                meta = node.meta
+                details = [
+                    spec.format(", ".join(value) if isinstance(value, list) else value)
+                    for attr, spec in _DETAIL_SPECS
+                    if (value := getattr(meta, attr))
+                ]
                 if details:
-                    sections.append(f"  - {', '.join(details)}")
+                    w("  - ")
+                    w(", ".join(details))
+                    w("\n")
 
                 if node.summary:
-                    sections.append(f"  - {node.summary}")
+                    w("  - ")
+                    w(node.summary)
+                    w("\n")
 
                 if node.history:
                     h = node.history
                     if h.churn_rate > 0:
-                        sections.append(f"  - Churn: {h.churn_rate} changes")
+                        w(f"  - Churn: {h.churn_rate} changes\n")
                     if h.blame_owners:
-                        sections.append(f"  - Owners: {', '.join(h.blame_owners)}")
+                        w("  - Owners: ")
+                        w(", ".join(h.blame_owners))
+                        w("\n")
 
-            sections.append("")
+            w("\n")
 
     # Edges / Relationships
     if pack.edges:
-        sections.append("## Relationships\n")
+        w("## Relationships\n\n")
 
-        # Separate bridges from regular edges
-        bridges = [e for e in pack.edges if e.metadata.is_bridge]
-        regular = [e for e in pack.edges if not e.metadata.is_bridge]
+        # Separate bridges from regular edges in one pass
+        bridges: list[Edge] = []
+        regular: list[Edge] = []
+        for edge in pack.edges:
+            if edge.metadata.is_bridge:
+                bridges.append(edge)
+            else:
+                regular.append(edge)
 
         if bridges:
-            sections.append("### Cross-Language Bridges\n")
+            w("### Cross-Language Bridges\n\n")
             for edge in bridges:
-                conf = f"{edge.metadata.confidence:.0%}"
-                sections.append(
-                    f"- {edge.metadata.context} "
-                    f"(confidence: {conf})"
-                )
-            sections.append("")
+                w(f"- {edge.metadata.context} (confidence: {edge.metadata.confidence:.0%})\n")
+            w("\n")
 
         if regular:
-            sections.append("### Dependencies\n")
+            w("### Dependencies\n\n")
             for edge in regular:
-                ctx = f" — {edge.metadata.context}" if edge.metadata.context else ""
-                sections.append(f"- `{edge.source}` —[{edge.relation.value}]→ `{edge.target}`{ctx}")
-            sections.append("")
-
-    return "\n".join(sections)
+                w(f"- `{edge.source}` —[{edge.relation.value}]→ `{edge.target}`")
+                if edge.metadata.context:
+                    w(" — ")
+                    w(edge.metadata.context)
+                w("\n")
+            w("\n")
+
+    # Every line above ends in a newline; the document itself does not
+    return buf.getvalue()[:-1]
@@ -2,6 +2,9 @@
 
 Wires together the Dispatcher, Historian, and Explorer agents with their
 tools and defines the query workflow.
+
+crewai (and the agent tool modules built on it) is imported when a crew is
+created rather than at module import, since it is slow to load.
 """
 
 from __future__ import annotations
@@ -9,12 +12,7 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Any
 
-import yaml
-from crewai import Agent, Crew, Process, Task
-
-from hammy.agents.explorer import make_explorer_tools
-from hammy.agents.historian import make_historian_tools
-from hammy.config import HammyConfig
+from hammy.config import HammyConfig, load_yaml
 from hammy.core.context_pack import generate_context_pack_markdown
 from hammy.schema.models import ContextPack, Edge, Node
 from hammy.tools.bridge import resolve_bridges
@@ -35,6 +33,11 @@ class HammyCrew:
         qdrant: QdrantManager | None = None,
         vcs: VCSWrapper | None = None,
     ):
+        from crewai import Agent
+
+        from hammy.agents.explorer import make_explorer_tools
+        from hammy.agents.historian import make_historian_tools
+
         self.config = config
         self.nodes = nodes
         self.edges = edges
@@ -56,7 +59,9 @@ class HammyCrew:
         bm25_index = build_bm25_index(nodes)
 
         explorer_tools = make_explorer_tools(
-            self.project_root, parser_factory, nodes, edges, qdrant, bm25_index=bm25_index
+            self.project_root, parser_factory, nodes, edges, qdrant, bm25_index=bm25_index,
+            brain_batch_size=config.qdrant.brain_batch_size,
+            brain_flush_ms=config.qdrant.brain_flush_ms,
         )
 
         historian_tools = []
@@ -109,6 +114,8 @@ class HammyCrew:
         Returns:
             Markdown-formatted context pack.
         """
+        from crewai import Crew, Process, Task
+
         # Task 1: Explorer analyzes code structure
         explore_task = Task(
             description=(
@@ -174,15 +181,13 @@ class HammyCrew:
 
     def _load_agents_config(self) -> dict[str, Any]:
         """Load agent configuration from agents.yaml."""
-        config_path = self.project_root / "config" / "agents.yaml"
-        if config_path.exists():
-            with open(config_path) as f:
-                return yaml.safe_load(f) or {}
-
-        # Also check relative to the hammy package
+        # The project's config/agents.yaml wins; fall back to the one
+        # shipped alongside the hammy package
         package_config = Path(__file__).parent.parent.parent.parent / "config" / "agents.yaml"
-        if package_config.exists():
-            with open(package_config) as f:
-                return yaml.safe_load(f) or {}
+        for config_path in (self.project_root / "config" / "agents.yaml", package_config):
+            try:
+                return load_yaml(config_path)
+            except FileNotFoundError:
+                continue
 
         return {}
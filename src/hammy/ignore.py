@@ -5,6 +5,8 @@ Composes patterns from hardcoded defaults, .gitignore, .hgignore, .hammyignore,
 and config-level extra patterns.
 """
 
+from collections.abc import Iterator
+from functools import lru_cache
 from pathlib import Path
 
 from pathspec import PathSpec
@@ -38,6 +40,19 @@ DEFAULT_IGNORE_PATTERNS = [
     "Thumbs.db",
 ]
 
+# Compiled once; every IgnoreManager checks it before its project patterns
+_DEFAULT_SPEC = PathSpec.from_lines("gitignore", DEFAULT_IGNORE_PATTERNS)
+_DEFAULT_SET = frozenset(DEFAULT_IGNORE_PATTERNS)
+
+
+def _dedupe_keep_last(patterns: list[str]) -> list[str]:
+    """Drop repeated patterns, keeping each one's last occurrence.
+
+    With negations the last matching pattern decides, and an earlier copy
+    of a pattern can never be that, so removing it changes no result.
+    """
+    return list(dict.fromkeys(reversed(patterns)))[::-1]
+
 
 class IgnoreManager:
     """Manages file ignore patterns from multiple sources.
@@ -53,7 +68,7 @@ class IgnoreManager:
             config = IgnoreConfig()
 
         self.project_root = project_root.resolve()
-        patterns: list[str] = list(DEFAULT_IGNORE_PATTERNS)
+        patterns: list[str] = []
 
         if config.use_gitignore:
             gitignore = self.project_root / ".gitignore"
@@ -72,15 +87,33 @@ class IgnoreManager:
 
         patterns.extend(config.extra_patterns)
 
-        self._spec = PathSpec.from_lines("gitignore", patterns)
+        # The defaults and the project patterns are two specs checked in
+        # turn. A negation ("!vendor/keep.php") can re-include a default
+        # match, so then every pattern has to go through one spec in order.
+        # Each pattern is a regex tried against every lookup, so repeats
+        # (across ignore files, or of a default) are dropped first.
+        self._default_spec = _DEFAULT_SPEC
+        self._project_spec: PathSpec | None = None
+        if any(p.startswith("!") for p in patterns):
+            self._default_spec = PathSpec.from_lines(
+                "gitignore", _dedupe_keep_last(DEFAULT_IGNORE_PATTERNS + patterns)
+            )
+        else:
+            patterns = [p for p in dict.fromkeys(patterns) if p not in _DEFAULT_SET]
+            if patterns:
+                self._project_spec = PathSpec.from_lines("gitignore", patterns)
+
+        # Per instance, since the result depends on this manager's patterns
+        self._match_cached = lru_cache(maxsize=8192)(self._match)
 
-    def is_ignored(self, path: Path, *, is_dir: bool = False) -> bool:
+    def is_ignored(self, path: Path, *, is_dir: bool | None = None) -> bool:
         """Check if a path should be ignored.
 
         Args:
             path: Absolute or relative path to check.
-            is_dir: If True, treat this path as a directory (appends / for matching).
-                    If False and the path is absolute, will check the filesystem.
+            is_dir: If True, treat this path as a directory (appends / for matching);
+                    if False, as a file. If None and the path is absolute, the
+                    filesystem is checked; a relative path is then treated as a file.
         """
         path = Path(path)
         if path.is_absolute():
@@ -88,21 +121,28 @@ class IgnoreManager:
                 rel = path.relative_to(self.project_root)
             except ValueError:
                 return False
-            if not is_dir:
+            if is_dir is None:
                 is_dir = path.is_dir()
         else:
             rel = path
 
-        rel_str = str(rel)
+        return self._match_cached(str(rel), bool(is_dir))
 
-        # Check the path as-is
-        if self._spec.match_file(rel_str):
-            return True
-
-        # For directories, also check with trailing slash (gitignore convention)
-        if is_dir:
-            return self._spec.match_file(rel_str + "/")
+    def is_ignored_relative(self, rel_str: str, *, is_dir: bool) -> bool:
+        """Check a path given as a string relative to the project root.
 
+        For callers that already know the relative path and the entry kind
+        (like the directory walker), so no Path is built and nothing is stat'ed.
+        """
+        return self._match_cached(rel_str, is_dir)
+
+    def _match(self, rel_str: str, is_dir: bool) -> bool:
+        # Check the path as-is, and directories also with a trailing slash
+        # (gitignore convention)
+        candidates = (rel_str, rel_str + "/") if is_dir else (rel_str,)
+        for spec in (self._default_spec, self._project_spec):
+            if spec is not None and any(spec.match_file(c) for c in candidates):
+                return True
         return False
 
     def filter_paths(self, paths: list[Path]) -> list[Path]:
@@ -110,33 +150,30 @@ class IgnoreManager:
         return [p for p in paths if not self.is_ignored(p)]
 
     @staticmethod
-    def _read_ignore_file(path: Path) -> list[str]:
-        """Read a gitignore-style file, skipping comments and blank lines."""
-        lines = []
-        for line in path.read_text().splitlines():
-            line = line.strip()
-            if line and not line.startswith("#"):
-                lines.append(line)
-        return lines
+    def _read_ignore_file(path: Path) -> Iterator[str]:
+        """Yield the patterns of a gitignore-style file, skipping comments and blank lines."""
+        with path.open() as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    yield line
 
     @staticmethod
-    def _parse_hgignore(hgignore: Path) -> list[str]:
-        """Parse .hgignore, extracting only glob-syntax lines.
+    def _parse_hgignore(hgignore: Path) -> Iterator[str]:
+        """Parse .hgignore, yielding only glob-syntax lines.
 
         Mercurial's ignore file supports 'syntax: glob' and 'syntax: regexp'
         directives. We only use glob patterns since pathspec handles gitignore-style
         globs. Regex patterns are silently skipped.
         """
-        lines = hgignore.read_text().splitlines()
         mode = "regexp"  # hgignore default
-        result: list[str] = []
-        for line in lines:
-            line = line.strip()
-            if not line or line.startswith("#"):
-                continue
-            if line.startswith("syntax:"):
-                mode = line.split(":", 1)[1].strip()
-                continue
-            if mode == "glob":
-                result.append(line)
-        return result
+        with hgignore.open() as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                if line.startswith("syntax:"):
+                    mode = line.split(":", 1)[1].strip()
+                    continue
+                if mode == "glob":
+                    yield line
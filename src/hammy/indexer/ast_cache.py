@@ -0,0 +1,218 @@
+"""Per-file cache of extracted symbols for on-demand AST queries.
+
+The ast_query tools parse a file and run extract_symbols() on every call,
+and agents tend to query the same files repeatedly. This cache stores the
+extracted nodes and edges in .hammy/ast-cache.sqlite, keyed by the file's
+relative path and validated against its content:
+
+1. If the file's mtime and size match the cached row, the row is used
+   without reading the file.
+2. Otherwise the file is read and hashed; if the SHA-256 still matches,
+   the row is reused and its stat fields refreshed.
+3. Otherwise the file is parsed and the row replaced.
+
+Decoded results are also kept in an in-memory LRU keyed by path, mtime
+and size, so a repeat query for an unchanged file in the same process
+skips both SQLite and model validation.
+
+extract_many() extracts several files on a shared thread pool; tree-sitter
+releases the GIL while parsing, so cold files parse in parallel. The
+cache is safe to use from several threads.
+
+If the database cannot be opened the cache is disabled and every call
+parses the file, so callers never need to handle cache errors.
+
+Usage:
+    cache = AstCache(project_root, parser_factory)
+    result = cache.extract("src/app.py")
+    if result is not None:
+        nodes, edges = result
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from pydantic import BaseModel
+
+from hammy.schema.models import Edge, Node
+from hammy.tools.ast_tools import extract_symbols
+from hammy.tools.parser import ParserFactory
+
+logger = logging.getLogger(__name__)
+
+_CACHE_DIR = ".hammy"
+_CACHE_FILE = "ast-cache.sqlite"
+
+_POOL: ThreadPoolExecutor | None = None
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS symbols (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 BLOB NOT NULL,
+    payload TEXT NOT NULL
+)
+"""
+
+
+class _Payload(BaseModel):
+    """JSON layout of a cached row's ``payload`` column."""
+
+    nodes: list[Node]
+    edges: list[Edge]
+
+
+def ast_cache_path(project_root: Path) -> Path:
+    return project_root / _CACHE_DIR / _CACHE_FILE
+
+
+class AstCache:
+    """SQLite-backed cache of extract_symbols() results for project files."""
+
+    def __init__(
+        self, project_root: Path, parser_factory: ParserFactory, memory_size: int = 512
+    ) -> None:
+        self._project_root = project_root
+        self._parser_factory = parser_factory
+        self.memory_size = memory_size
+        self._memory: OrderedDict[tuple[str, int, int], tuple[list[Node], list[Edge]]] = (
+            OrderedDict()
+        )
+        self._conn: sqlite3.Connection | None = None
+        self._disabled = False
+        # Guards the connection and the in-memory LRU; parsing runs unlocked.
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection | None:
+        """Open the database on first use; return None if caching is unavailable."""
+        if self._conn is not None or self._disabled:
+            return self._conn
+        path = ast_cache_path(self._project_root)
+        try:
+            path.parent.mkdir(exist_ok=True)
+            conn = sqlite3.connect(path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(_SCHEMA)
+            conn.commit()
+        except (OSError, sqlite3.Error) as exc:
+            logger.warning("AST cache unavailable (%s) — parsing without cache", exc)
+            self._disabled = True
+            return None
+        self._conn = conn
+        return conn
+
+    def extract(self, file_path: str) -> tuple[list[Node], list[Edge]] | None:
+        """Return the nodes and edges for a file relative to the project root.
+
+        Returns None if the file's language is not supported. Raises
+        OSError if the file cannot be read.
+        """
+        full_path = self._project_root / file_path
+        lang = self._parser_factory.detect_language(full_path)
+        if lang is None:
+            return None
+
+        st = full_path.stat()
+        mem_key = (file_path, st.st_mtime_ns, st.st_size)
+        with self._lock:
+            hit = self._memory.get(mem_key)
+            if hit is not None:
+                self._memory.move_to_end(mem_key)
+        if hit is not None:
+            return list(hit[0]), list(hit[1])
+
+        result = self._extract(file_path, full_path, lang, st)
+        with self._lock:
+            self._memory[mem_key] = result
+            if len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+        return list(result[0]), list(result[1])
+
+    def extract_many(self, file_paths: list[str]) -> list[tuple[list[Node], list[Edge]] | None]:
+        """extract() for several files, in input order, parsing them in parallel.
+
+        Raises the first OSError any file raises.
+        """
+        if len(file_paths) < 2:
+            return [self.extract(p) for p in file_paths]
+        return list(_parse_pool().map(self.extract, file_paths))
+
+    def _extract(
+        self, file_path: str, full_path: Path, lang: str, st: os.stat_result
+    ) -> tuple[list[Node], list[Edge]]:
+        with self._lock:
+            conn = self._connect()
+            row = None
+            if conn is not None:
+                row = conn.execute(
+                    "SELECT mtime_ns, size, sha256, payload FROM symbols WHERE path = ?",
+                    (file_path,),
+                ).fetchone()
+        if conn is not None:
+            if row and row[0] == st.st_mtime_ns and row[1] == st.st_size:
+                cached = _decode(row[3])
+                if cached is not None:
+                    return cached
+
+        source = full_path.read_bytes()
+        digest = hashlib.sha256(source).digest()
+        if conn is not None and row and row[2] == digest:
+            cached = _decode(row[3])
+            if cached is not None:
+                with self._lock:
+                    self._store(conn, file_path, st.st_mtime_ns, st.st_size, digest, row[3])
+                return cached
+
+        tree = self._parser_factory.parse_bytes(source, lang)
+        nodes, edges = extract_symbols(tree, lang, file_path)
+        if conn is not None:
+            payload = _Payload.model_construct(nodes=nodes, edges=edges).model_dump_json()
+            with self._lock:
+                self._store(conn, file_path, st.st_mtime_ns, st.st_size, digest, payload)
+        return nodes, edges
+
+    @staticmethod
+    def _store(
+        conn: sqlite3.Connection,
+        file_path: str,
+        mtime_ns: int,
+        size: int,
+        digest: bytes,
+        payload: str,
+    ) -> None:
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO symbols (path, mtime_ns, size, sha256, payload) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (file_path, mtime_ns, size, digest, payload),
+            )
+            conn.commit()
+        except sqlite3.Error as exc:
+            logger.debug("AST cache write failed for %s: %s", file_path, exc)
+
+
+def _parse_pool() -> ThreadPoolExecutor:
+    """Return the shared parse thread pool, creating it on first use."""
+    global _POOL
+    if _POOL is None:
+        _POOL = ThreadPoolExecutor(thread_name_prefix="hammy-parse")
+    return _POOL
+
+
+def _decode(payload: str) -> tuple[list[Node], list[Edge]] | None:
+    try:
+        data = _Payload.model_validate_json(payload)
+    except Exception as exc:
+        logger.debug("AST cache entry unreadable (%s) — re-parsing", exc)
+        return None
+    return data.nodes, data.edges
@@ -2,13 +2,25 @@
 
 This is the main indexing entry point that ties together the file walker,
 tree-sitter parser, and Qdrant storage.
+
+Parsing and symbol extraction are CPU-bound and independent per file, so
+large projects are split across worker processes (see
+ParsingConfig.workers); results are merged in walk order, so the output
+does not depend on the worker count.
 """
 
 from __future__ import annotations
 
+import multiprocessing
+import os
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 
+from pydantic import BaseModel
+
 from hammy.config import HammyConfig
 from hammy.ignore import IgnoreManager
 from hammy.indexer.file_walker import walk_project
@@ -17,6 +29,13 @@ from hammy.tools.ast_tools import extract_symbols
 from hammy.tools.parser import ParserFactory
 from hammy.tools.qdrant_tools import QdrantManager
 
+# Below this many files, starting worker processes costs more than it saves.
+PARALLEL_MIN_FILES = 64
+# Files handed to a worker per round trip.
+_CHUNKSIZE = 16
+# Nodes embedded and upserted together while indexing.
+UPSERT_BATCH_SIZE = 512
+
 
 @dataclass
 class IndexResult:
@@ -38,6 +57,7 @@ def index_codebase(
     store_in_qdrant: bool = True,
     enrich: bool = False,
     progress_callback=None,
+    batch_size: int = UPSERT_BATCH_SIZE,
 ) -> tuple[IndexResult, list[Node], list[Edge]]:
     """Run the full code indexing pipeline.
 
@@ -47,52 +67,78 @@ def index_codebase(
         store_in_qdrant: Whether to store results in Qdrant.
         enrich: Whether to run LLM enrichment after indexing.
         progress_callback: Optional fn(completed, total) for enrichment progress.
+        batch_size: Nodes per Qdrant upsert. Nodes are stored as files are
+            merged rather than all at the end, so only one batch of
+            embeddings and points is held in memory at a time.
 
     Returns:
         Tuple of (result stats, all nodes, all edges).
     """
     project_root = Path(config.project.root).resolve()
     ignore_manager = IgnoreManager(project_root, config.ignore)
-    parser_factory = ParserFactory(config.parsing.languages)
+    languages = tuple(config.parsing.languages)
 
     result = IndexResult()
     all_nodes: list[Node] = []
     all_edges: list[Edge] = []
 
-    for file_entry in walk_project(
-        project_root,
-        ignore_manager,
-        max_file_size_kb=config.parsing.max_file_size_kb,
-        languages=config.parsing.languages,
-    ):
-        parsed = parser_factory.parse_file(file_entry.path)
-        if parsed is None:
-            result.files_skipped += 1
-            continue
+    entries = list(
+        walk_project(
+            project_root,
+            ignore_manager,
+            max_file_size_kb=config.parsing.max_file_size_kb,
+            languages=config.parsing.languages,
+        )
+    )
+    paths = [file_entry.path for file_entry in entries]
+    rel_paths = [file_entry.rel_path for file_entry in entries]
 
-        tree, language = parsed
-        rel_path = str(file_entry.path.relative_to(project_root))
+    workers = min(config.parsing.workers or os.cpu_count() or 1, len(paths) // _CHUNKSIZE)
+    if workers > 1 and len(paths) >= PARALLEL_MIN_FILES:
+        outcomes = _index_parallel(paths, rel_paths, languages, workers)
+    else:
+        outcomes = (_index_one(path, rel, languages) for path, rel in zip(paths, rel_paths))
 
-        try:
-            nodes, edges = extract_symbols(tree, language, rel_path)
-            all_nodes.extend(nodes)
-            all_edges.extend(edges)
-            result.files_processed += 1
-            result.nodes_extracted += len(nodes)
-            result.edges_extracted += len(edges)
-        except Exception as e:
-            result.errors.append(f"{rel_path}: {e}")
-            result.files_skipped += 1
+    pending: list[Node] = []
+    collections_ready = False
 
-    if store_in_qdrant and all_nodes:
+    def upsert_pending() -> None:
+        nonlocal qdrant, collections_ready
         if qdrant is None:
             qdrant = QdrantManager(config.qdrant, project_name=config.project.name)
-        qdrant.ensure_collections()
-        result.nodes_indexed = qdrant.upsert_nodes(all_nodes)
+        if not collections_ready:
+            qdrant.ensure_collections()
+            collections_ready = True
+        result.nodes_indexed += qdrant.upsert_nodes(pending)
+        pending.clear()
+
+    for outcome in outcomes:
+        if outcome is None:
+            result.files_skipped += 1
+            continue
+        nodes, edges, error = outcome
+        if error is not None:
+            result.errors.append(error)
+            result.files_skipped += 1
+            continue
+        all_nodes.extend(nodes)
+        all_edges.extend(edges)
+        result.files_processed += 1
+        result.nodes_extracted += len(nodes)
+        result.edges_extracted += len(edges)
+
+        if store_in_qdrant:
+            pending.extend(nodes)
+            if len(pending) >= batch_size:
+                upsert_pending()
+
+    if pending:
+        upsert_pending()
 
     if enrich and all_nodes:
         from hammy.indexer.enricher import enrich_nodes
 
+        summaries_before = [node.summary for node in all_nodes]
         enriched_count, enrich_errors = enrich_nodes(
             all_nodes,
             project_root,
@@ -102,15 +148,87 @@ def index_codebase(
         result.nodes_enriched = enriched_count
         result.errors.extend(enrich_errors)
 
-        # Re-upsert with enriched summaries so embeddings reflect the new text
+        # Re-upsert the nodes whose summary changed so their embeddings
+        # reflect the new text (qdrant is set: all_nodes were stored above)
         if store_in_qdrant and enriched_count > 0:
-            if qdrant is None:
-                qdrant = QdrantManager(config.qdrant, project_name=config.project.name)
-            qdrant.upsert_nodes(all_nodes)
+            qdrant.upsert_nodes([
+                node for node, before in zip(all_nodes, summaries_before)
+                if node.summary != before
+            ])
 
     return result, all_nodes, all_edges
 
 
+class _Extracted(BaseModel):
+    """One file's symbols as sent back from a worker process."""
+
+    nodes: list[Node]
+    edges: list[Edge]
+
+
+def _index_parallel(
+    paths: list[Path], rel_paths: list[str], languages: tuple[str, ...], workers: int
+) -> Iterator[tuple[list[Node], list[Edge], str | None] | None]:
+    """_index_one() for every file across ``workers`` processes, in input order.
+
+    Outcomes are yielded as they arrive, so only the caller's merged lists
+    grow with the project. Workers are spawned rather than forked: the
+    caller may be the MCP server or the watcher, and forking a process
+    that runs other threads can copy locks held by them.
+    """
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        for sent in pool.map(
+            _index_one_json, paths, rel_paths, [languages] * len(paths), chunksize=_CHUNKSIZE
+        ):
+            if sent is None:
+                yield None
+                continue
+            payload, error = sent
+            data = _Extracted.model_validate_json(payload)
+            yield data.nodes, data.edges, error
+
+
+def _index_one_json(
+    path: Path, rel_path: str, languages: tuple[str, ...]
+) -> tuple[str, str | None] | None:
+    """_index_one() with the symbols serialized as JSON, for worker processes.
+
+    JSON from pydantic-core crosses the process boundary several times
+    cheaper than pickled models, on both the sending and receiving side.
+    """
+    outcome = _index_one(path, rel_path, languages)
+    if outcome is None:
+        return None
+    nodes, edges, error = outcome
+    return _Extracted.model_construct(nodes=nodes, edges=edges).model_dump_json(), error
+
+
+@lru_cache(maxsize=8)
+def _parser_factory(languages: tuple[str, ...]) -> ParserFactory:
+    """One ParserFactory per language set and process; parsers are never pickled."""
+    return ParserFactory(list(languages))
+
+
+def _index_one(
+    path: Path, rel_path: str, languages: tuple[str, ...]
+) -> tuple[list[Node], list[Edge], str | None] | None:
+    """Parse one file and extract its symbols; runs in index_codebase's workers.
+
+    Returns None for a file no enabled parser handles, and (nodes, edges,
+    error) otherwise, with empty lists and a message if extraction failed.
+    """
+    parsed = _parser_factory(languages).parse_file(path)
+    if parsed is None:
+        return None
+    tree, language = parsed
+    try:
+        nodes, edges = extract_symbols(tree, language, rel_path)
+    except Exception as e:
+        return [], [], f"{rel_path}: {e}"
+    return nodes, edges, None
+
+
 def index_files(
     file_paths: list[Path],
     config: HammyConfig,
@@ -129,19 +247,21 @@ def index_files(
         Tuple of (nodes, edges, errors).
     """
     parser_factory = ParserFactory(config.parsing.languages)
+    root_prefix = os.path.join(os.fspath(project_root), "")
     nodes: list[Node] = []
     edges: list[Edge] = []
     errors: list[str] = []
 
     for path in file_paths:
-        if not path.exists():
+        try:
+            parsed = parser_factory.parse_file(path)
+        except FileNotFoundError:
             continue
-        parsed = parser_factory.parse_file(path)
         if parsed is None:
             continue
         tree, language = parsed
         try:
-            rel_path = str(path.relative_to(project_root))
+            rel_path = _relative_to(path, root_prefix)
             file_nodes, file_edges = extract_symbols(tree, language, rel_path)
             nodes.extend(file_nodes)
             edges.extend(file_edges)
@@ -149,3 +269,15 @@ def index_files(
             errors.append(f"{path}: {e}")
 
     return nodes, edges, errors
+
+
+def _relative_to(path: Path, root_prefix: str) -> str:
+    """``str(path.relative_to(root))``, by slicing when path is under ``root_prefix``.
+
+    ``root_prefix`` is the root with a trailing separator. Paths that do not
+    start with it go through Path.relative_to(), which normalizes or raises.
+    """
+    path_str = os.fspath(path)
+    if path_str.startswith(root_prefix):
+        return path_str[len(root_prefix):]
+    return str(path.relative_to(root_prefix))
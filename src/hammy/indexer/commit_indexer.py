@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from itertools import chain
 from pathlib import Path
+from typing import Any, Iterator
 
 from hammy.config import HammyConfig
 from hammy.tools.qdrant_tools import QdrantManager
@@ -35,27 +37,30 @@ def index_commits(
     project_root = Path(config.project.root).resolve()
     vcs = VCSWrapper(project_root)
 
-    commits = vcs.log(limit=config.vcs.max_commits)
-    result = CommitIndexResult(commits_processed=len(commits))
+    result = CommitIndexResult()
 
-    if not commits:
+    # Commits stream from the VCS through upsert_commits, which pulls one
+    # batch at a time, so only that batch's commits and dicts exist at once.
+    commits = vcs.iter_log(limit=config.vcs.max_commits)
+    first = next(commits, None)
+    if first is None:
         return result
 
-    commit_dicts = [
-        {
-            "revision": c.revision,
-            "author": c.author,
-            "date": c.date.isoformat(),
-            "message": c.message,
-            "files_changed": c.files_changed,
-        }
-        for c in commits
-    ]
+    def commit_dicts() -> Iterator[dict[str, Any]]:
+        for c in chain([first], commits):
+            result.commits_processed += 1
+            yield {
+                "revision": c.revision,
+                "author": c.author,
+                "date": c.date.isoformat(),
+                "message": c.message,
+                "files_changed": c.files_changed,
+            }
 
     if qdrant is None:
         qdrant = QdrantManager(config.qdrant, project_name=config.project.name)
 
     qdrant.ensure_collections()
-    result.commits_indexed = qdrant.upsert_commits(commit_dicts)
+    result.commits_indexed = qdrant.upsert_commits(commit_dicts())
 
     return result
@@ -9,7 +9,13 @@ from __future__ import annotations
 
 import json
 import os
+import random
 import re
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
 from pathlib import Path
 from typing import Callable
 
@@ -24,6 +30,8 @@ from dotenv import load_dotenv
 logging.getLogger("LiteLLM").setLevel(logging.CRITICAL)
 
 from hammy.config import EnrichmentConfig
+from hammy.indexer import llm_batch
+from hammy.indexer.summary_cache import SummaryCache, summary_key
 from hammy.schema.models import Node, NodeType
 
 
@@ -42,6 +50,12 @@ _PROVIDER_API_BASES: dict[str, str] = {
 }
 
 
+_MAX_TOKENS = 512
+
+# First wait before retrying a rate-limited call; doubles on each retry
+_RETRY_BASE_DELAY = 1.0
+
+
 def _resolve_api_key(provider: str) -> str | None:
     """Look up the API key for a provider from environment variables."""
     env_var = _PROVIDER_ENV_VARS.get(provider.lower())
@@ -54,19 +68,38 @@ def _resolve_api_key(provider: str) -> str | None:
 # imports are just paths; neither benefit from LLM description.
 _ENRICHABLE_TYPES = {NodeType.FUNCTION, NodeType.METHOD, NodeType.CLASS}
 
+# Comment openers dropped from snippets for the fuzzy cache key; "*" covers
+# the body lines of /** ... */ blocks
+_COMMENT_PREFIXES: dict[str, tuple[str, ...]] = {
+    "python": ("#",),
+    "php": ("#", "//", "/*", "*"),
+}
+_C_STYLE_COMMENT_PREFIXES = ("//", "/*", "*")
+
+# Everything that is the same for every batch lives in the system prompt,
+# so it forms a stable prefix that providers can cache between calls; the
+# user turn holds only the batch's symbols.
 _SYSTEM_PROMPT = (
     "You are a code documentation assistant. "
+    "The user lists numbered code symbols; for each one write one sentence "
+    "describing what it does. "
     "Return ONLY a valid JSON array of strings with no other text, "
     "markdown, or code fences. Each string must be one sentence "
     "(max 20 words) describing what the corresponding code symbol does."
 )
 
 _USER_TEMPLATE = """\
-For each symbol below write one sentence describing what it does.
 Return a JSON array with exactly {n} strings, one per symbol.
 
 {symbols}"""
 
+# Markdown code fences, and the outermost JSON array, in an LLM response
+_FENCE_RE = re.compile(r"```[a-z]*\n?")
+_ARRAY_RE = re.compile(r"\[.*\]", re.DOTALL)
+
+# LiteLLM providers that honour cache_control breakpoints on message content
+_PROMPT_CACHE_PROVIDERS = frozenset({"anthropic"})
+
 
 def get_code_snippet(node: Node, project_root: Path, max_lines: int = 40) -> str:
     """Extract the source lines for a node from disk.
@@ -79,26 +112,104 @@ def get_code_snippet(node: Node, project_root: Path, max_lines: int = 40) -> str
     Returns:
         Source code string, or empty string if the file can't be read.
     """
-    file_path = project_root / node.loc.file
-    if not file_path.exists():
-        return ""
+    start = max(0, node.loc.lines[0] - 1)  # 1-indexed → 0-indexed
+    end = node.loc.lines[1]
 
+    # Read only as far as the symbol's last line; past max_lines the
+    # remaining lines are just counted for the truncation marker
     try:
-        source = file_path.read_text(errors="replace")
+        with open(project_root / node.loc.file, errors="replace") as f:
+            snippet = [
+                line.rstrip("\n") for line in islice(f, start, min(end, start + max_lines))
+            ]
+            more = sum(1 for _ in islice(f, max(0, end - start - max_lines)))
     except OSError:
         return ""
 
-    lines = source.splitlines()
-    start = max(0, node.loc.lines[0] - 1)  # 1-indexed → 0-indexed
-    end = min(len(lines), node.loc.lines[1])
-    snippet = lines[start:end]
+    if more:
+        snippet.append(f"... ({more} more lines)")
+
+    return "\n".join(snippet)
 
-    if len(snippet) > max_lines:
-        snippet = snippet[:max_lines] + [f"... ({len(lines[start:end]) - max_lines} more lines)"]
 
+def _snippets_by_file(nodes: list[Node], project_root: Path) -> list[str]:
+    """get_code_snippet() for each node, reading each file only once.
+
+    Nodes are grouped by file, so only one file's lines are held at a time.
+    """
+    by_file: dict[str, list[int]] = defaultdict(list)
+    for i, node in enumerate(nodes):
+        by_file[node.loc.file].append(i)
+
+    snippets = [""] * len(nodes)
+    for file, indices in by_file.items():
+        try:
+            with open(project_root / file, errors="replace") as f:
+                lines = f.read().split("\n")
+        except OSError:
+            continue
+        if lines[-1] == "":
+            lines.pop()  # split() leaves an empty item after a final newline
+        for i in indices:
+            snippets[i] = _slice_snippet(lines, nodes[i])
+    return snippets
+
+
+def _slice_snippet(lines: list[str], node: Node, max_lines: int = 40) -> str:
+    """The part of a file's lines get_code_snippet() would return for node."""
+    start = max(0, node.loc.lines[0] - 1)
+    end = min(len(lines), node.loc.lines[1])
+    snippet = lines[start : min(end, start + max_lines)]
+    more = end - start - max_lines
+    if more > 0:
+        snippet.append(f"... ({more} more lines)")
     return "\n".join(snippet)
 
 
+class _RateLimiter:
+    """Token bucket shared by the enrichment threads.
+
+    Allows ``rate`` calls per second on average and at most ``burst`` back
+    to back; acquire() blocks until a call may be made.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self._rate = rate
+        self._capacity = float(burst)
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self._capacity, self._tokens + (now - self._updated) * self._rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self._rate
+            time.sleep(wait)
+
+
+def _normalize_snippet(snippet: str, language: str | None) -> str:
+    """Reduce a snippet to its code for cache keying.
+
+    Drops blank and whole-line comment lines and collapses runs of
+    whitespace, so reformatting or editing a comment keeps the same key.
+    """
+    prefixes = _COMMENT_PREFIXES.get(language or "", _C_STYLE_COMMENT_PREFIXES)
+    lines = []
+    for line in snippet.splitlines():
+        line = " ".join(line.split())
+        if line and not line.startswith(prefixes):
+            lines.append(line)
+    return "\n".join(lines)
+
+
 def _build_prompt(items: list[tuple[Node, str]]) -> str:
     """Build the user prompt for a batch of (node, snippet) pairs."""
     parts = []
@@ -121,7 +232,7 @@ def _build_prompt(items: list[tuple[Node, str]]) -> str:
 def _parse_summaries(text: str, expected: int) -> list[str | None]:
     """Extract the JSON array from LLM response, tolerating minor formatting noise."""
     # Strip markdown fences if present
-    text = re.sub(r"```[a-z]*\n?", "", text).strip()
+    text = _FENCE_RE.sub("", text).strip()
 
     try:
         parsed = json.loads(text)
@@ -131,7 +242,7 @@ def _parse_summaries(text: str, expected: int) -> list[str | None]:
         pass
 
     # Try to extract just the array portion
-    match = re.search(r"\[.*\]", text, re.DOTALL)
+    match = _ARRAY_RE.search(text)
     if match:
         try:
             parsed = json.loads(match.group())
@@ -147,6 +258,17 @@ def _parse_summaries(text: str, expected: int) -> list[str | None]:
     return [None] * expected
 
 
+def _messages(items: list[tuple[Node, str]], *, cache_prefix: bool = False) -> list[dict]:
+    """Chat messages for a batch; cache_prefix marks the system prompt cacheable."""
+    system: str | list[dict] = _SYSTEM_PROMPT
+    if cache_prefix:
+        system = [{"type": "text", "text": _SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}]
+    return [
+        {"role": "system", "content": system},
+        {"role": "user", "content": _build_prompt(items)},
+    ]
+
+
 def _summarize_batch_litellm(
     items: list[tuple[Node, str]],
     model: str,
@@ -163,16 +285,14 @@ def _summarize_batch_litellm(
     api_key and api_base are passed explicitly to prevent LiteLLM's model-name
     detection from overriding the intended provider (e.g. gpt-* via OpenRouter).
     """
-    prompt = _build_prompt(items)
     response = litellm.completion(
         model=model,
-        max_tokens=512,
+        max_tokens=_MAX_TOKENS,
         api_key=api_key,
         api_base=api_base,
-        messages=[
-            {"role": "system", "content": _SYSTEM_PROMPT},
-            {"role": "user", "content": prompt},
-        ],
+        messages=_messages(
+            items, cache_prefix=model.split("/", 1)[0].lower() in _PROMPT_CACHE_PROVIDERS
+        ),
     )
     text = response.choices[0].message.content or ""
     return _parse_summaries(text, len(items))
@@ -189,13 +309,34 @@ def enrich_nodes(
 
     Filters to FUNCTION/METHOD/CLASS nodes. Skips nodes that already have
     summaries when config.skip_if_summary is True. Calls the configured LLM
-    in batches and writes the result back to node.summary.
+    in batches and writes the result back to node.summary. Up to
+    config.concurrency batches are in flight at once, since each call spends
+    nearly all its time waiting on the API. Calls are spaced to stay under
+    config.requests_per_minute (if set), and a call that is rate limited
+    anyway is retried up to config.max_retries times with exponential
+    backoff and jitter.
+
+    When config.cache is True, summaries are also kept in the project's
+    summary cache, and a symbol whose prompt inputs have not changed since
+    an earlier run gets its stored summary without an LLM call. Those
+    symbols count as enriched. With config.fuzzy_cache the key is built
+    from the snippet without comments and formatting, so such edits reuse
+    the stored summary too.
+
+    With config.mode == "batch" the symbols go to the provider's Batch API
+    instead (see hammy.indexer.llm_batch), and this call waits up to
+    config.batch_timeout seconds for the job. Results pass through the
+    summary cache: a job still running when the wait ends, or left behind
+    by an interrupted run, is collected by a later run, and its symbols
+    are not submitted again meanwhile. If the job cannot be submitted, or
+    ends without output, the symbols are enriched online.
 
     Args:
         nodes: All indexed nodes (modified in place).
         project_root: Absolute path to project root for reading source files.
         config: Enrichment configuration.
-        progress_callback: Optional fn(completed, total) called after each batch.
+        progress_callback: Optional fn(completed, total) called after each batch,
+            from the calling thread, as batches finish.
 
     Returns:
         Tuple of (number enriched, list of error strings).
@@ -216,16 +357,15 @@ def enrich_nodes(
         return 0, []
 
     # Build (node, snippet) pairs, skipping nodes with no readable code
-    enrichable: list[tuple[Node, str]] = []
-    for node in candidates:
-        snippet = get_code_snippet(node, project_root)
-        if snippet:
-            enrichable.append((node, snippet))
+    enrichable = [
+        (node, snippet)
+        for node, snippet in zip(candidates, _snippets_by_file(candidates, project_root))
+        if snippet
+    ]
 
     if not enrichable:
         return 0, []
 
-    errors: list[str] = []
     enriched = 0
     total = len(enrichable)
 
@@ -234,36 +374,216 @@ def enrich_nodes(
     api_key = _resolve_api_key(config.provider)
     api_base = _PROVIDER_API_BASES.get(config.provider.lower())
 
-    for batch_start in range(0, total, config.batch_size):
-        batch = enrichable[batch_start : batch_start + config.batch_size]
+    batch_mode = config.mode == "batch"
+    errors: list[str] = []
+    # Batch mode requires the cache (enforced by EnrichmentConfig)
+    cache = SummaryCache(project_root) if config.cache else None
+    # Cache keys of symbols in jobs that are still running
+    in_flight: set[bytes] = set()
+    if batch_mode:
+        for job in llm_batch.load_pending(project_root):
+            if job.provider != config.provider:
+                continue
+            try:
+                found = _collect_batch_job(
+                    job, project_root, cache, config, api_key, api_base, timeout=0
+                )
+            except Exception as e:
+                errors.append(f"Pending batch {job.batch_id}: {e}")
+                continue
+            if found is None:
+                errors.append(_still_running(job.batch_id))
+                in_flight.update(
+                    bytes.fromhex(k) for hex_keys in job.keys.values() for k in hex_keys
+                )
+
+    keys: list[bytes] = []
+    if cache is not None:
+        all_keys = [
+            summary_key(
+                litellm_model,
+                node,
+                _normalize_snippet(snippet, node.language) if config.fuzzy_cache else snippet,
+            )
+            for node, snippet in enrichable
+        ]
+        cached = cache.get_many(all_keys)
+        misses: list[tuple[Node, str]] = []
+        for item, key in zip(enrichable, all_keys):
+            summary = cached.get(key)
+            if summary:
+                item[0].summary = summary
+                enriched += 1
+            elif key not in in_flight:
+                misses.append(item)
+                keys.append(key)
+        enrichable = misses
+        if enriched and progress_callback:
+            progress_callback(enriched, total)
+
+    if batch_mode and enrichable:
+        requests = {}
+        job_keys = {}
+        for start in range(0, len(enrichable), config.batch_size):
+            custom_id = str(start)
+            requests[custom_id] = _messages(enrichable[start : start + config.batch_size])
+            job_keys[custom_id] = [k.hex() for k in keys[start : start + config.batch_size]]
         try:
-            summaries = _summarize_batch_litellm(batch, litellm_model, api_key, api_base)
+            batch_id = llm_batch.submit(
+                requests,
+                provider=config.provider,
+                model=config.model,
+                max_tokens=_MAX_TOKENS,
+                api_key=api_key,
+                api_base=api_base,
+            )
         except Exception as e:
-            errors.append(f"Batch {batch_start // config.batch_size + 1}: {e}")
-            if progress_callback:
-                progress_callback(batch_start + len(batch), total)
-            continue
+            errors.append(f"Batch API unavailable ({e}); enriching online")
+        else:
+            job = llm_batch.BatchJob(batch_id, config.provider, litellm_model, job_keys)
+            llm_batch.save_pending(project_root, [*llm_batch.load_pending(project_root), job])
+            found: dict[bytes, str] | None = {}
+            try:
+                found = _collect_batch_job(
+                    job, project_root, cache, config, api_key, api_base,
+                    timeout=config.batch_timeout,
+                )
+            except llm_batch.BatchFailedError as e:
+                # The job is gone, but its symbols can still be summarized online
+                errors.append(f"{e}; enriching online")
+                found = None
+            except Exception as e:
+                errors.append(f"Batch {batch_id}: {e}")
+            else:
+                if found is None:
+                    errors.append(_still_running(batch_id))
+                    found = {}
+            if found is not None:
+                for (node, _), key in zip(enrichable, keys):
+                    summary = found.get(key)
+                    if summary:
+                        node.summary = summary
+                        enriched += 1
+                if progress_callback:
+                    progress_callback(total, total)
+                return enriched, errors
+
+    # The bucket holds one token per worker, so the first round of batches
+    # goes out at once and later calls follow at the configured rate.
+    limiter = None
+    if config.requests_per_minute > 0:
+        limiter = _RateLimiter(config.requests_per_minute / 60, max(1, config.concurrency))
+
+    def call(items: list[tuple[Node, str]]) -> list[str | None]:
+        attempt = 0
+        while True:
+            if limiter is not None:
+                limiter.acquire()
+            try:
+                return _summarize_batch_litellm(items, litellm_model, api_key, api_base)
+            except litellm.RateLimitError:
+                if attempt >= config.max_retries:
+                    raise
+            delay = _RETRY_BASE_DELAY * 2**attempt
+            time.sleep(delay + random.uniform(0, delay))
+            attempt += 1
+
+    def summarize(batch: list[tuple[Node, str]]) -> list[str | None]:
+        """Summarize one batch; returns one summary (or None) per item."""
+        summaries = call(batch)
 
         # If the model returned None for every item (parse failure), fall back to
         # single-item calls so a bad batch doesn't silently drop all its symbols.
         if all(s is None for s in summaries) and len(batch) > 1:
+            summaries = []
             for item in batch:
                 try:
-                    single = _summarize_batch_litellm([item], litellm_model, api_key, api_base)
-                    summaries_one = single
+                    summaries.extend(call([item]))
                 except Exception:
-                    summaries_one = [None]
-                node, _ = item
-                if summaries_one[0]:
-                    node.summary = summaries_one[0]
-                    enriched += 1
-        else:
-            for (node, _), summary in zip(batch, summaries):
-                if summary:
-                    node.summary = summary
-                    enriched += 1
+                    summaries.append(None)
+        return summaries
+
+    starts = range(0, len(enrichable), config.batch_size)
+    batches = [enrichable[start : start + config.batch_size] for start in starts]
+    batch_errors: list[tuple[int, str]] = []
+    completed = total - len(enrichable)
+
+    # Batches touch disjoint nodes, so they can run side by side
+    with ThreadPoolExecutor(max_workers=max(1, min(config.concurrency, len(batches)))) as pool:
+        futures = {pool.submit(summarize, batch): i for i, batch in enumerate(batches)}
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                summaries = future.result()
+            except Exception as e:
+                batch_errors.append((i, f"Batch {i + 1}: {e}"))
+            else:
+                fresh: list[tuple[bytes, str]] = []
+                for j, ((node, _), summary) in enumerate(zip(batches[i], summaries)):
+                    if summary:
+                        node.summary = summary
+                        enriched += 1
+                        if cache is not None:
+                            fresh.append((keys[starts[i] + j], summary))
+                if cache is not None:
+                    cache.put_many(fresh, litellm_model)
+            completed += len(batches[i])
+            if progress_callback:
+                progress_callback(completed, total)
+
+    return enriched, errors + [message for _, message in sorted(batch_errors)]
 
-        if progress_callback:
-            progress_callback(batch_start + len(batch), total)
 
-    return enriched, errors
+def _still_running(batch_id: str) -> str:
+    return f"Batch {batch_id} is still running; a later run will collect its summaries"
+
+
+def _collect_batch_job(
+    job: llm_batch.BatchJob,
+    project_root: Path,
+    cache: SummaryCache,
+    config: EnrichmentConfig,
+    api_key: str | None,
+    api_base: str | None,
+    *,
+    timeout: float,
+) -> dict[bytes, str] | None:
+    """Wait up to ``timeout`` seconds for a batch job and cache its summaries.
+
+    Drops the job from the pending list once it has ended, and returns the
+    summaries by cache key; returns None, keeping the job pending, if it is
+    still running. A job that ended without output is dropped before its
+    BatchFailedError propagates.
+    """
+    try:
+        texts = llm_batch.wait(
+            job.batch_id,
+            provider=job.provider,
+            poll_interval=config.batch_poll_interval,
+            timeout=timeout,
+            api_key=api_key,
+            api_base=api_base,
+        )
+    except llm_batch.BatchFailedError:
+        _drop_pending(project_root, job)
+        raise
+    if texts is None:
+        return None
+    found: dict[bytes, str] = {}
+    for custom_id, hex_keys in job.keys.items():
+        text = texts.get(custom_id)
+        if text is None:
+            continue
+        for hex_key, summary in zip(hex_keys, _parse_summaries(text, len(hex_keys))):
+            if summary:
+                found[bytes.fromhex(hex_key)] = summary
+    cache.put_many(list(found.items()), job.model)
+    _drop_pending(project_root, job)
+    return found
+
+
+def _drop_pending(project_root: Path, job: llm_batch.BatchJob) -> None:
+    llm_batch.save_pending(
+        project_root,
+        [p for p in llm_batch.load_pending(project_root) if p.batch_id != job.batch_id],
+    )
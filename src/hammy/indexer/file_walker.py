@@ -2,12 +2,17 @@
 
 Walks a project directory tree, yielding files that should be analyzed.
 Skips ignored paths and files exceeding the configured size limit.
+
+Directories are read with os.scandir, whose entries carry the file type
+and cache their stat results. Output order is the same as a sorted
+top-down os.walk.
 """
 
 from __future__ import annotations
 
 import os
 from dataclasses import dataclass
+from operator import attrgetter
 from pathlib import Path
 from typing import Iterator
 
@@ -22,6 +27,7 @@ class FileEntry:
     path: Path
     language: str | None
     size_bytes: int
+    rel_path: str = ""  # relative to the walked root
 
 
 def detect_language(filepath: Path) -> str | None:
@@ -51,35 +57,79 @@ def walk_project(
     root = root.resolve()
     max_size_bytes = max_file_size_kb * 1024
 
-    for dirpath, dirnames, filenames in os.walk(root):
-        current_dir = Path(dirpath)
-
-        # Prune ignored directories in-place so os.walk doesn't descend into them
-        dirnames[:] = [
-            d
-            for d in dirnames
-            if not ignore_manager.is_ignored(current_dir / d, is_dir=True)
-        ]
-        # Sort for deterministic order
-        dirnames.sort()
-
-        for filename in sorted(filenames):
-            filepath = current_dir / filename
+    # Relative paths are built from the directory prefix and entry names
+    # rather than with Path.relative_to(), and scandir reports which entries
+    # are directories, so the ignore check needs no Path objects or stats.
+    # The only Paths are one per directory, which yielded files are joined
+    # onto (much cheaper than parsing each file's full path).
+    # Ignore patterns are relative to the manager's root, which may sit
+    # above the walked root.
+    root_str = str(root)
+    try:
+        ignore_base = str(root.relative_to(ignore_manager.project_root))
+    except ValueError:
+        ignore_base = None  # outside the manager's project: nothing is ignored
+    if ignore_base == ".":
+        ignore_base = ""
+
+    is_ignored = ignore_manager.is_ignored_relative
+
+    def ignored(rel: str, is_dir: bool) -> bool:
+        if ignore_base is None:
+            return False
+        if ignore_base:
+            rel = os.path.join(ignore_base, rel)
+        return is_ignored(rel, is_dir=is_dir)
+
+    # Depth-first, in sorted order: a directory's files, then each
+    # subdirectory in turn.
+    stack: list[tuple[str, str, Path]] = [(root_str, "", root)]
+    while stack:
+        dirpath, prefix, dir_path = stack.pop()
+        subdirs = []
+        files = []
+        for entry in _list_dir(dirpath):
+            rel_path = prefix + entry.name
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if is_dir:
+                # Like os.walk, symlinked directories are not followed
+                if not entry.is_symlink() and not ignored(rel_path, True):
+                    subdirs.append((entry.path, rel_path + os.sep, dir_path / entry.name))
+            elif not ignored(rel_path, False):
+                files.append((entry, rel_path))
+
+        for entry, rel_path in files:
+            name = entry.name
+            # Same as os.path.splitext() but for names with several
+            # leading dots, which no language extension matches
+            dot = name.rfind(".")
+            language = EXTENSION_MAP.get(name[dot:].lower()) if dot > 0 else None
 
-            if ignore_manager.is_ignored(filepath):
+            if languages is not None and language not in languages:
                 continue
 
             try:
-                size = filepath.stat().st_size
+                size = entry.stat().st_size
             except OSError:
                 continue
 
             if size > max_size_bytes:
                 continue
 
-            language = detect_language(filepath)
+            yield FileEntry(
+                path=dir_path / name, language=language, size_bytes=size, rel_path=rel_path
+            )
+
+        stack.extend(reversed(subdirs))
 
-            if languages is not None and language not in languages:
-                continue
 
-            yield FileEntry(path=filepath, language=language, size_bytes=size)
+def _list_dir(dirpath: str) -> list[os.DirEntry[str]]:
+    """A directory's entries sorted by name, or none if it can't be read."""
+    try:
+        with os.scandir(dirpath) as it:
+            return sorted(it, key=attrgetter("name"))
+    except OSError:
+        return []
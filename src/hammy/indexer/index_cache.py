@@ -20,11 +20,14 @@ Usage:
 
 from __future__ import annotations
 
+import gc
 import json
 import logging
 from datetime import datetime, timezone
 from pathlib import Path
 
+from pydantic import BaseModel
+
 from hammy.schema.models import Edge, Node
 
 logger = logging.getLogger(__name__)
@@ -33,6 +36,16 @@ _CACHE_DIR = ".hammy"
 _CACHE_FILE = "index.json"
 
 
+class _IndexFile(BaseModel):
+    """Layout of .hammy/index.json."""
+
+    indexed_at: str | None = None
+    node_count: int = 0
+    edge_count: int = 0
+    nodes: list[Node]
+    edges: list[Edge]
+
+
 def cache_path(project_root: Path) -> Path:
     return project_root / _CACHE_DIR / _CACHE_FILE
 
@@ -45,38 +58,51 @@ def save_index(project_root: Path, nodes: list[Node], edges: list[Edge]) -> Path
     path = cache_path(project_root)
     path.parent.mkdir(exist_ok=True)
 
-    data = {
-        "indexed_at": datetime.now(timezone.utc).isoformat(),
-        "node_count": len(nodes),
-        "edge_count": len(edges),
-        "nodes": [n.model_dump() for n in nodes],
-        "edges": [e.model_dump() for e in edges],
-    }
+    data = _IndexFile.model_construct(
+        indexed_at=datetime.now(timezone.utc).isoformat(),
+        node_count=len(nodes),
+        edge_count=len(edges),
+        nodes=nodes,
+        edges=edges,
+    )
 
-    path.write_text(json.dumps(data, separators=(",", ":")))
+    path.write_text(data.model_dump_json())
     logger.debug("Saved index cache: %d nodes, %d edges → %s", len(nodes), len(edges), path)
     return path
 
 
-def load_index(project_root: Path) -> tuple[list[Node], list[Edge]] | None:
+def load_index(
+    project_root: Path, *, pause_gc: bool = False
+) -> tuple[list[Node], list[Edge]] | None:
     """Load nodes and edges from .hammy/index.json.
 
     Returns None if the cache doesn't exist or is corrupt (caller should
     fall back to a full re-parse).
+
+    Loading allocates hundreds of thousands of model objects and nothing
+    cyclic; with the collector on, most of the load time goes to full
+    collections triggered by those allocations. pause_gc=True disables the
+    collector for the load. The switch is process-wide, so only pass it
+    from single-threaded startup code, never from a running server.
     """
     path = cache_path(project_root)
     if not path.exists():
         return None
 
+    gc_was_enabled = gc.isenabled()
+    if pause_gc:
+        gc.disable()
     try:
-        data = json.loads(path.read_text())
-        nodes = [Node.model_validate(n) for n in data["nodes"]]
-        edges = [Edge.model_validate(e) for e in data["edges"]]
+        data = _IndexFile.model_validate_json(path.read_bytes())
+        nodes, edges = data.nodes, data.edges
         logger.debug("Loaded index cache: %d nodes, %d edges from %s", len(nodes), len(edges), path)
         return nodes, edges
     except Exception as exc:
         logger.warning("Index cache corrupt or unreadable (%s) — will re-parse", exc)
         return None
+    finally:
+        if pause_gc and gc_was_enabled:
+            gc.enable()
 
 
 def cache_info(project_root: Path) -> dict | None:
@@ -0,0 +1,179 @@
+"""Enrichment through a provider's asynchronous Batch API.
+
+Batch jobs cost about half as much as online calls but can take up to a
+day, which suits a first full-project enrichment. The requests are
+uploaded as a JSONL file with litellm.create_file(), the job is started
+with litellm.create_batch(), polled with litellm.retrieve_batch() until it
+ends or the caller's timeout passes, and its output read back with
+litellm.file_content().
+
+Every submitted job is recorded in .hammy/pending_batches.json together
+with the summary-cache keys of the symbols in each request. A job that has
+not ended when the caller stops waiting (or when the process stops) is
+collected into the summary cache by a later batch-mode run instead of
+paying for the same summaries again.
+
+Only providers whose Batch API LiteLLM supports (OpenAI, Azure, Vertex AI,
+...) can be used; submit() raises for the others.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import litellm
+
+logger = logging.getLogger(__name__)
+
+_CACHE_DIR = ".hammy"
+_PENDING_FILE = "pending_batches.json"
+
+# retrieve_batch() statuses after which a job will not change
+_FINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+
+class BatchFailedError(RuntimeError):
+    """A batch job ended (failed, expired or cancelled) without any output."""
+
+
+@dataclass
+class BatchJob:
+    """A submitted batch job, as recorded in pending_batches.json."""
+
+    batch_id: str
+    provider: str
+    model: str
+    # custom_id -> hex summary-cache keys of the symbols in that request
+    keys: dict[str, list[str]]
+
+
+def pending_batches_path(project_root: Path) -> Path:
+    return project_root / _CACHE_DIR / _PENDING_FILE
+
+
+def load_pending(project_root: Path) -> list[BatchJob]:
+    """Return the recorded jobs; an unreadable file counts as empty."""
+    path = pending_batches_path(project_root)
+    try:
+        data = json.loads(path.read_text())
+        return [BatchJob(**job) for job in data]
+    except FileNotFoundError:
+        return []
+    except (OSError, ValueError, TypeError) as exc:
+        logger.warning("Ignoring unreadable %s (%s)", path, exc)
+        return []
+
+
+def save_pending(project_root: Path, jobs: list[BatchJob]) -> None:
+    path = pending_batches_path(project_root)
+    if not jobs:
+        path.unlink(missing_ok=True)
+        return
+    path.parent.mkdir(exist_ok=True)
+    path.write_text(json.dumps([asdict(job) for job in jobs], indent=2))
+
+
+def submit(
+    requests: dict[str, list[dict[str, str]]],
+    *,
+    provider: str,
+    model: str,
+    max_tokens: int,
+    api_key: str | None = None,
+    api_base: str | None = None,
+) -> str:
+    """Start a batch of chat completions; returns the batch id.
+
+    Args:
+        requests: Chat messages for each request, by custom_id.
+        provider: LiteLLM provider name.
+        model: Model name as the provider knows it (without the provider prefix).
+        max_tokens: Completion limit for every request.
+    """
+    lines = [
+        json.dumps({
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {"model": model, "max_tokens": max_tokens, "messages": messages},
+        })
+        for custom_id, messages in requests.items()
+    ]
+    uploaded = litellm.create_file(
+        file=("enrichment.jsonl", "\n".join(lines).encode()),
+        purpose="batch",
+        custom_llm_provider=provider,
+        api_key=api_key,
+        api_base=api_base,
+    )
+    batch = litellm.create_batch(
+        completion_window="24h",
+        endpoint="/v1/chat/completions",
+        input_file_id=uploaded.id,
+        custom_llm_provider=provider,
+        api_key=api_key,
+        api_base=api_base,
+    )
+    return batch.id
+
+
+def wait(
+    batch_id: str,
+    *,
+    provider: str,
+    poll_interval: float,
+    timeout: float,
+    api_key: str | None = None,
+    api_base: str | None = None,
+) -> dict[str, str] | None:
+    """Poll a batch until it ends; returns the response text by custom_id.
+
+    Returns None if the job is still running after ``timeout`` seconds
+    (0 checks once). A failed status check is logged and retried at the
+    next poll, since a job outlives any single connection.
+
+    Requests that failed, or that the job never ran (expired or cancelled
+    jobs return partial output), are missing from the result. Raises
+    BatchFailedError if the job ended without any output.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            batch = litellm.retrieve_batch(
+                batch_id, custom_llm_provider=provider, api_key=api_key, api_base=api_base
+            )
+        except Exception as exc:
+            logger.warning("Checking batch %s failed (%s); retrying", batch_id, exc)
+        else:
+            if batch.status in _FINAL_STATUSES:
+                break
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        time.sleep(min(poll_interval, remaining))
+
+    if not batch.output_file_id:
+        raise BatchFailedError(f"Batch {batch_id} ended with status {batch.status!r} and no output")
+
+    content = litellm.file_content(
+        file_id=batch.output_file_id,
+        custom_llm_provider=provider,
+        api_key=api_key,
+        api_base=api_base,
+    )
+    texts: dict[str, str] = {}
+    for line in content.text.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        response = record.get("response") or {}
+        if response.get("status_code") != 200:
+            continue
+        choices = response.get("body", {}).get("choices") or []
+        if choices:
+            texts[record["custom_id"]] = choices[0]["message"].get("content") or ""
+    return texts
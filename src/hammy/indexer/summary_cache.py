@@ -0,0 +1,133 @@
+"""Persistent cache of LLM symbol summaries.
+
+Enrichment sends every candidate symbol to the LLM on each run, although
+most of them have not changed since the last one. This cache stores each
+summary in .hammy/summary-cache.sqlite under a SHA-256 of everything that
+goes into the symbol's prompt (model, language, kind, signature and source
+snippet), so an unchanged symbol is summarized once and later runs reuse
+the stored text.
+
+If the database cannot be opened the cache is disabled: lookups miss and
+writes are dropped, so callers never need to handle cache errors.
+
+Usage:
+    cache = SummaryCache(project_root)
+    key = summary_key(model, node, snippet)
+    summaries = cache.get_many([key])
+    cache.put_many([(key, "Parses the config file.")], model)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from hammy.schema.models import Node
+
+logger = logging.getLogger(__name__)
+
+_CACHE_DIR = ".hammy"
+_CACHE_FILE = "summary-cache.sqlite"
+
+# SQLite caps the number of ? parameters in one statement
+_LOOKUP_CHUNK = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS summaries (
+    key BLOB PRIMARY KEY,
+    summary TEXT NOT NULL,
+    model TEXT NOT NULL,
+    ts INTEGER NOT NULL
+)
+"""
+
+
+def summary_cache_path(project_root: Path) -> Path:
+    return project_root / _CACHE_DIR / _CACHE_FILE
+
+
+def summary_key(model: str, node: Node, snippet: str) -> bytes:
+    """Digest of the prompt inputs that determine a symbol's summary."""
+    meta = node.meta
+    parts = (
+        model,
+        node.language or "",
+        node.type.value,
+        node.name,
+        ",".join(meta.parameters),
+        meta.return_type or "",
+        snippet,
+    )
+    return hashlib.sha256("\0".join(parts).encode()).digest()
+
+
+class SummaryCache:
+    """SQLite-backed map from summary_key() digests to summaries."""
+
+    def __init__(self, project_root: Path) -> None:
+        self._project_root = project_root
+        self._conn: sqlite3.Connection | None = None
+        self._disabled = False
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection | None:
+        """Open the database on first use; return None if caching is unavailable."""
+        if self._conn is not None or self._disabled:
+            return self._conn
+        path = summary_cache_path(self._project_root)
+        try:
+            path.parent.mkdir(exist_ok=True)
+            conn = sqlite3.connect(path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(_SCHEMA)
+            conn.commit()
+        except (OSError, sqlite3.Error) as exc:
+            logger.warning("Summary cache unavailable (%s) — enriching without cache", exc)
+            self._disabled = True
+            return None
+        self._conn = conn
+        return conn
+
+    def get_many(self, keys: list[bytes]) -> dict[bytes, str]:
+        """Return the cached summary for each key that has one."""
+        found: dict[bytes, str] = {}
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return found
+            try:
+                for start in range(0, len(keys), _LOOKUP_CHUNK):
+                    chunk = keys[start : start + _LOOKUP_CHUNK]
+                    rows = conn.execute(
+                        "SELECT key, summary FROM summaries WHERE key IN "
+                        f"({','.join('?' * len(chunk))})",
+                        chunk,
+                    )
+                    found.update(rows)
+            except sqlite3.Error as exc:
+                logger.debug("Summary cache read failed: %s", exc)
+        return found
+
+    def put_many(self, entries: list[tuple[bytes, str]], model: str) -> None:
+        """Store (key, summary) pairs in a single transaction."""
+        if not entries:
+            return
+        now = int(time.time())
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO summaries (key, summary, model, ts) "
+                        "VALUES (?, ?, ?, ?)",
+                        [(key, summary, model, now) for key, summary in entries],
+                    )
+            except sqlite3.Error as exc:
+                logger.debug("Summary cache write failed: %s", exc)
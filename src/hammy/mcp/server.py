@@ -6,20 +6,35 @@ that AI coding agents can call through the MCP interface.
 
 from __future__ import annotations
 
-import re
+import heapq
+from datetime import datetime, timedelta, timezone
+from operator import itemgetter
 from pathlib import Path
 
 from mcp.server import FastMCP
 
 from hammy.config import HammyConfig
 from hammy.exporters.redis_meta import RedisMetaClient
+from hammy.indexer.ast_cache import AstCache
 from hammy.indexer.code_indexer import index_codebase
 from hammy.indexer.index_cache import load_index, save_index
 from hammy.schema.models import Edge, Node, NodeType, RelationType
+from hammy.tools.brain_batch import BatchingBrain, unsaved_warning
 from hammy.tools.bridge import resolve_bridges
-from hammy.tools.hybrid_search import BM25Index, build_bm25_index
+from hammy.tools.diff_analysis import analyze_diff
+from hammy.tools.hotspot import compute_hotspots
+from hammy.tools.hybrid_search import BM25Index, build_bm25_index, hybrid_search
 from hammy.tools.parser import ParserFactory
 from hammy.tools.qdrant_tools import QdrantManager
+from hammy.tools.recall_cache import RecallCache
+from hammy.tools.symbol_index import (
+    SymbolIndex,
+    build_symbol_index,
+    name_filter,
+    names_matcher,
+    strip_qualifier,
+    word_pattern,
+)
 from hammy.tools.vcs import VCSWrapper
 
 
@@ -52,6 +67,13 @@ def create_mcp_server(
     except Exception:
         qdrant = None
 
+    # Brain reads/writes go through `brain`, which batches upserts when configured
+    brain: QdrantManager | BatchingBrain | None = qdrant
+    if qdrant is not None and config.qdrant.brain_batch_size > 0:
+        brain = BatchingBrain(
+            qdrant, config.qdrant.brain_batch_size, config.qdrant.brain_flush_ms / 1000
+        )
+
     # Load from disk cache if available, otherwise full re-parse
     cached = load_index(project_root)
     if cached:
@@ -70,8 +92,48 @@ def create_mcp_server(
     # Stored in a list so it can be replaced in-place by the reindex tool.
     bm25_cache: list[BM25Index] = [build_bm25_index(all_nodes)]
 
+    # Precomputed lowercase fields, inverted indexes and CALLS edges for the
+    # symbol tools, replaced on reindex like the BM25 index.
+    symbol_cache: list[SymbolIndex] = [build_symbol_index(all_nodes, all_edges)]
+
+    def _bridges() -> list[Edge]:
+        """Cross-language bridges, resolved once per symbol index."""
+        index = symbol_cache[0]
+        if index.bridges is None:
+            index.bridges = resolve_bridges(all_nodes, all_edges)
+        return index.bridges
+
+    def _search_line(n: Node) -> str:
+        """One-line rendering of a symbol for search_symbols."""
+        vis = f" [{n.meta.visibility}]" if n.meta.visibility else ""
+        summary = f" | {n.summary}" if n.summary else ""
+        return (
+            f"{n.type.value}: {n.name} ({n.loc.file}:{n.loc.lines[0]}-{n.loc.lines[1]})"
+            f"{vis}{summary}"
+        )
+
+    def _definition(n: Node) -> str:
+        """Multi-line definition block for lookup_symbol (without Redis metadata)."""
+        parts = [
+            f"{n.type.value}: {n.name}",
+            f"  file: {n.loc.file}:{n.loc.lines[0]}-{n.loc.lines[1]}",
+            f"  language: {n.language}",
+        ]
+        if n.meta.visibility:
+            parts.append(f"  visibility: {n.meta.visibility}")
+        if n.meta.parameters:
+            parts.append(f"  params: {', '.join(n.meta.parameters)}")
+        if n.meta.return_type:
+            parts.append(f"  returns: {n.meta.return_type}")
+        if n.meta.is_async:
+            parts.append("  async: true")
+        if n.summary:
+            parts.append(f"  summary: {n.summary}")
+        return "\n".join(parts)
+
     # Set up parser and VCS
     parser_factory = ParserFactory(config.parsing.languages)
+    ast_cache = AstCache(project_root, parser_factory)
 
     vcs: VCSWrapper | None = None
     try:
@@ -112,34 +174,14 @@ def create_mcp_server(
 
     # --- Code Exploration Tools ---
 
-    @mcp.tool(
-        name="ast_query",
-        description=(
-            "You know the file, now see what's in it. Returns every class, function, "
-            "method, endpoint, and import with line numbers, visibility, and LLM summaries. "
-            "Use query_type to focus: 'classes', 'functions', 'methods', 'endpoints', or 'imports'."
-        ),
-    )
-    def ast_query(file_path: str, query_type: str = "all") -> str:
-        """Query AST of a file.
-
-        Args:
-            file_path: Path to the file (relative to project root).
-            query_type: What to extract - 'all', 'classes', 'functions',
-                        'methods', 'endpoints', or 'imports'.
-        """
-        full_path = project_root / file_path
-        if not full_path.exists():
-            return f"File not found: {file_path}"
-
-        result = parser_factory.parse_file(full_path)
+    def _ast_report(
+        file_path: str, result: tuple[list[Node], list[Edge]] | None, query_type: str
+    ) -> str:
+        """Format one file's extracted symbols for ast_query / ast_query_batch."""
         if result is None:
             return f"Unsupported file type: {file_path}"
 
-        tree, lang = result
-        from hammy.tools.ast_tools import extract_symbols
-
-        nodes, edges = extract_symbols(tree, lang, file_path)
+        nodes, edges = result
 
         type_filter = {
             "classes": NodeType.CLASS,
@@ -159,19 +201,69 @@ def create_mcp_server(
 
         lines = []
         for n in nodes:
-            line = f"{n.type.value}: {n.name} ({n.loc.file}:{n.loc.lines[0]}-{n.loc.lines[1]})"
-            if n.meta.visibility:
-                line += f" [{n.meta.visibility}]"
-            if n.meta.is_async:
-                line += " [async]"
-            if n.meta.return_type:
-                line += f" -> {n.meta.return_type}"
-            if n.summary:
-                line += f" | {n.summary}"
-            lines.append(line)
+            vis = f" [{n.meta.visibility}]" if n.meta.visibility else ""
+            is_async = " [async]" if n.meta.is_async else ""
+            ret = f" -> {n.meta.return_type}" if n.meta.return_type else ""
+            summary = f" | {n.summary}" if n.summary else ""
+            lines.append(
+                f"{n.type.value}: {n.name} ({n.loc.file}:{n.loc.lines[0]}-{n.loc.lines[1]})"
+                f"{vis}{is_async}{ret}{summary}"
+            )
 
         return "\n".join(lines) or "No symbols found."
 
+    @mcp.tool(
+        name="ast_query",
+        description=(
+            "You know the file, now see what's in it. Returns every class, function, "
+            "method, endpoint, and import with line numbers, visibility, and LLM summaries. "
+            "Use query_type to focus: 'classes', 'functions', 'methods', 'endpoints', or 'imports'."
+        ),
+    )
+    def ast_query(file_path: str, query_type: str = "all") -> str:
+        """Query AST of a file.
+
+        Args:
+            file_path: Path to the file (relative to project root).
+            query_type: What to extract - 'all', 'classes', 'functions',
+                        'methods', 'endpoints', or 'imports'.
+        """
+        full_path = project_root / file_path
+        if not full_path.exists():
+            return f"File not found: {file_path}"
+
+        return _ast_report(file_path, ast_cache.extract(file_path), query_type)
+
+    @mcp.tool(
+        name="ast_query_batch",
+        description=(
+            "ast_query for several files in one call. Pass a comma-separated list of paths; "
+            "files are parsed in parallel. Replaces N×ast_query when opening a module. Cap: 20 files."
+        ),
+    )
+    def ast_query_batch(file_paths: str, query_type: str = "all") -> str:
+        """Query the AST of several files at once.
+
+        Args:
+            file_paths: Comma-separated paths relative to project root.
+            query_type: What to extract - 'all', 'classes', 'functions',
+                        'methods', 'endpoints', or 'imports'.
+        """
+        paths = [p.strip() for p in file_paths.split(",") if p.strip()][:20]
+        if not paths:
+            return "Provide at least one file path."
+
+        found = [p for p in paths if (project_root / p).exists()]
+        extracted = dict(zip(found, ast_cache.extract_many(found)))
+        sections = []
+        for path in paths:
+            if path in extracted:
+                report = _ast_report(path, extracted[path], query_type)
+            else:
+                report = f"File not found: {path}"
+            sections.append(f"=== {path} ===\n{report}")
+        return "\n\n".join(sections)
+
     @mcp.tool(
         name="search_symbols",
         description=(
@@ -195,46 +287,19 @@ def create_mcp_server(
             node_type: Optional type filter ('class', 'function', 'method', 'endpoint').
             file_filter: Optional path substring to restrict results (e.g. 'controllers/').
         """
-        query_lower = query.lower()
-        scored: list[tuple[int, Node]] = []
-
-        for node in all_nodes:
-            if node.type == NodeType.COMMENT:
-                continue
-            if language and node.language != language:
-                continue
-            if node_type and node.type.value != node_type:
-                continue
-            if file_filter and file_filter.lower() not in node.loc.file.lower():
-                continue
-
-            name_lower = node.name.lower()
-            if name_lower == query_lower:
-                scored.append((4, node))
-            elif name_lower.startswith(query_lower):
-                scored.append((3, node))
-            elif query_lower in name_lower:
-                scored.append((2, node))
-            elif query_lower in node.summary.lower():
-                scored.append((1, node))
-
-        if not scored:
+        results, total = symbol_cache[0].search(query, language, node_type, file_filter)
+        if not results:
             return f"No symbols matching '{query}' found."
 
-        scored.sort(key=lambda x: (-x[0], len(x[1].name)))
-        results = [n for _, n in scored]
+        lines = [symbol_cache[0].render("search", n, _search_line) for n in results]
 
-        lines = []
-        for n in results[:25]:
-            line = f"{n.type.value}: {n.name} ({n.loc.file}:{n.loc.lines[0]}-{n.loc.lines[1]})"
-            if n.meta.visibility:
-                line += f" [{n.meta.visibility}]"
-            if n.summary:
-                line += f" | {n.summary}"
-            lines.append(line)
-
-        if len(results) > 25:
-            lines.append(f"\n... and {len(results) - 25} more. Use file_filter or node_type to narrow.")
+        if total is None:
+            lines.append(
+                f"\n... and possibly more (at least {len(results)} symbols are named '{query}'). "
+                "Use file_filter or node_type to narrow."
+            )
+        elif total > len(results):
+            lines.append(f"\n... and {total - len(results)} more. Use file_filter or node_type to narrow.")
 
         return "\n".join(lines)
 
@@ -255,24 +320,7 @@ def create_mcp_server(
             file_filter: Optional path substring to restrict results (e.g. 'controllers/').
             argument_filter: Optional substring to match against the call expression (e.g. 'Issue_Builder').
         """
-        pattern = re.compile(r"\b" + re.escape(symbol_name) + r"\b", re.IGNORECASE)
-        node_index = {n.id: n for n in all_nodes}
-
-        callers = []
-        for edge in all_edges:
-            if edge.relation != RelationType.CALLS:
-                continue
-            context = edge.metadata.context or ""
-            if not pattern.search(context):
-                continue
-            if argument_filter and argument_filter.lower() not in context.lower():
-                continue
-            source_node = node_index.get(edge.source)
-            if source_node is None:
-                continue
-            if file_filter and file_filter.lower() not in source_node.loc.file.lower():
-                continue
-            callers.append((source_node, context))
+        callers = symbol_cache[0].usages(symbol_name, argument_filter, file_filter)
 
         if not callers:
             return (
@@ -308,23 +356,11 @@ def create_mcp_server(
             name: Exact symbol name to look up (case-insensitive).
             node_type: Optional type filter ('class', 'function', 'method', 'endpoint').
         """
-        name_lower = name.lower()
-        matches = [
-            n for n in all_nodes
-            if n.type != NodeType.COMMENT
-            and n.name.lower() == name_lower
-            and (not node_type or n.type.value == node_type)
-        ]
+        matches = symbol_cache[0].named(name.casefold(), node_type=node_type)
 
         if not matches:
             # Fall back to word-boundary partial match
-            pattern = re.compile(r"\b" + re.escape(name) + r"\b", re.IGNORECASE)
-            matches = [
-                n for n in all_nodes
-                if n.type != NodeType.COMMENT
-                and pattern.search(n.name)
-                and (not node_type or n.type.value == node_type)
-            ]
+            matches = symbol_cache[0].word_matches(name, node_type, limit=20)
             if not matches:
                 return (
                     f"Symbol '{name}' not found. "
@@ -336,19 +372,7 @@ def create_mcp_server(
 
         lines = [prefix] if prefix else []
         for n in matches[:20]:
-            line = f"{n.type.value}: {n.name}"
-            line += f"\n  file: {n.loc.file}:{n.loc.lines[0]}-{n.loc.lines[1]}"
-            line += f"\n  language: {n.language}"
-            if n.meta.visibility:
-                line += f"\n  visibility: {n.meta.visibility}"
-            if n.meta.parameters:
-                line += f"\n  params: {', '.join(n.meta.parameters)}"
-            if n.meta.return_type:
-                line += f"\n  returns: {n.meta.return_type}"
-            if n.meta.is_async:
-                line += "\n  async: true"
-            if n.summary:
-                line += f"\n  summary: {n.summary}"
+            line = symbol_cache[0].render("definition", n, _definition)
             if redis_meta:
                 line += redis_meta.format_meta(n.id)
             lines.append(line)
@@ -370,21 +394,17 @@ def create_mcp_server(
         Args:
             name: Exact symbol name to explain (case-insensitive).
         """
-        name_lower = name.lower()
-        node_index = {n.id: n for n in all_nodes}
-        name_index: dict[str, list[Node]] = {}
-        for n in all_nodes:
-            if n.type != NodeType.COMMENT:
-                name_index.setdefault(n.name.lower(), []).append(n)
+        name_lower = name.casefold()
+        index = symbol_cache[0]
+        node_index = index.by_id
+        name_index = index.by_name
 
         matches = name_index.get(name_lower, [])
         if not matches:
-            pattern = re.compile(r"\b" + re.escape(name) + r"\b", re.IGNORECASE)
-            matches = [n for n in all_nodes if n.type != NodeType.COMMENT and pattern.search(n.name)]
+            matches = index.word_matches(name, limit=5)
             if not matches:
                 return f"Symbol '{name}' not found."
 
-        call_edges = [e for e in all_edges if e.relation == RelationType.CALLS]
         sections: list[str] = []
 
         for sym in matches[:5]:
@@ -409,16 +429,14 @@ def create_mcp_server(
             # Direct callers (depth=1)
             # Use bare name (last segment after :: or \) since call expressions
             # contain only the method name, not the fully-qualified node name
-            bare_name = re.split(r"::|\\", sym.name)[-1]
-            caller_pattern = re.compile(r"\b" + re.escape(bare_name) + r"\b", re.IGNORECASE)
+            bare_name = strip_qualifier(sym.name, split_dots=False)
             callers = []
-            for edge in call_edges:
-                ctx = edge.metadata.context or ""
-                if caller_pattern.search(ctx):
-                    caller_node = node_index.get(edge.source)
-                    if caller_node:
-                        callers.append(caller_node)
-            callers = callers[:10]
+            for source, _, _ in symbol_cache[0].calls_naming(bare_name):
+                caller_node = node_index.get(source)
+                if caller_node:
+                    callers.append(caller_node)
+                    if len(callers) == 10:
+                        break
             if callers:
                 lines.append(f"\nCallers ({len(callers)} shown):")
                 for c in callers:
@@ -428,15 +446,12 @@ def create_mcp_server(
 
             # Direct callees (depth=1)
             callees = []
-            for edge in call_edges:
-                if edge.source == sym.id:
-                    ctx = edge.metadata.context or ""
-                    m = re.findall(r'\b(\w+)\s*\(', ctx)
-                    callee_name_raw = m[-1] if m else re.split(r"[:\.\s]", ctx)[-1].strip()
-                    for n in name_index.get(callee_name_raw.lower(), []):
-                        callees.append((n, ctx))
-                        break
-            callees = callees[:10]
+            for _, ctx, callee in symbol_cache[0].calls_from((sym.id,)):
+                for n in name_index.get(callee, []):
+                    callees.append((n, ctx))
+                    break
+                if len(callees) == 10:
+                    break
             if callees:
                 lines.append(f"\nCallees ({len(callees)} shown):")
                 for c, ctx in callees:
@@ -446,12 +461,10 @@ def create_mcp_server(
 
             # Siblings in same file
             type_priority = {NodeType.CLASS: 0, NodeType.METHOD: 1, NodeType.FUNCTION: 2}
-            siblings = [
-                n for n in all_nodes
-                if n.loc.file == sym.loc.file and n.id != sym.id
-            ]
-            siblings.sort(key=lambda n: (type_priority.get(n.type, 3), n.loc.lines[0]))
-            siblings = siblings[:10]
+            siblings = [n for n in index.by_file.get(sym.loc.file, []) if n.id != sym.id]
+            siblings = heapq.nsmallest(
+                10, siblings, key=lambda n: (type_priority.get(n.type, 3), n.loc.lines[0])
+            )
             if siblings:
                 lines.append(f"\nSiblings in {sym.loc.file} ({len(siblings)} shown):")
                 for s in siblings:
@@ -459,11 +472,8 @@ def create_mcp_server(
                     lines.append(f"  {s.type.value}: {s.name}{vis} (line {s.loc.lines[0]})")
 
             # Comments hint
-            bare_name = re.split(r"::|\\|\.", sym.name)[-1]
-            attached_comments = [
-                n for n in all_nodes
-                if n.type == NodeType.COMMENT and n.meta.parent_symbol == sym.name
-            ]
+            bare_name = strip_qualifier(sym.name)
+            attached_comments = symbol_cache[0].comments_by_parent.get(sym.name, [])
             if attached_comments:
                 lines.append(f"\nComments: {len(attached_comments)} attached — call search_comments(symbol='{bare_name}') for full context")
 
@@ -514,17 +524,18 @@ def create_mcp_server(
         """
         dir_norm = directory.rstrip("/") + "/"
         by_file: dict[str, list[Node]] = {}
-        for n in all_nodes:
-            if n.type == NodeType.COMMENT:
-                continue
-            file = n.loc.file
-            if not (file.startswith(dir_norm) or file.startswith(directory)):
-                continue
-            if node_type and n.type.value != node_type:
-                continue
-            if language and n.language != language:
-                continue
-            by_file.setdefault(file, []).append(n)
+        files = symbol_cache[0].files_with_prefix(directory)
+        if dir_norm != directory:
+            files += symbol_cache[0].files_with_prefix(dir_norm)
+        for file in dict.fromkeys(files):
+            kept = [
+                n for n in symbol_cache[0].by_file[file]
+                if n.type != NodeType.COMMENT
+                and (not node_type or n.type.value == node_type)
+                and (not language or n.language == language)
+            ]
+            if kept:
+                by_file[file] = kept
 
         if not by_file:
             return f"No symbols found under '{directory}'."
@@ -607,29 +618,16 @@ def create_mcp_server(
 
         results: list[str] = []
         for name in name_list:
-            name_lower = name.lower()
-            matches = [n for n in all_nodes if n.type != NodeType.COMMENT and n.name.lower() == name_lower]
+            name_lower = name.casefold()
+            matches = symbol_cache[0].by_name.get(name_lower, [])
             if not matches:
-                pattern = re.compile(r"\b" + re.escape(name) + r"\b", re.IGNORECASE)
-                matches = [n for n in all_nodes if n.type != NodeType.COMMENT and pattern.search(n.name)]
+                matches = symbol_cache[0].word_matches(name, limit=5)
             if not matches:
                 results.append(f"Symbol '{name}' not found.")
                 continue
             lines = []
             for n in matches[:5]:
-                line = f"{n.type.value}: {n.name}"
-                line += f"\n  file: {n.loc.file}:{n.loc.lines[0]}-{n.loc.lines[1]}"
-                line += f"\n  language: {n.language}"
-                if n.meta.visibility:
-                    line += f"\n  visibility: {n.meta.visibility}"
-                if n.meta.parameters:
-                    line += f"\n  params: {', '.join(n.meta.parameters)}"
-                if n.meta.return_type:
-                    line += f"\n  returns: {n.meta.return_type}"
-                if n.meta.is_async:
-                    line += "\n  async: true"
-                if n.summary:
-                    line += f"\n  summary: {n.summary}"
+                line = symbol_cache[0].render("definition", n, _definition)
                 if redis_meta:
                     line += redis_meta.format_meta(n.id)
                 lines.append(line)
@@ -651,21 +649,18 @@ def create_mcp_server(
         Args:
             language: Optional language filter ('php' or 'javascript').
         """
-        files: dict[str, set[str]] = {}
-        for node in all_nodes:
-            if language and node.language != language:
-                continue
-            files.setdefault(node.loc.file, set()).add(node.language)
+        index = symbol_cache[0]
 
-        if not files:
-            return "No files found."
-
-        lines = []
-        for f in sorted(files.keys()):
-            langs = ", ".join(sorted(files[f]))
-            lines.append(f"{f} [{langs}]")
+        def _list() -> str:
+            if language:
+                lines = [f"{f} [{language}]" for f in index.files_by_language.get(language, [])]
+            else:
+                lines = [f"{f} [{', '.join(langs)}]" for f, langs in index.file_languages.items()]
+            if not lines:
+                return "No files found."
+            return "\n".join(lines)
 
-        return "\n".join(lines)
+        return index.cached(("list_files", language), _list)
 
     @mcp.tool(
         name="impact_analysis",
@@ -690,46 +685,37 @@ def create_mcp_server(
             direction: 'callers', 'callees', or 'both'.
         """
         depth = max(1, min(depth, 6))
-        pattern = re.compile(r"\b" + re.escape(symbol_name) + r"\b", re.IGNORECASE)
-        node_index = {n.id: n for n in all_nodes}
-        name_index: dict[str, list[Node]] = {}
-        for n in all_nodes:
-            name_index.setdefault(n.name.lower(), []).append(n)
-
-        call_edges = [e for e in all_edges if e.relation == RelationType.CALLS]
+        name_index = symbol_cache[0].by_name
 
-        def _find_callers(names: set[str], visited: set[str]) -> list[tuple[Node, str]]:
+        def _find_callers(names: set[str], visited: set[str]) -> list[tuple[str, Node, str]]:
             found = []
             # Call contexts contain only the bare method name (e.g. "sendPersonalInvite"),
             # not the fully-qualified name, so strip namespace/class prefix before matching.
-            pats = {
-                n: re.compile(r"\b" + re.escape(re.split(r"::|\\|\.", n)[-1]) + r"\b", re.IGNORECASE)
-                for n in names
-            }
-            for edge in call_edges:
-                ctx = edge.metadata.context or ""
-                for callee_name, p in pats.items():
-                    if p.search(ctx):
-                        caller = node_index.get(edge.source)
-                        if caller and caller.id not in visited:
-                            found.append((caller, callee_name))
-                            break
+            bare_names: dict[str, str] = {}
+            for n in names:
+                bare_names.setdefault(strip_qualifier(n).casefold(), n)
+            # Only calls whose context mentions one of the names are visited, and
+            # each is matched once against all of them.
+            match = names_matcher(bare_names)
+            if match is None:
+                return found
+            for caller, ctx in symbol_cache[0].callers_mentioning(bare_names):
+                hit = match(ctx)
+                if hit is not None and caller.id not in visited:
+                    found.append((caller.loc.file, caller, bare_names.get(hit, hit)))
+            found.sort(key=itemgetter(0))
             return found
 
-        def _find_callees(node_ids: set[str], visited: set[str]) -> list[tuple[Node, str]]:
+        def _find_callees(node_ids: set[str], visited: set[str]) -> list[tuple[str, Node, str]]:
             found = []
-            for edge in call_edges:
-                if edge.source not in node_ids:
+            for _, ctx, callee in symbol_cache[0].calls_from(node_ids):
+                if not callee:
                     continue
-                ctx = edge.metadata.context or ""
-                m = re.findall(r'\b(\w+)\s*\(', ctx)
-                callee_name = m[-1] if m else re.split(r"[:\.\s]", ctx)[-1].strip()
-                if not callee_name:
-                    continue
-                for n in name_index.get(callee_name.lower(), []):
+                for n in name_index.get(callee, []):
                     if n.id not in visited:
-                        found.append((n, ctx))
+                        found.append((n.loc.file, n, ctx))
                         break
+            found.sort(key=itemgetter(0))
             return found
 
         lines: list[str] = []
@@ -746,14 +732,14 @@ def create_mcp_server(
                     break
                 lines.append(f"\nHop {hop}:")
                 next_names: set[str] = set()
-                for caller, callee in sorted(results, key=lambda x: x[0].loc.file):
+                for _, caller, callee in results:
                     visited.add(caller.id)
                     lines.append(
                         f"  {'  ' * (hop - 1)}{caller.type.value}: {caller.name} "
                         f"({caller.loc.file}:{caller.loc.lines[0]}) calls {callee}"
                     )
                     if hop == 1:
-                        coms = [n for n in all_nodes if n.type == NodeType.COMMENT and n.meta.parent_symbol == caller.name]
+                        coms = symbol_cache[0].comments_by_parent.get(caller.name, [])
                         for c in coms:
                             lines.append(f"    ⚑ {c.loc.lines[0]}: {c.name}")
                     next_names.add(caller.name)
@@ -766,7 +752,7 @@ def create_mcp_server(
 
         if direction in ("callees", "both"):
             lines.append(f"\n=== Callees of '{symbol_name}' (what it depends on) ===")
-            start_nodes = name_index.get(symbol_name.lower(), [])
+            start_nodes = name_index.get(symbol_name.casefold(), [])
             if not start_nodes:
                 lines.append(f"  Definition of '{symbol_name}' not found in index.")
             else:
@@ -779,7 +765,7 @@ def create_mcp_server(
                         break
                     lines.append(f"\nHop {hop}:")
                     next_ids: set[str] = set()
-                    for callee, ctx in sorted(results_c, key=lambda x: x[0].loc.file):
+                    for _, callee, ctx in results_c:
                         visited_c.add(callee.id)
                         next_ids.add(callee.id)
                         lines.append(
@@ -839,40 +825,27 @@ def create_mcp_server(
             limit: Maximum results (capped at 200).
         """
         limit = min(limit, 200)
-        name_re = re.compile(name_pattern, re.IGNORECASE) if name_pattern else None
-        results: list[Node] = []
-
-        for node in all_nodes:
-            if node.type == NodeType.COMMENT:
-                continue
-            if node_type and node.type.value != node_type:
-                continue
-            if language and node.language != language:
-                continue
-            if visibility and (node.meta.visibility or "").lower() != visibility.lower():
-                continue
-            if async_only and not node.meta.is_async:
-                continue
-            param_count = len(node.meta.parameters)
-            if param_count < min_params:
-                continue
-            if max_params >= 0 and param_count > max_params:
-                continue
-            if return_type and return_type.lower() not in (node.meta.return_type or "").lower():
-                continue
-            if name_re and not name_re.search(node.name):
-                continue
-            if file_filter and file_filter.lower() not in node.loc.file.lower():
-                continue
-            if min_complexity > 0 and (node.meta.complexity_score or 0) < min_complexity:
-                continue
-            results.append(node)
+        name_re = name_filter(name_pattern) if name_pattern else None
+        matched = symbol_cache[0].structural_filter(
+            language,
+            node_type,
+            visibility=visibility,
+            async_only=async_only,
+            min_params=min_params,
+            max_params=max_params,
+            return_type=return_type,
+            name_re=name_re,
+            file_filter=file_filter,
+            min_complexity=min_complexity,
+        )
+        lowered = symbol_cache[0].lowered
+        results = [lowered[i][0] for i in matched[:limit]]
 
-        if not results:
+        if not matched:
             return "No symbols matched the given filters."
 
-        lines = [f"{len(results)} symbol(s) matched:\n"]
-        for n in results[:limit]:
+        lines = [f"{len(matched)} symbol(s) matched:\n"]
+        for n in results:
             parts = [f"{n.type.value}: {n.name} ({n.loc.file}:{n.loc.lines[0]})"]
             attrs: list[str] = []
             if n.meta.visibility:
@@ -891,8 +864,8 @@ def create_mcp_server(
                 parts.append(f"  {n.summary}")
             lines.append("\n".join(parts))
 
-        if len(results) > limit:
-            lines.append(f"\n... and {len(results) - limit} more. Narrow with additional filters.")
+        if len(matched) > limit:
+            lines.append(f"\n... and {len(matched) - limit} more. Narrow with additional filters.")
 
         return "\n\n".join(lines)
 
@@ -906,19 +879,17 @@ def create_mcp_server(
     )
     def find_bridges() -> str:
         """Find cross-language bridges."""
-        bridges = resolve_bridges(all_nodes, all_edges)
-
-        if not bridges:
-            return "No cross-language bridges found."
-
-        lines = []
-        for bridge in bridges:
-            lines.append(
+        def _report() -> str:
+            bridges = _bridges()
+            if not bridges:
+                return "No cross-language bridges found."
+            return "\n".join(
                 f"BRIDGE: {bridge.metadata.context} "
                 f"(confidence: {bridge.metadata.confidence:.0%})"
+                for bridge in bridges
             )
 
-        return "\n".join(lines)
+        return symbol_cache[0].cached(("find_bridges",), _report)
 
     @mcp.tool(
         name="hotspot_score",
@@ -945,8 +916,6 @@ def create_mcp_server(
             file_filter: Optional path substring to restrict results.
             window_days: Churn lookback window in days (requires VCS).
         """
-        from hammy.tools.hotspot import compute_hotspots
-
         top_n = min(top_n, 50)
 
         # Get file-level churn from VCS if available
@@ -957,48 +926,59 @@ def create_mcp_server(
             except Exception:
                 pass
 
-        results = compute_hotspots(
-            all_nodes,
-            all_edges,
-            file_churn=file_churn,
-            node_type=node_type,
-            language=language,
-            file_filter=file_filter,
-            top_n=top_n,
-        )
+        index = symbol_cache[0]
+        # Churn is part of the key, so new commits in the window re-score.
+        churn_key = frozenset(file_churn.items()) if file_churn else None
+
+        def _report() -> str:
+            results = compute_hotspots(
+                all_nodes,
+                all_edges,
+                file_churn=file_churn,
+                node_type=node_type,
+                language=language,
+                file_filter=file_filter,
+                top_n=top_n,
+                index=index,
+            )
 
-        if not results:
-            return "No symbols found matching the given filters."
+            if not results:
+                return "No symbols found matching the given filters."
 
-        churn_note = f" (churn window: {window_days}d)" if file_churn else " (no VCS churn data — scoring by callers only)"
-        lines = [f"Top {len(results)} hotspots{churn_note}:\n"]
+            churn_note = f" (churn window: {window_days}d)" if file_churn else " (no VCS churn data — scoring by callers only)"
+            lines = [f"Top {len(results)} hotspots{churn_note}:\n"]
 
-        for rank, r in enumerate(results, 1):
-            attrs = []
-            if r["visibility"]:
-                attrs.append(r["visibility"])
-            if r["is_async"]:
-                attrs.append("async")
-            attr_str = f" [{', '.join(attrs)}]" if attrs else ""
-            lines.append(
-                f"#{rank:2d} [score={r['score']:.1f}] "
-                f"{r['type']}: {r['name']}{attr_str}\n"
-                f"     {r['file']}:{r['lines'][0]}\n"
-                f"     callers: {r['caller_count']}  |  churn: {r['churn_rate']}"
-            )
-            if r["summary"]:
-                lines.append(f"     {r['summary']}")
-            coms = [n for n in all_nodes if n.type == NodeType.COMMENT and n.meta.parent_symbol == r["name"]]
-            for c in coms:
-                lines.append(f"     ⚑ {c.loc.lines[0]}: {c.name}")
+            for rank, r in enumerate(results, 1):
+                attrs = []
+                if r["visibility"]:
+                    attrs.append(r["visibility"])
+                if r["is_async"]:
+                    attrs.append("async")
+                attr_str = f" [{', '.join(attrs)}]" if attrs else ""
+                lines.append(
+                    f"#{rank:2d} [score={r['score']:.1f}] "
+                    f"{r['type']}: {r['name']}{attr_str}\n"
+                    f"     {r['file']}:{r['lines'][0]}\n"
+                    f"     callers: {r['caller_count']}  |  churn: {r['churn_rate']}"
+                )
+                if r["summary"]:
+                    lines.append(f"     {r['summary']}")
+                coms = index.comments_by_parent.get(r["name"], [])
+                for c in coms:
+                    lines.append(f"     ⚑ {c.loc.lines[0]}: {c.name}")
+
+            out = "\n\n".join(lines)
+            if qdrant is not None:
+                out += (
+                    "\n\n💾 Save this risk map before touching anything: "
+                    "store_context(key='hotspot-risk-map', content='...')"
+                )
+            return out
 
-        out = "\n\n".join(lines)
-        if qdrant is not None:
-            out += (
-                "\n\n💾 Save this risk map before touching anything: "
-                "store_context(key='hotspot-risk-map', content='...')"
-            )
-        return out
+        return index.cached(
+            ("hotspot_score", top_n, node_type, language, file_filter, window_days, churn_key),
+            _report,
+        )
 
     @mcp.tool(
         name="search_comments",
@@ -1023,15 +1003,20 @@ def create_mcp_server(
             file_filter: Filter by file path substring.
             limit: Maximum results to return (default 50).
         """
-        comment_nodes = [n for n in all_nodes if n.type == NodeType.COMMENT]
+        rows = symbol_cache[0].select(node_type=NodeType.COMMENT.value)
 
         if pattern:
-            comment_nodes = [n for n in comment_nodes if pattern.lower() in n.name.lower()]
-        if symbol:
-            sym_re = re.compile(r"\b" + re.escape(symbol) + r"\b", re.IGNORECASE)
-            comment_nodes = [n for n in comment_nodes if sym_re.search(n.meta.parent_symbol)]
+            pattern_lower = pattern.casefold()
+            rows = [r for r in rows if pattern_lower in r[1]]
         if file_filter:
-            comment_nodes = [n for n in comment_nodes if file_filter.lower() in n.loc.file.lower()]
+            file_lower = file_filter.casefold()
+            rows = [r for r in rows if file_lower in r[3]]
+        comment_nodes = [r[0] for r in rows]
+        if symbol:
+            # Many comments share a parent, so match each distinct parent once.
+            sym_re = word_pattern(symbol)
+            parents = {p for p in symbol_cache[0].comments_by_parent if sym_re.search(p)}
+            comment_nodes = [n for n in comment_nodes if n.meta.parent_symbol in parents]
 
         comment_nodes = comment_nodes[:limit]
 
@@ -1055,38 +1040,30 @@ def create_mcp_server(
     )
     def index_status() -> str:
         """Show index stats."""
-        by_lang: dict[str, int] = {}
-        by_type: dict[str, int] = {}
-        files: set[str] = set()
-
-        for node in all_nodes:
-            by_lang[node.language] = by_lang.get(node.language, 0) + 1
-            by_type[node.type.value] = by_type.get(node.type.value, 0) + 1
-            files.add(node.loc.file)
-
+        index = symbol_cache[0]
         lines = [
             f"Project: {config.project.name}",
             f"Root: {config.project.root}",
-            f"Total files: {len(files)}",
+            f"Total files: {len(index.by_file)}",
             f"Total symbols: {len(all_nodes)}",
             f"Total edges: {len(all_edges)}",
             "",
             "By language:",
         ]
-        for lang, count in sorted(by_lang.items()):
-            lines.append(f"  {lang}: {count} symbols")
+        for lang in sorted(index.by_language):
+            lines.append(f"  {lang}: {len(index.by_language[lang])} symbols")
 
         lines.append("\nBy type:")
-        for ntype, count in sorted(by_type.items()):
-            lines.append(f"  {ntype}: {count}")
+        for ntype in sorted(index.by_type):
+            lines.append(f"  {ntype}: {len(index.by_type[ntype])}")
 
-        bridges = resolve_bridges(all_nodes, all_edges)
+        bridges = _bridges()
         if bridges:
             lines.append(f"\nCross-language bridges: {len(bridges)}")
 
         if qdrant is not None:
             try:
-                brain_entries = qdrant.list_brain_entries()
+                brain_entries = brain.list_brain_entries()
                 count = len(brain_entries)
                 if count > 0:
                     lines.append(f"\nBrain entries: {count} stored — call recall_context to load prior research.")
@@ -1136,6 +1113,7 @@ def create_mcp_server(
         all_edges.clear()
         all_edges.extend(new_edges)
         bm25_cache[0] = build_bm25_index(all_nodes)
+        symbol_cache[0] = build_symbol_index(all_nodes, all_edges)
         save_index(project_root, all_nodes, all_edges)
 
         lines = [
@@ -1282,8 +1260,6 @@ def create_mcp_server(
                           Use this to analyse uncommitted changes automatically.
             depth: Caller traversal depth for impact analysis (default 2).
         """
-        from hammy.tools.diff_analysis import analyze_diff
-
         raw_diff = diff_text.strip()
 
         # If no diff_text, try to fetch from VCS
@@ -1313,7 +1289,7 @@ def create_mcp_server(
         if not raw_diff:
             return "Diff is empty — no changes to analyse."
 
-        report = analyze_diff(raw_diff, all_nodes, all_edges, depth=depth)
+        report = analyze_diff(raw_diff, all_nodes, all_edges, depth=depth, index=symbol_cache[0])
 
         if not report.changed_files:
             return "Could not parse any changed files from the diff."
@@ -1357,10 +1333,7 @@ def create_mcp_server(
                     )
                 if caller_count > 5:
                     lines.append(f"         … and {caller_count - 5} more callers")
-                sym_comments = [
-                    n for n in all_nodes
-                    if n.type == NodeType.COMMENT and n.meta.parent_symbol == r["symbol"]
-                ]
+                sym_comments = symbol_cache[0].comments_by_parent.get(r["symbol"], [])
                 if sym_comments:
                     lines.append(f"  Comments on {r['symbol']}:")
                     for c in sym_comments:
@@ -1453,8 +1426,6 @@ def create_mcp_server(
             language: Optional language filter.
             node_type: Optional type filter ('class', 'function', 'method').
         """
-        from hammy.tools.hybrid_search import hybrid_search
-
         limit = min(limit, 20)
         results = hybrid_search(
             query,
@@ -1482,6 +1453,7 @@ def create_mcp_server(
         return "\n".join(lines)
 
     if qdrant is not None:
+        recall_cache = RecallCache()
 
         @mcp.tool(
             name="store_context",
@@ -1511,8 +1483,6 @@ def create_mcp_server(
                 ttl_days: Days until this entry expires (0 = never expires). Use for
                           time-sensitive findings like sprint context or PR-specific notes.
             """
-            from datetime import datetime, timedelta, timezone
-
             tag_list = [t.strip() for t in tags.split(",") if t.strip()] if tags else []
             file_list = [f.strip() for f in source_files.split(",") if f.strip()] if source_files else []
 
@@ -1520,11 +1490,15 @@ def create_mcp_server(
             if ttl_days > 0:
                 expires_at = (datetime.now(timezone.utc) + timedelta(days=ttl_days)).isoformat()
 
-            qdrant.upsert_brain_entry(key, content, tags=tag_list, source_files=file_list, expires_at=expires_at)
+            brain.upsert_brain_entry(key, content, tags=tag_list, source_files=file_list, expires_at=expires_at)
+            recall_cache.clear()
 
             tag_note = f" [tags: {', '.join(tag_list)}]" if tag_list else ""
             expiry_note = f" [expires in {ttl_days}d]" if expires_at else ""
-            return f"Stored '{key}'{tag_note}{expiry_note}. Retrieve with: recall_context(key='{key}')"
+            return (
+                f"Stored '{key}'{tag_note}{expiry_note}. Retrieve with: recall_context(key='{key}')"
+                + unsaved_warning(brain)
+            )
 
         @mcp.tool(
             name="recall_context",
@@ -1552,12 +1526,16 @@ def create_mcp_server(
             if not query and not key:
                 return "Provide either a key (exact lookup) or a query (semantic search)."
 
-            results = qdrant.search_brain(query, key=key, tag=tag, limit=min(limit, 10))
+            limit = min(limit, 10)
+            results = recall_cache.get(query, key, tag, limit)
+            if results is None:
+                results = brain.search_brain(query, key=key, tag=tag, limit=limit)
+                recall_cache.put(query, key, tag, limit, results)
 
             if not results:
                 if key:
-                    return f"No brain entry found for key '{key}'."
-                return f"No brain entries found matching '{query}'."
+                    return f"No brain entry found for key '{key}'." + unsaved_warning(brain)
+                return f"No brain entries found matching '{query}'." + unsaved_warning(brain)
 
             lines = []
             for r in results:
@@ -1574,7 +1552,7 @@ def create_mcp_server(
                 lines.append(f"  stored: {r.get('created_at', '?')[:19]}")
                 lines.append("")
 
-            return "\n".join(lines).strip()
+            return "\n".join(lines).strip() + unsaved_warning(brain)
 
         @mcp.tool(
             name="list_context",
@@ -1591,13 +1569,11 @@ def create_mcp_server(
             Args:
                 tag: Optional tag to restrict results.
             """
-            from datetime import datetime, timezone
-
-            entries = qdrant.list_brain_entries(tag=tag)
+            entries = brain.list_brain_entries(tag=tag)
 
             if not entries:
                 note = f" with tag '{tag}'" if tag else ""
-                return f"No brain entries{note}. Use store_context to save findings."
+                return f"No brain entries{note}. Use store_context to save findings." + unsaved_warning(brain)
 
             now = datetime.now(timezone.utc)
             stale_threshold_days = 30
@@ -1629,13 +1605,15 @@ def create_mcp_server(
                         pass
 
                 flag_str = f"  ⚠ {', '.join(flags)}" if flags else ""
-                summary = e["content"].splitlines()[0][:80]
+                # The first line of the first 80 characters is the first line cut at 80,
+                # without splitting the whole (possibly long) entry.
+                summary = (e["content"][:80].splitlines() or [""])[0]
                 if len(e["content"]) > 80:
                     summary += "…"
                 lines.append(f"  {e['key']}{tag_note}  (updated {updated_date}){flag_str}")
                 lines.append(f"    {summary}")
 
-            return "\n".join(lines)
+            return "\n".join(lines) + unsaved_warning(brain)
 
         @mcp.tool(
             name="forget_context",
@@ -1652,10 +1630,11 @@ def create_mcp_server(
             Args:
                 key: Exact key of the entry to delete.
             """
-            existing = qdrant.search_brain(key=key)
+            existing = brain.search_brain(key=key)
             if not existing:
                 return f"No brain entry found for key '{key}'."
-            qdrant.delete_brain_entry(key)
+            brain.delete_brain_entry(key)
+            recall_cache.clear()
             return f"Deleted brain entry '{key}'."
 
         @mcp.tool(
@@ -7,9 +7,16 @@ and Edges (relationships between them).
 from __future__ import annotations
 
 import hashlib
+import sys
 from enum import Enum
+from typing import Annotated
 
-from pydantic import BaseModel, Field
+from pydantic import AfterValidator, BaseModel, Field
+
+# Node IDs are interned on validation, so an edge endpoint and the node it
+# refers to share one string object and id dict/set lookups in the tools
+# compare by identity instead of by content.
+NodeId = Annotated[str, AfterValidator(sys.intern)]
 
 
 class NodeType(str, Enum):
@@ -75,7 +82,7 @@ class NodeHistory(BaseModel):
 class Node(BaseModel):
     """A code entity in the property graph."""
 
-    id: str
+    id: NodeId
     type: NodeType
     name: str
     loc: Location
@@ -102,8 +109,8 @@ class EdgeMetadata(BaseModel):
 class Edge(BaseModel):
     """A relationship between two nodes in the property graph."""
 
-    source: str  # Node ID
-    target: str  # Node ID
+    source: NodeId
+    target: NodeId
     relation: RelationType
     metadata: EdgeMetadata = Field(default_factory=EdgeMetadata)
 
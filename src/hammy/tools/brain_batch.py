@@ -0,0 +1,162 @@
+"""Coalescing writer for brain entries.
+
+Agents often store several findings in a row, and each
+upsert_brain_entry() call embeds one text and makes its own Qdrant
+round trip. BatchingBrain queues the writes instead and flushes them with
+QdrantManager.upsert_brain_entries(): one embedding batch, one upsert.
+
+A flush happens when the queue reaches ``max_batch`` entries, ``interval``
+seconds after the first queued write, before any brain read or delete
+(so a recall always sees earlier stores), and at process exit.
+
+The tool call that stored an entry has already returned by the time it
+is written, so a failed flush keeps its entries queued and schedules a
+retry, backing off from ``interval`` (at least a second) up to a minute
+between attempts.
+Until a write succeeds their keys are reported by unsaved_keys(), and
+unsaved_warning() turns that into a note for the brain tools' output.
+
+Usage:
+    brain = BatchingBrain(qdrant, max_batch=16, interval=0.1)
+    brain.upsert_brain_entry("payment-flow", "Stripe handles billing.")
+    brain.search_brain(key="payment-flow")   # flushes first
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import threading
+import weakref
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Shortest and longest wait between retries of a failed flush, in seconds
+_MIN_RETRY_DELAY = 1.0
+_MAX_RETRY_DELAY = 60.0
+
+# Flushed together at exit; weak, so the exit hook keeps no instance alive
+_instances: weakref.WeakSet[BatchingBrain] = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_all() -> None:
+    for brain in list(_instances):
+        brain.flush()
+
+
+class BatchingBrain:
+    """Wraps a QdrantManager's brain methods, batching upserts."""
+
+    def __init__(self, qdrant: Any, max_batch: int = 16, interval: float = 0.1) -> None:
+        self._qdrant = qdrant
+        self.max_batch = max_batch
+        self.interval = interval
+        self._queue: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+        # Held for a whole flush so that flushes apply in queue order and
+        # a read that flushes waits for any flush already in progress.
+        self._flush_lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+        # Keys of queued entries whose last write failed
+        self._unsaved: set[str] = set()
+        self._retry_delay = max(interval, _MIN_RETRY_DELAY)
+        _instances.add(self)
+
+    def upsert_brain_entry(
+        self,
+        key: str,
+        content: str,
+        tags: list[str] | None = None,
+        source_files: list[str] | None = None,
+        expires_at: str | None = None,
+    ) -> None:
+        """Queue a brain entry; it is written on the next flush."""
+        entry = {
+            "key": key,
+            "content": content,
+            "tags": tags,
+            "source_files": source_files,
+            "expires_at": expires_at,
+        }
+        with self._lock:
+            self._queue.append(entry)
+            full = len(self._queue) >= self.max_batch
+            if not full and self._timer is None:
+                self._timer = threading.Timer(self.interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write all queued entries now. Returns the number of points upserted."""
+        with self._flush_lock:
+            with self._lock:
+                entries, self._queue = self._queue, []
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+            if not entries:
+                return 0
+            try:
+                written = self._qdrant.upsert_brain_entries(entries)
+            except Exception as exc:
+                logger.warning(
+                    "Failed to store %d brain entries, will retry: %s", len(entries), exc
+                )
+                with self._lock:
+                    # Ahead of anything queued since, so newer writes still win
+                    self._queue[:0] = entries
+                    self._unsaved.update(e["key"] for e in entries)
+                    if self._timer is not None:
+                        self._timer.cancel()
+                    self._timer = threading.Timer(self._retry_delay, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+                    self._retry_delay = min(self._retry_delay * 2, _MAX_RETRY_DELAY)
+                return 0
+            with self._lock:
+                self._unsaved.clear()
+                self._retry_delay = max(self.interval, _MIN_RETRY_DELAY)
+            return written
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._queue)
+
+    def unsaved_keys(self) -> list[str]:
+        """Keys of queued entries whose last write failed, sorted."""
+        with self._lock:
+            return sorted(self._unsaved)
+
+    def search_brain(self, query: str = "", **kwargs: Any) -> list[dict[str, Any]]:
+        self.flush()
+        return self._qdrant.search_brain(query, **kwargs)
+
+    def list_brain_entries(self, tag: str = "") -> list[dict[str, Any]]:
+        self.flush()
+        return self._qdrant.list_brain_entries(tag=tag)
+
+    def delete_brain_entry(self, key: str) -> None:
+        self.flush()
+        with self._lock:
+            # A write still queued after a failed flush would bring it back
+            self._queue = [e for e in self._queue if e["key"] != key]
+            self._unsaved.discard(key)
+        self._qdrant.delete_brain_entry(key)
+
+
+def unsaved_warning(brain: Any) -> str:
+    """A note naming stored entries not yet written, or "" if there are none.
+
+    ``brain`` may be a plain QdrantManager, which writes immediately.
+    """
+    keys = brain.unsaved_keys() if isinstance(brain, BatchingBrain) else []
+    if not keys:
+        return ""
+    return (
+        f"\n\nWarning: not yet saved, the last write failed and will be retried: "
+        f"{', '.join(keys)}"
+    )
@@ -16,7 +16,8 @@ import re
 from dataclasses import dataclass, field
 from typing import Any
 
-from hammy.schema.models import Edge, Node, RelationType
+from hammy.schema.models import Edge, Node
+from hammy.tools.symbol_index import SymbolIndex, build_symbol_index, names_matcher
 
 # Regex patterns that match function/method/class definition lines in diffs.
 # Each pattern captures the symbol name in group 1.
@@ -46,6 +47,10 @@ _FILE_PATH_OLD = re.compile(r"^--- a/(.+)")
 _NEW_FILE = re.compile(r"^\+\+\+ /dev/null")
 _DEL_FILE = re.compile(r"^--- /dev/null")
 
+# Splitting a hunk context hint into candidate symbol names
+_CONTEXT_SPLIT = re.compile(r"[:\s]")
+_IDENTIFIER = re.compile(r"[A-Za-z_]\w+")
+
 
 @dataclass
 class ChangedFile:
@@ -114,9 +119,9 @@ def _extract_symbols_from_diff(diff_text: str) -> list[ChangedFile]:
             if m and current_file is not None:
                 ctx = m.group(1).strip()
                 # The context often contains "class Foo::method" or just "methodName("
-                for part in re.split(r"[:\s]", ctx):
+                for part in _CONTEXT_SPLIT.split(ctx):
                     part = part.strip().rstrip("(")
-                    if part and re.match(r"^[A-Za-z_]\w+$", part) and part not in seen_symbols:
+                    if part and _IDENTIFIER.fullmatch(part) and part not in seen_symbols:
                         seen_symbols.add(part)
                         current_file.changed_symbols.append(part)
 
@@ -144,19 +149,18 @@ def _compute_impact_for_symbols(
     nodes: list[Node],
     edges: list[Edge],
     depth: int = 2,
+    index: SymbolIndex | None = None,
 ) -> list[dict[str, Any]]:
     """For each symbol name, find matching nodes and compute caller counts."""
-    call_edges = [e for e in edges if e.relation == RelationType.CALLS]
-    node_index = {n.id: n for n in nodes}
-    name_index: dict[str, list[Node]] = {}
-    for n in nodes:
-        name_index.setdefault(n.name.lower(), []).append(n)
+    if index is None:
+        index = build_symbol_index(nodes, edges)
+    name_index = index.by_name
 
     results: list[dict[str, Any]] = []
     seen_node_ids: set[str] = set()
 
     for sym_name in symbol_names:
-        matching_nodes = name_index.get(sym_name.lower(), [])
+        matching_nodes = name_index.get(sym_name.casefold(), [])
         if not matching_nodes:
             # Symbol not in index — may be new/deleted
             results.append({
@@ -175,32 +179,27 @@ def _compute_impact_for_symbols(
             seen_node_ids.add(node.id)
 
             # BFS to find callers up to `depth` hops
-            pattern = re.compile(r"\b" + re.escape(node.name) + r"\b", re.IGNORECASE)
             direct_callers: list[dict[str, Any]] = []
             visited: set[str] = {node.id}
             current_names = {node.name}
 
             for _hop in range(1, depth + 1):
-                hop_pats = {
-                    n: re.compile(r"\b" + re.escape(n) + r"\b", re.IGNORECASE)
-                    for n in current_names
-                }
+                match = names_matcher(current_names)
+                if match is None:
+                    break
                 next_names: set[str] = set()
-                for edge in call_edges:
-                    ctx = edge.metadata.context or ""
-                    for name, p in hop_pats.items():
-                        if p.search(ctx):
-                            caller = node_index.get(edge.source)
-                            if caller and caller.id not in visited:
-                                visited.add(caller.id)
-                                direct_callers.append({
-                                    "name": caller.name,
-                                    "type": caller.type.value,
-                                    "file": caller.loc.file,
-                                    "line": caller.loc.lines[0],
-                                })
-                                next_names.add(caller.name)
-                            break
+                for caller, ctx in index.callers_mentioning(current_names):
+                    if match(ctx) is None:
+                        continue
+                    if caller.id not in visited:
+                        visited.add(caller.id)
+                        direct_callers.append({
+                            "name": caller.name,
+                            "type": caller.type.value,
+                            "file": caller.loc.file,
+                            "line": caller.loc.lines[0],
+                        })
+                        next_names.add(caller.name)
                 current_names = next_names
                 if not current_names:
                     break
@@ -228,6 +227,7 @@ def analyze_diff(
     edges: list[Edge],
     *,
     depth: int = 2,
+    index: SymbolIndex | None = None,
 ) -> DiffReport:
     """Analyse a unified diff and return a structured impact report.
 
@@ -236,6 +236,7 @@ def analyze_diff(
         nodes: Indexed nodes to look up symbols against.
         edges: Indexed edges for call graph traversal.
         depth: Caller traversal depth (hops).
+        index: Prebuilt SymbolIndex for ``nodes``/``edges``; built on the fly if omitted.
 
     Returns:
         DiffReport with changed files, symbols, and blast radius.
@@ -251,7 +252,7 @@ def analyze_diff(
                 seen.add(sym)
                 all_symbols.append(sym)
 
-    impact = _compute_impact_for_symbols(all_symbols, nodes, edges, depth=depth)
+    impact = _compute_impact_for_symbols(all_symbols, nodes, edges, depth=depth, index=index)
 
     return DiffReport(
         changed_files=changed_files,
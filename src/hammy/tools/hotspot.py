@@ -14,35 +14,39 @@ alone, which still surfaces highly-depended-upon symbols.
 
 from __future__ import annotations
 
+import heapq
 import math
 from typing import Any
 
 from hammy.schema.models import Edge, Node, RelationType
+from hammy.tools.symbol_index import SymbolIndex, callee_name
 
 
-def _caller_counts(nodes: list[Node], edges: list[Edge]) -> dict[str, int]:
+def _caller_counts(
+    nodes: list[Node], edges: list[Edge], index: SymbolIndex | None = None
+) -> dict[str, int]:
     """Return a dict of node_id -> unique caller count from CALLS edges.
 
     Uses word-boundary name matching (same as find_usages) to attribute each
-    call edge to the matching node(s).
+    call edge to the matching node(s). With a prebuilt index the callee of
+    every call is already extracted, so no context is parsed here.
     """
-    import re
+    if index is not None:
+        callee_sources = index.callee_sources
+        return {n.id: len(callee_sources.get(n.name.casefold(), ())) for n in nodes}
 
     call_edges = [e for e in edges if e.relation == RelationType.CALLS]
 
-    # Map lowercase name -> list of node_ids (may have duplicates across files)
+    # Map casefolded name -> list of node_ids (may have duplicates across files)
     name_to_ids: dict[str, list[str]] = {}
     for node in nodes:
-        name_to_ids.setdefault(node.name.lower(), []).append(node.id)
+        name_to_ids.setdefault(node.name.casefold(), []).append(node.id)
 
     # callee_name_lower -> set of caller_ids
     callee_callers: dict[str, set[str]] = {}
 
     for edge in call_edges:
-        ctx = edge.metadata.context or ""
-        # Extract the bare callee name from the context (last segment after . or ::)
-        m = re.findall(r'\b(\w+)\s*\(', ctx)
-        bare = (m[-1] if m else re.split(r"[:\.\s]", ctx)[-1].strip()).lower()
+        bare = callee_name(edge.metadata.context or "")
         if not bare:
             continue
         callee_callers.setdefault(bare, set()).add(edge.source)
@@ -66,6 +70,7 @@ def compute_hotspots(
     language: str = "",
     file_filter: str = "",
     top_n: int = 20,
+    index: SymbolIndex | None = None,
 ) -> list[dict[str, Any]]:
     """Compute hotspot scores for all symbols and return top_n results.
 
@@ -79,25 +84,35 @@ def compute_hotspots(
         language: Optional filter by language.
         file_filter: Optional path substring filter.
         top_n: Maximum results to return.
+        index: Optional prebuilt SymbolIndex over ``nodes``; its type/language
+            posting lists and casefolded paths are used to pick candidates.
 
     Returns:
         List of dicts sorted by score descending, each containing:
         node_id, name, type, file, lines, language, caller_count, churn_rate, score.
     """
     # Apply filters
-    candidates = [
-        n for n in nodes
-        if (not node_type or n.type.value == node_type)
-        and (not language or n.language == language)
-        and (not file_filter or file_filter.lower() in n.loc.file.lower())
-    ]
+    if index is not None:
+        file_lower = file_filter.casefold()
+        candidates = [
+            node for node, _, _, loc_file_lower in index.select(language, node_type)
+            if not file_lower or file_lower in loc_file_lower
+        ]
+    else:
+        file_lower = file_filter.lower()
+        candidates = [
+            n for n in nodes
+            if (not node_type or n.type.value == node_type)
+            and (not language or n.language == language)
+            and (not file_lower or file_lower in n.loc.file.lower())
+        ]
 
     if not candidates:
         return []
 
-    counts = _caller_counts(candidates, edges)
+    counts = _caller_counts(candidates, edges, index)
 
-    results: list[dict[str, Any]] = []
+    scored: list[tuple[float, int, int, Node]] = []
     for node in candidates:
         caller_count = counts.get(node.id, 0)
 
@@ -111,8 +126,13 @@ def compute_hotspots(
 
         # Log-scale composite score
         score = math.log2(1 + caller_count) * math.log2(1 + max(churn_rate, 1))
+        scored.append((score, caller_count, churn_rate, node))
 
-        results.append({
+    # Select the top_n before building result dicts; nsmallest keeps ties
+    # in candidate order, like a stable sort.
+    top = heapq.nsmallest(top_n, scored, key=lambda r: (-r[0], -r[1]))
+    return [
+        {
             "node_id": node.id,
             "name": node.name,
             "type": node.type.value,
@@ -125,7 +145,6 @@ def compute_hotspots(
             "visibility": node.meta.visibility,
             "is_async": node.meta.is_async,
             "summary": node.summary,
-        })
-
-    results.sort(key=lambda r: (-r["score"], -r["caller_count"]))
-    return results[:top_n]
+        }
+        for score, caller_count, churn_rate, node in top
+    ]
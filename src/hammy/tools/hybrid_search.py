@@ -4,11 +4,14 @@ BM25 runs in-memory on the indexed node list. When Qdrant is available,
 dense embeddings are fetched and merged with BM25 via RRF.
 
 For large codebases, build a BM25Index once at startup with build_bm25_index()
-and pass it to hybrid_search() to avoid re-tokenizing on every query.
+and pass it to hybrid_search() to avoid re-tokenizing on every query. The
+index also keeps the BM25Plus scorer built for each language/type filter,
+so repeated queries only pay for scoring.
 """
 
 from __future__ import annotations
 
+import heapq
 import re
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any
@@ -52,14 +55,40 @@ class BM25Index:
     tokenized: list[list[str]] = field(default_factory=list)
     languages: list[str] = field(default_factory=list)
     node_types: list[str] = field(default_factory=list)
+    # (language, node_type) filter -> (positions, BM25Plus over those positions)
+    scorers: dict[tuple[str, str], tuple[list[int], Any]] = field(
+        default_factory=dict, repr=False
+    )
+
+    def scorer(self, language: str | None, node_type: str | None) -> tuple[list[int], Any]:
+        """Return the positions matching a filter and a BM25Plus over them.
+
+        IDF depends on the filtered corpus, so each filter gets its own
+        scorer. It is built on first use and reused afterwards. Returns
+        ``([], None)`` when nothing matches.
+        """
+        key = (language or "", node_type or "")
+        cached = self.scorers.get(key)
+        if cached is not None:
+            return cached
+        from rank_bm25 import BM25Plus
+
+        indices = [
+            i for i, (lang, ntype) in enumerate(zip(self.languages, self.node_types))
+            if (not language or lang == language)
+            and (not node_type or ntype == node_type)
+        ]
+        bm25 = BM25Plus([self.tokenized[i] for i in indices]) if indices else None
+        self.scorers[key] = (indices, bm25)
+        return indices, bm25
 
 
 def build_bm25_index(nodes: list[Node]) -> BM25Index:
     """Build a BM25Index from the current node list.
 
     Tokenizes every node's text representation once and stores the result.
-    Subsequent queries skip tokenization entirely, only constructing BM25Plus
-    from the (already-tokenized) filtered subset — fast even on 50k+ symbols.
+    Subsequent queries skip tokenization entirely; the BM25Plus scorer for
+    each filter is constructed on its first query and then reused.
     """
     idx = BM25Index()
     for n in nodes:
@@ -117,8 +146,8 @@ def hybrid_search(
     """Hybrid BM25 + semantic search with Reciprocal Rank Fusion.
 
     BM25 is always computed on ``nodes``. When ``bm25_index`` is provided,
-    pre-tokenized data is used so only BM25Plus construction runs per query
-    (tokenization is skipped). When Qdrant is provided, dense semantic results
+    its pre-tokenized corpus and cached per-filter scorers are used, so a
+    query only scores (no tokenizing or IDF rebuild). When Qdrant is provided, dense semantic results
     are merged via RRF.
 
     Args:
@@ -141,22 +170,17 @@ def hybrid_search(
     bm25_list: list[tuple[str, dict[str, Any]]] = []
 
     if bm25_index is not None:
-        # Fast path: use pre-tokenized index, just filter and construct BM25Plus
-        indices = [
-            i for i, (lang, ntype) in enumerate(zip(bm25_index.languages, bm25_index.node_types))
-            if (not language or lang == language)
-            and (not node_type or ntype == node_type)
-        ]
+        # Fast path: reuse the pre-tokenized index and its scorer for this filter
+        indices, bm25 = bm25_index.scorer(language, node_type)
 
-        if indices:
-            filtered_tokenized = [bm25_index.tokenized[i] for i in indices]
-            bm25 = BM25Plus(filtered_tokenized)
+        if bm25 is not None:
             scores = bm25.get_scores(_tokenize(query))
 
-            ranked = sorted(
+            ranked = heapq.nlargest(
+                fetch_k,
                 (i for i, s in enumerate(scores) if s > 0),
-                key=lambda i: -scores[i],
-            )[:fetch_k]
+                key=scores.__getitem__,
+            )
 
             for rank_i in ranked:
                 orig_i = indices[rank_i]
@@ -180,10 +204,11 @@ def hybrid_search(
             bm25 = BM25Plus(tokenized)
             scores = bm25.get_scores(_tokenize(query))
 
-            ranked_indices = sorted(
+            ranked_indices = heapq.nlargest(
+                fetch_k,
                 (i for i, s in enumerate(scores) if s > 0),
-                key=lambda i: -scores[i],
-            )[:fetch_k]
+                key=scores.__getitem__,
+            )
 
             for i in ranked_indices:
                 n = candidates[i]
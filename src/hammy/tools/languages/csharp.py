@@ -14,6 +14,8 @@ from hammy.schema.models import (
     RelationType,
 )
 from hammy.tools.languages.helpers import (
+    call_edge,
+    descendants_of_type,
     extract_comments,
     find_child,
     node_lines,
@@ -23,6 +25,8 @@ from hammy.tools.languages.helpers import (
 
 # ASP.NET HTTP verb attributes → endpoint detection
 _HTTP_VERBS = {"HttpGet", "HttpPost", "HttpPut", "HttpDelete", "HttpPatch", "HttpHead", "HttpOptions"}
+# Nodes _extract_calls visits
+_CALL_TYPES = frozenset({"invocation_expression"})
 
 
 def extract(tree: tree_sitter.Tree, file_path: str) -> tuple[list[Node], list[Edge]]:
@@ -260,13 +264,13 @@ def _extract_constructor(
 
 
 def _extract_calls(
-    node: tree_sitter.Node,
+    root: tree_sitter.Node,
     file_path: str,
     source_id: str,
     edges: list[Edge],
 ) -> None:
-    """Recursively find invocation_expression nodes and emit CALLS edges."""
-    if node.type == "invocation_expression":
+    """Find invocation_expression nodes under root and emit CALLS edges."""
+    for node in descendants_of_type(root, _CALL_TYPES):
         # Children: callee_expression, argument_list
         callee = node.children[0] if node.children else None
         if callee:
@@ -274,15 +278,7 @@ def _extract_calls(
             callee_name = resolve_callee_name(callee_text)
             if callee_name:
                 full_expr = node.text.decode("utf-8") if node.text else callee_name
-                edges.append(Edge(
-                    source=source_id,
-                    target=Node.make_id("", callee_name),
-                    relation=RelationType.CALLS,
-                    metadata=EdgeMetadata(confidence=0.8, context=full_expr[:200]),
-                ))
-
-    for child in node.children:
-        _extract_calls(child, file_path, source_id, edges)
+                edges.append(call_edge(source_id, callee_name, full_expr[:200]))
 
 
 # --- Helpers ---
@@ -14,6 +14,8 @@ from hammy.schema.models import (
     RelationType,
 )
 from hammy.tools.languages.helpers import (
+    call_edge,
+    descendants_of_type,
     extract_comments,
     extract_parameters,
     find_child,
@@ -23,6 +25,9 @@ from hammy.tools.languages.helpers import (
     resolve_callee_name,
 )
 
+# Nodes _extract_http_calls visits
+_CALL_TYPES = frozenset({"call_expression"})
+
 
 def extract(tree: tree_sitter.Tree, file_path: str) -> tuple[list[Node], list[Edge]]:
     """Extract all symbols from a Go file."""
@@ -234,14 +239,14 @@ def _extract_type_declaration(
 
 
 def _extract_http_calls(
-    node: tree_sitter.Node,
+    root: tree_sitter.Node,
     file_path: str,
     source_id: str,
     nodes: list[Node],
     edges: list[Edge],
 ) -> None:
-    """Recursively find function calls, creating CALLS edges and HTTP endpoint nodes."""
-    if node.type == "call_expression":
+    """Find function calls under root, creating CALLS edges and HTTP endpoint nodes."""
+    for node in descendants_of_type(root, _CALL_TYPES):
         callee = node.children[0] if node.children else None
         if callee:
             callee_text = callee.text.decode("utf-8") if callee.text else ""
@@ -250,12 +255,7 @@ def _extract_http_calls(
             if callee_name:
                 full_expr = node.text.decode("utf-8") if node.text else callee_name
                 context_text = full_expr[:200]
-                edges.append(Edge(
-                    source=source_id,
-                    target=Node.make_id("", callee_name),
-                    relation=RelationType.CALLS,
-                    metadata=EdgeMetadata(confidence=0.8, context=context_text),
-                ))
+                edges.append(call_edge(source_id, callee_name, context_text))
 
             if callee_text.startswith("http.") and callee_text in (
                 "http.Get", "http.Post", "http.Head",
@@ -286,9 +286,6 @@ def _extract_http_calls(
                                 ))
                             break
 
-    for child in node.children:
-        _extract_http_calls(child, file_path, source_id, nodes, edges)
-
 
 def _get_return_type(node: tree_sitter.Node) -> str | None:
     """Extract return type from a Go function/method."""
@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
+
 import tree_sitter
 
-from hammy.schema.models import Location, Node, NodeMeta, NodeType
+from hammy.schema.models import Edge, Node, NodeType, RelationType
 
 
 def find_child(node: tree_sitter.Node, child_type: str) -> tree_sitter.Node | None:
@@ -122,19 +124,38 @@ CALL_NOISE = frozenset({
 })
 
 
+def descendants_of_type(
+    root: tree_sitter.Node,
+    types: frozenset[str],
+) -> list[tree_sitter.Node]:
+    """Collect root and every node below it whose type is in ``types``, in document order.
+
+    Walks with a TreeCursor, which steps through the tree without building
+    a ``children`` list at every node the way recursion over it does.
+    """
+    results: list[tree_sitter.Node] = []
+    cursor = root.walk()
+    while True:
+        node = cursor.node
+        if node.type in types:
+            results.append(node)
+        if cursor.goto_first_child() or cursor.goto_next_sibling():
+            continue
+        # Climb until an ancestor has a next sibling; the cursor cannot
+        # leave the subtree it was created on.
+        while cursor.goto_parent():
+            if cursor.goto_next_sibling():
+                break
+        else:
+            return results
+
+
 def collect_comment_nodes(
     root: tree_sitter.Node,
     comment_types: frozenset[str],
 ) -> list[tree_sitter.Node]:
     """Walk the tree and collect all comment nodes of the given types."""
-    results: list[tree_sitter.Node] = []
-    stack = [root]
-    while stack:
-        node = stack.pop()
-        if node.type in comment_types:
-            results.append(node)
-        stack.extend(reversed(node.children))
-    return results
+    return descendants_of_type(root, comment_types)
 
 
 def find_enclosing_symbol(comment_line: int, symbol_nodes: list[Node]) -> Node | None:
@@ -174,18 +195,39 @@ def extract_comments(
             continue
         line = cn.start_point[0] + 1
         parent = find_enclosing_symbol(line, symbol_nodes)
-        node = Node(
-            id=Node.make_id(file_path, f"comment:{line}"),
-            type=NodeType.COMMENT,
-            name=text[:500],
-            loc=Location(file=file_path, lines=(line, cn.end_point[0] + 1)),
-            language=language,
-            meta=NodeMeta(parent_symbol=parent.name if parent else ""),
-        )
+        # One validation for the node and its nested models (see call_edge)
+        node = Node.model_validate({
+            "id": Node.make_id(file_path, f"comment:{line}"),
+            "type": NodeType.COMMENT,
+            "name": text[:500],
+            "loc": {"file": file_path, "lines": (line, cn.end_point[0] + 1)},
+            "language": language,
+            "meta": {"parent_symbol": parent.name if parent else ""},
+        })
         results.append(node)
     return results
 
 
+@lru_cache(maxsize=16384)
+def _callee_id(callee_name: str) -> str:
+    # Callee names repeat heavily across a codebase; skip re-hashing them
+    return Node.make_id("", callee_name)
+
+
+def call_edge(source_id: str, callee_name: str, context: str) -> Edge:
+    """Build the CALLS edge from ``source_id`` to an unresolved callee name.
+
+    Validated from one dict rather than nesting an EdgeMetadata instance,
+    which saves a validator call on the most numerous object indexing makes.
+    """
+    return Edge.model_validate({
+        "source": source_id,
+        "target": _callee_id(callee_name),
+        "relation": RelationType.CALLS,
+        "metadata": {"confidence": 0.8, "context": context},
+    })
+
+
 def resolve_callee_name(callee_text: str) -> str | None:
     """Resolve a callee expression to a clean function name for CALLS edges.
 
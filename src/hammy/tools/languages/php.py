@@ -14,6 +14,8 @@ from hammy.schema.models import (
     RelationType,
 )
 from hammy.tools.languages.helpers import (
+    call_edge,
+    descendants_of_type,
     extract_comments,
     extract_parameters,
     find_child,
@@ -23,6 +25,9 @@ from hammy.tools.languages.helpers import (
     resolve_callee_name,
 )
 
+# Nodes _extract_calls visits
+_CALL_TYPES = frozenset({"function_call_expression", "member_call_expression", "scoped_call_expression"})
+
 
 def extract(tree: tree_sitter.Tree, file_path: str) -> tuple[list[Node], list[Edge]]:
     """Extract all symbols from a PHP file."""
@@ -208,13 +213,13 @@ def _extract_use(
 
 
 def _extract_calls(
-    node: tree_sitter.Node,
+    root: tree_sitter.Node,
     file_path: str,
     source_id: str,
     edges: list[Edge],
 ) -> None:
-    """Recursively find function/method calls in PHP."""
-    if node.type in ("function_call_expression", "member_call_expression", "scoped_call_expression"):
+    """Find function/method calls under root in PHP."""
+    for node in descendants_of_type(root, _CALL_TYPES):
         callee_text = ""
         if node.type == "function_call_expression":
             callee = node.children[0] if node.children else None
@@ -231,15 +236,7 @@ def _extract_calls(
         if callee_name:
             full_expr = node_text(node)
             context_text = full_expr[:200] if full_expr else callee_name
-            edges.append(Edge(
-                source=source_id,
-                target=Node.make_id("", callee_name),
-                relation=RelationType.CALLS,
-                metadata=EdgeMetadata(confidence=0.8, context=context_text),
-            ))
-
-    for child in node.children:
-        _extract_calls(child, file_path, source_id, edges)
+            edges.append(call_edge(source_id, callee_name, context_text))
 
 
 def _extract_route_attribute(node: tree_sitter.Node) -> str | None:
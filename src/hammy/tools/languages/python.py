@@ -14,6 +14,8 @@ from hammy.schema.models import (
     RelationType,
 )
 from hammy.tools.languages.helpers import (
+    call_edge,
+    descendants_of_type,
     extract_comments,
     extract_parameters,
     find_child,
@@ -26,6 +28,8 @@ from hammy.tools.languages.helpers import (
 # Decorator patterns that indicate route endpoints (Flask, FastAPI, etc.)
 _ROUTE_METHODS = {"route", "get", "post", "put", "patch", "delete", "head", "options"}
 _ROUTE_OBJECTS = {"app", "router", "blueprint", "bp", "api"}
+# Nodes _extract_calls visits
+_CALL_TYPES = frozenset({"call"})
 
 
 def extract(tree: tree_sitter.Tree, file_path: str) -> tuple[list[Node], list[Edge]]:
@@ -248,13 +252,13 @@ def _extract_decorated(
 
 
 def _extract_calls(
-    node: tree_sitter.Node,
+    root: tree_sitter.Node,
     file_path: str,
     source_id: str,
     edges: list[Edge],
 ) -> None:
-    """Recursively find function/method calls in Python."""
-    if node.type == "call":
+    """Find function/method calls under root in Python."""
+    for node in descendants_of_type(root, _CALL_TYPES):
         callee = node.children[0] if node.children else None
         if callee:
             callee_text = node_text(callee)
@@ -262,15 +266,7 @@ def _extract_calls(
             if callee_name:
                 full_expr = node.text.decode("utf-8") if node.text else callee_name
                 context_text = full_expr[:200]
-                edges.append(Edge(
-                    source=source_id,
-                    target=Node.make_id("", callee_name),
-                    relation=RelationType.CALLS,
-                    metadata=EdgeMetadata(confidence=0.8, context=context_text),
-                ))
-
-    for child in node.children:
-        _extract_calls(child, file_path, source_id, edges)
+                edges.append(call_edge(source_id, callee_name, context_text))
 
 
 def _extract_route_from_decorator(node: tree_sitter.Node) -> str | None:
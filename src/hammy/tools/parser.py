@@ -2,10 +2,15 @@
 
 Creates and caches parsers for supported languages. Adding a new language
 requires installing the grammar package and adding entries to LANGUAGE_REGISTRY.
+
+A tree-sitter Parser must not be used by two threads at once, so
+parse_file() and parse_bytes() use a parser owned by the calling thread.
+The compiled Language objects are shared.
 """
 
 from __future__ import annotations
 
+import threading
 from pathlib import Path
 from typing import Callable
 
@@ -55,6 +60,10 @@ class ParserFactory:
             self._languages[lang] = language
             self._parsers[lang] = tree_sitter.Parser(language)
 
+        # The constructing thread reuses the parsers above; others get their own.
+        self._local = threading.local()
+        self._local.parsers = self._parsers
+
     @property
     def enabled_languages(self) -> list[str]:
         return list(self._parsers.keys())
@@ -81,9 +90,19 @@ class ParserFactory:
         if lang is None:
             return None
         source = filepath.read_bytes()
-        tree = self._parsers[lang].parse(source)
+        tree = self._thread_parser(lang).parse(source)
         return tree, lang
 
     def parse_bytes(self, source: bytes, language: str) -> tree_sitter.Tree:
         """Parse raw bytes with a specified language."""
-        return self._parsers[language].parse(source)
+        return self._thread_parser(language).parse(source)
+
+    def _thread_parser(self, language: str) -> tree_sitter.Parser:
+        """Return the calling thread's parser for an enabled language."""
+        parsers = getattr(self._local, "parsers", None)
+        if parsers is None:
+            parsers = self._local.parsers = {}
+        parser = parsers.get(language)
+        if parser is None:
+            parser = parsers[language] = tree_sitter.Parser(self._languages[language])
+        return parser
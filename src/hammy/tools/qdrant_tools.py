@@ -8,7 +8,8 @@ from __future__ import annotations
 
 import hashlib
 from datetime import datetime, timezone
-from typing import Any
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Iterable
 
 import numpy as np
 from qdrant_client import QdrantClient
@@ -16,15 +17,18 @@ from qdrant_client.models import (
     Distance,
     FieldCondition,
     Filter,
+    MatchAny,
     MatchValue,
     PointStruct,
     VectorParams,
 )
-from sentence_transformers import SentenceTransformer
 
 from hammy.config import QdrantConfig
 from hammy.schema.models import Node, NodeType
 
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
 # Module-level cache: model_name -> SentenceTransformer instance.
 # Loading a SentenceTransformer is expensive (~2s). Caching here means
 # multiple QdrantManager instances (e.g. in tests) share one loaded model.
@@ -32,6 +36,11 @@ _MODEL_CACHE: dict[str, SentenceTransformer] = {}
 
 
 def _get_model(model_name: str) -> SentenceTransformer:
+    # Imported here: sentence_transformers pulls in torch and transformers,
+    # several seconds of import time that commands which never embed
+    # (hammy status, a server without Qdrant) should not pay.
+    from sentence_transformers import SentenceTransformer
+
     if model_name not in _MODEL_CACHE:
         # Try loading from the local HF cache first to avoid an
         # unauthenticated network call to Hugging Face Hub on every run.
@@ -173,37 +182,37 @@ class QdrantManager:
 
     def upsert_commits(
         self,
-        commits: list[dict[str, Any]],
+        commits: Iterable[dict[str, Any]],
     ) -> int:
         """Upsert commit data into the commits collection.
 
         Each commit dict should have: revision, author, date, message, files_changed.
+        Commits are embedded and upserted BATCH_SIZE at a time, so a generator
+        keeps only one batch of dicts, vectors and points alive.
         Returns the number of points upserted.
         """
-        if not commits:
-            return 0
-
-        texts = [c["message"] for c in commits]
-        embeddings = self.embed(texts)
-
-        points = []
-        for i, (commit, embedding) in enumerate(zip(commits, embeddings)):
-            points.append(PointStruct(
-                id=i,
-                vector=embedding,
-                payload={
-                    "revision": commit["revision"],
-                    "author": commit["author"],
-                    "date": commit["date"],
-                    "message": commit["message"],
-                    "files_changed": commit.get("files_changed", []),
-                },
-            ))
-
         collection = self._collection_name(self.COMMITS_COLLECTION)
-        for i in range(0, len(points), self.BATCH_SIZE):
-            self._client.upsert(collection_name=collection, points=points[i : i + self.BATCH_SIZE])
-        return len(points)
+        commits = iter(commits)
+        count = 0
+        while batch := list(islice(commits, self.BATCH_SIZE)):
+            embeddings = self.embed([c["message"] for c in batch])
+            points = [
+                PointStruct(
+                    id=count + i,
+                    vector=embedding,
+                    payload={
+                        "revision": commit["revision"],
+                        "author": commit["author"],
+                        "date": commit["date"],
+                        "message": commit["message"],
+                        "files_changed": commit.get("files_changed", []),
+                    },
+                )
+                for i, (commit, embedding) in enumerate(zip(batch, embeddings))
+            ]
+            self._client.upsert(collection_name=collection, points=points)
+            count += len(points)
+        return count
 
     def search_code(
         self,
@@ -394,41 +403,64 @@ class QdrantManager:
             source_files: Optional file paths this entry relates to.
             expires_at: Optional ISO timestamp after which this entry is considered stale.
         """
-        tags = tags or []
-        source_files = source_files or []
+        self.upsert_brain_entries([
+            {
+                "key": key,
+                "content": content,
+                "tags": tags,
+                "source_files": source_files,
+                "expires_at": expires_at,
+            }
+        ])
+
+    def upsert_brain_entries(self, entries: list[dict[str, Any]]) -> int:
+        """Store or overwrite several brain entries with one embedding batch and one upsert.
+
+        Each entry is a dict with the upsert_brain_entry() arguments as keys
+        ("key" and "content" required). If a key appears more than once the
+        last entry wins. Returns the number of points upserted.
+        """
+        latest = {e["key"]: e for e in entries}
+        if not latest:
+            return 0
         now = datetime.now(timezone.utc).isoformat()
-
-        # Preserve created_at from the existing entry if this is an update
-        created_at = now
-        existing = self.search_brain(key=key)
-        if existing:
-            created_at = existing[0].get("created_at", now)
-
-        text_to_embed = f"{key}: {content}"
-        embedding = self.embed([text_to_embed])[0]
-
-        payload: dict[str, Any] = {
-            "key": key,
-            "content": content,
-            "tags": tags,
-            "source_files": source_files,
-            "created_at": created_at,
-            "updated_at": now,
-        }
-        if expires_at:
-            payload["expires_at"] = expires_at
-
         collection = self._collection_name(self.BRAIN_COLLECTION)
-        self._client.upsert(
+
+        # Preserve created_at from existing entries that are being updated
+        existing, _ = self._client.scroll(
             collection_name=collection,
-            points=[
-                PointStruct(
-                    id=self._brain_point_id(key),
-                    vector=embedding,
-                    payload=payload,
-                )
-            ],
+            scroll_filter=Filter(
+                must=[FieldCondition(key="key", match=MatchAny(any=list(latest)))]
+            ),
+            limit=len(latest),
+            with_payload=True,
         )
+        created = {
+            r.payload["key"]: r.payload.get("created_at", now)
+            for r in existing
+            if not self._is_expired(r.payload)
+        }
+
+        embeddings = self.embed([f"{key}: {e['content']}" for key, e in latest.items()])
+
+        points = []
+        for (key, e), embedding in zip(latest.items(), embeddings):
+            payload: dict[str, Any] = {
+                "key": key,
+                "content": e["content"],
+                "tags": e.get("tags") or [],
+                "source_files": e.get("source_files") or [],
+                "created_at": created.get(key, now),
+                "updated_at": now,
+            }
+            if e.get("expires_at"):
+                payload["expires_at"] = e["expires_at"]
+            points.append(
+                PointStruct(id=self._brain_point_id(key), vector=embedding, payload=payload)
+            )
+
+        self._client.upsert(collection_name=collection, points=points)
+        return len(points)
 
     @staticmethod
     def _is_expired(entry: dict[str, Any]) -> bool:
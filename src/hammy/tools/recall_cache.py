@@ -0,0 +1,64 @@
+"""Short-lived cache of brain recall results.
+
+Agents repeat the same recall_context queries across tool iterations,
+and each one costs an embedding plus a Qdrant round trip. RecallCache
+keeps the most recent results keyed by the normalized arguments.
+
+Tools that write to the brain must call clear(). Entries also expire
+after ``ttl`` seconds, so writes from other processes (the CLI, another
+server) show up without a restart.
+
+Usage:
+    recall_cache = RecallCache()
+    results = recall_cache.get(query, key, tag, limit)
+    if results is None:
+        results = qdrant.search_brain(query, key=key, tag=tag, limit=limit)
+        recall_cache.put(query, key, tag, limit, results)
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Any
+
+
+class RecallCache:
+    """LRU cache of search_brain() results with a time-to-live."""
+
+    def __init__(self, maxsize: int = 128, ttl: float = 300.0) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[tuple[str, str, str, int], tuple[float, list[dict[str, Any]]]] = (
+            OrderedDict()
+        )
+
+    @staticmethod
+    def _key(query: str, key: str, tag: str, limit: int) -> tuple[str, str, str, int]:
+        return query.strip().casefold(), key, tag, limit
+
+    def get(self, query: str, key: str, tag: str, limit: int) -> list[dict[str, Any]] | None:
+        """Return cached results, or None on a miss or expired entry."""
+        k = self._key(query, key, tag, limit)
+        entry = self._entries.get(k)
+        if entry is None:
+            return None
+        stored_at, results = entry
+        if time.monotonic() - stored_at > self.ttl:
+            del self._entries[k]
+            return None
+        self._entries.move_to_end(k)
+        return results
+
+    def put(self, query: str, key: str, tag: str, limit: int, results: list[dict[str, Any]]) -> None:
+        k = self._key(query, key, tag, limit)
+        self._entries[k] = (time.monotonic(), results)
+        self._entries.move_to_end(k)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,1148 @@
+"""In-memory symbol index — derived lookup data for the query tools.
+
+The Explorer agent tools and the MCP server answer every query by scanning
+the full node list. Values derived from a node (such as its case-folded
+name, summary and file path) never change between reindexes, so they are
+computed once here instead of inside every tool call, together with
+inverted indexes by id, name, type, language, and file, and the
+file-to-language listing. CALLS edges are likewise filtered once and
+flattened to (source id, context, callee name) tuples for the call-graph
+tools, indexed by source and by each identifier in the call context.
+
+Build a SymbolIndex once at startup with build_symbol_index() and rebuild it
+after a reindex, the same lifecycle as BM25Index.
+
+On free-threaded interpreters, large search() scans are split across a
+shared thread pool; with the GIL they run on the calling thread.
+
+word_pattern() and names_pattern() provide the whole-word, case-insensitive
+regexes the tools use to match symbol names against call contexts.
+names_matcher() matches a set of names in one pass, using an Aho–Corasick
+automaton for wide name sets when pyahocorasick is installed.
+
+Broad queries that occur in many names are matched with NumPy's string
+ufuncs (NumPy 2.0+) over a fixed-width array of the names, so bucketing and
+ranking cost O(limit) Python work instead of one iteration per hit.
+"""
+
+from __future__ import annotations
+
+import heapq
+import os
+import re
+import sys
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from collections import OrderedDict, defaultdict
+from functools import lru_cache
+from itertools import chain, islice
+from operator import itemgetter
+from typing import Any, Callable, Iterable, Iterator, Sequence
+
+from hammy.schema.models import Edge, Node, NodeType, RelationType
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy ships with sentence-transformers
+    np = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None  # type: ignore[assignment]
+
+# Identifier tokens in a call context — exactly the strings a whole-word
+# pattern for a plain identifier can match.
+_IDENT_RE = re.compile(r"\w+")
+
+# Callee extraction from a call context; see callee_name().
+_CALLEE_RE = re.compile(r"\b(\w+)\s*\(")
+
+# Qualifier separators for strip_qualifier(), with and without '.'.
+_NAMESPACE_SEP_RE = re.compile(r"::|\\")
+_QUALIFIER_SEP_RE = re.compile(r"::|\\|\.")
+
+# Separator for the joined name/summary text columns; queries containing it
+# fall back to the row scan.
+_COLUMN_SEP = "\0"
+
+# search() scans rows one by one instead of the joined text when the
+# language/type filters leave fewer than 1/ROW_SCAN_RATIO of all rows.
+ROW_SCAN_RATIO = 8
+
+# Queries occurring at least this many times in the name column are
+# bucketed with NumPy string ufuncs rather than one str.find per hit.
+VECTOR_MIN_HITS = 1000
+_HAS_NP_STRINGS = np is not None and hasattr(np, "strings")
+
+# structural_filter() builds its mask in NumPy once the language/type
+# selection has at least this many rows.
+VECTOR_MIN_ROWS = 2000
+
+# Formatted tool outputs kept per index by cached().
+OUTPUT_CACHE_SIZE = 64
+
+# Scans shorter than this always run on the calling thread.
+PARALLEL_MIN_ROWS = 2000
+
+_POOL: ThreadPoolExecutor | None = None
+
+# Name sets at least this large use the Aho–Corasick matcher when available;
+# smaller ones compile to a single regex alternation.
+AHOCORASICK_MIN_NAMES = 8
+
+
+@dataclass
+class SymbolIndex:
+    """Pre-built lookup data for fast repeated symbol queries.
+
+    Build once with build_symbol_index() and share between tools.
+    Invalidate by calling build_symbol_index() again after reindex.
+    """
+
+    # (node, name, summary, loc.file), the last three casefolded, in node order
+    lowered: list[tuple[Node, str, str, str]] = field(default_factory=list)
+    # node.id -> node
+    by_id: dict[str, Node] = field(default_factory=dict)
+    # name.casefold() -> symbols with that name (comments excluded)
+    by_name: dict[str, list[Node]] = field(default_factory=dict)
+    # name.casefold() -> positions of those symbols in ``lowered``
+    name_positions: dict[str, list[int]] = field(default_factory=dict)
+    # Casefolded names of the non-comment rows, and their non-empty
+    # summaries, joined with _COLUMN_SEP; with the start offset of each row
+    # and its position in ``lowered``. Lets search() match with str.find.
+    name_text: str = ""
+    name_offsets: list[int] = field(default_factory=list)
+    name_rows: list[int] = field(default_factory=list)
+    summary_text: str = ""
+    summary_offsets: list[int] = field(default_factory=list)
+    summary_rows: list[int] = field(default_factory=list)
+    # (meta.visibility, meta.return_type) of each row in ``lowered``, casefolded
+    meta_lowered: list[tuple[str, str]] = field(default_factory=list)
+    # type value / language of each row in ``lowered``, and the reverse maps
+    types: list[str] = field(default_factory=list)
+    languages: list[str] = field(default_factory=list)
+    by_type: dict[str, list[int]] = field(default_factory=dict)
+    by_language: dict[str, list[int]] = field(default_factory=dict)
+    # (type value, language) -> positions, for the combined filter
+    by_type_language: dict[tuple[str, str], list[int]] = field(default_factory=dict)
+    # parent symbol name -> comment nodes attached to it, in node order
+    comments_by_parent: dict[str, list[Node]] = field(default_factory=dict)
+    # casefolded identifier -> ``name_rows`` positions whose name contains it
+    name_tokens: dict[str, list[int]] = field(default_factory=dict)
+    # relative file path -> nodes in that file
+    by_file: dict[str, list[Node]] = field(default_factory=dict)
+    # every relative file path, sorted, for prefix queries
+    sorted_files: list[str] = field(default_factory=list)
+    # relative file path -> casefolded path
+    folded_files: dict[str, str] = field(default_factory=dict)
+    # relative file path -> sorted languages, in sorted path order
+    file_languages: dict[str, list[str]] = field(default_factory=dict)
+    # language -> sorted file paths containing it
+    files_by_language: dict[str, list[str]] = field(default_factory=dict)
+    # (edge.source, edge.metadata.context or "", callee_name(context)) per CALLS edge
+    calls: list[tuple[str, str, str]] = field(default_factory=list)
+    # indexed node for each call's source, by position in ``calls`` (None = unknown)
+    call_callers: list[Node | None] = field(default_factory=list)
+    # source node id -> positions in ``calls``
+    calls_by_source: dict[str, list[int]] = field(default_factory=dict)
+    # caller's relative file path -> positions in ``calls`` (indexed callers only)
+    calls_by_file: dict[str, list[int]] = field(default_factory=dict)
+    # casefolded callee name -> ids of the distinct nodes calling it
+    callee_sources: dict[str, set[str]] = field(default_factory=dict)
+    # casefolded identifier -> positions in ``calls`` whose context contains it
+    call_tokens: dict[str, list[int]] = field(default_factory=dict)
+    # casefolded context of each call, for substring pre-checks, built on first use
+    folded_contexts: list[str] | None = None
+    # (style, node.id) -> (node.summary when rendered, text); see render()
+    rendered: dict[tuple[str, str], tuple[str, str]] = field(default_factory=dict)
+    # (tool name, *args) -> formatted tool output; see cached()
+    outputs: OrderedDict[tuple[Any, ...], str] = field(default_factory=OrderedDict)
+    # Cross-language bridge edges, resolved lazily by the tools (None = not yet)
+    bridges: list[Edge] | None = None
+    # NumPy arrays over ``name_rows`` for broad queries, built on first use
+    name_arrays: _NameArrays | None = None
+    # NumPy arrays over ``lowered`` for structural_filter(), built on first use
+    meta_arrays: _MetaArrays | None = None
+
+    def positions(self, language: str = "", node_type: str = "") -> Sequence[int]:
+        """Return positions in ``lowered`` restricted to a language and/or node type.
+
+        Each filter combination has its own posting list, so a selective
+        filter skips the rest of the index. Positions are in node order.
+        """
+        if not language and not node_type:
+            return range(len(self.lowered))
+        if not language:
+            return self.by_type.get(node_type, [])
+        if not node_type:
+            return self.by_language.get(language, [])
+        return self.by_type_language.get((node_type, language), [])
+
+    def select(self, language: str = "", node_type: str = "") -> list[tuple[Node, str, str, str]]:
+        """Return ``lowered`` rows restricted to a language and/or node type.
+
+        See positions(); rows keep their original node order.
+        """
+        if not language and not node_type:
+            return self.lowered
+        lowered = self.lowered
+        return [lowered[i] for i in self.positions(language, node_type)]
+
+    def named(
+        self, name_lower: str, language: str = "", node_type: str = "", file_lower: str = ""
+    ) -> list[Node]:
+        """Return the symbols named ``name_lower`` (casefolded), in node order.
+
+        The filters are tested against the ``languages``/``types`` columns
+        and the casefolded paths in ``lowered`` rather than node attributes;
+        ``file_lower`` is a substring of the casefolded path.
+        """
+        lowered = self.lowered
+        positions = self.name_positions.get(name_lower, [])
+        if language:
+            languages = self.languages
+            positions = [i for i in positions if languages[i] == language]
+        if node_type:
+            types = self.types
+            positions = [i for i in positions if types[i] == node_type]
+        if file_lower:
+            positions = [i for i in positions if file_lower in lowered[i][3]]
+        return [lowered[i][0] for i in positions]
+
+    def structural_filter(
+        self,
+        language: str = "",
+        node_type: str = "",
+        *,
+        visibility: str = "",
+        async_only: bool = False,
+        min_params: int = 0,
+        max_params: int = -1,
+        return_type: str = "",
+        name_re: re.Pattern[str] | None = None,
+        file_filter: str = "",
+        min_complexity: int = 0,
+    ) -> list[int]:
+        """Return positions of non-comment symbols matching the structural_search filters.
+
+        ``visibility`` must match exactly, ``return_type`` and ``file_filter``
+        are substrings, all case-insensitive; ``name_re`` is searched in the
+        original name. Positions are in node order.
+
+        Large selections are filtered with NumPy masks over per-field
+        arrays; ``name_re`` is then applied to the survivors only.
+        """
+        visibility_lower = visibility.casefold()
+        return_type_lower = return_type.casefold()
+        file_lower = file_filter.casefold()
+        positions = self.positions(language, node_type)
+        if _HAS_NP_STRINGS and len(positions) >= VECTOR_MIN_ROWS:
+            arrays = self.meta_arrays
+            if arrays is None:
+                arrays = self.meta_arrays = _build_meta_arrays(self)
+            keep = ~arrays.types.equals(NodeType.COMMENT.value)
+            if language:
+                keep &= arrays.languages.equals(language)
+            if node_type:
+                keep &= arrays.types.equals(node_type)
+            if visibility_lower:
+                keep &= arrays.visibility.equals(visibility_lower)
+            if async_only:
+                keep &= arrays.is_async
+            if min_params > 0:
+                keep &= arrays.param_counts >= min_params
+            if max_params >= 0:
+                keep &= arrays.param_counts <= max_params
+            if min_complexity > 0:
+                keep &= arrays.complexity >= min_complexity
+            if return_type_lower:
+                keep &= _column_find(arrays.return_types, return_type_lower) >= 0
+            if file_lower:
+                keep &= _column_find(arrays.files, file_lower) >= 0
+            matched = np.flatnonzero(keep).tolist()
+            if name_re is None:
+                return matched
+            lowered = self.lowered
+            return [i for i in matched if name_re.search(lowered[i][0].name)]
+
+        matched = []
+        lowered, meta_lowered, types = self.lowered, self.meta_lowered, self.types
+        comment_type = NodeType.COMMENT.value
+        for i in positions:
+            if types[i] == comment_type:
+                continue
+            node, _, _, loc_file_lower = lowered[i]
+            node_visibility, node_return_type = meta_lowered[i]
+            if visibility_lower and node_visibility != visibility_lower:
+                continue
+            if async_only and not node.meta.is_async:
+                continue
+            param_count = len(node.meta.parameters)
+            if param_count < min_params:
+                continue
+            if max_params >= 0 and param_count > max_params:
+                continue
+            if return_type_lower and return_type_lower not in node_return_type:
+                continue
+            if name_re and not name_re.search(node.name):
+                continue
+            if file_lower and file_lower not in loc_file_lower:
+                continue
+            if min_complexity > 0 and (node.meta.complexity_score or 0) < min_complexity:
+                continue
+            matched.append(i)
+        return matched
+
+    def search(
+        self,
+        query: str,
+        language: str = "",
+        node_type: str = "",
+        file_filter: str = "",
+        limit: int = 25,
+    ) -> tuple[list[Node], int | None]:
+        """Rank symbols against ``query`` for the search_symbols tools.
+
+        Matches fall into four buckets — exact name, name prefix, name
+        substring, summary substring — and within a bucket shorter names
+        come first. Only the buckets needed to fill ``limit`` are ranked.
+
+        Exact name matches come straight from ``by_name``; when they alone
+        fill ``limit`` no scan is done, so the other buckets are never
+        counted and the total is None.
+
+        Returns:
+            (top ``limit`` nodes, total number of matches or None if uncounted)
+        """
+        query_lower = query.casefold()
+        file_lower = file_filter.casefold()
+
+        exact = [
+            (len(n.name), n) for n in self.named(query_lower, language, node_type, file_lower)
+        ]
+        if len(exact) >= limit:
+            return [n for _, n in heapq.nsmallest(limit, exact, key=itemgetter(0))], None
+
+        # Scan the joined name/summary text unless the language/type filters
+        # already narrow the rows to a small fraction of the index.
+        selected = len(self.positions(language, node_type))
+        if _COLUMN_SEP not in query_lower and selected * ROW_SCAN_RATIO >= len(self.lowered):
+            if _HAS_NP_STRINGS and self.name_text.count(query_lower) >= VECTOR_MIN_HITS:
+                return self._search_arrays(query_lower, language, node_type, file_lower, limit)
+            exact, prefix, substring, summary = self._score_text(
+                query_lower, language, node_type, file_lower
+            )
+            return _rank(exact, prefix, substring, summary, limit)
+
+        rows = self.select(language, node_type)
+        workers = _scan_workers(len(rows))
+        if workers == 1:
+            exact, prefix, substring, summary = _score_rows(rows, query_lower, file_lower)
+        else:
+            # Contiguous shards, merged in order, keep ties in node order.
+            size = -(-len(rows) // workers)
+            shards = [rows[i:i + size] for i in range(0, len(rows), size)]
+            exact, prefix, substring, summary = [], [], [], []
+            for e, p, s, m in _scan_pool().map(
+                lambda shard: _score_rows(shard, query_lower, file_lower), shards
+            ):
+                exact += e
+                prefix += p
+                substring += s
+                summary += m
+
+        return _rank(exact, prefix, substring, summary, limit)
+
+    def _search_arrays(
+        self,
+        query_lower: str,
+        language: str,
+        node_type: str,
+        file_lower: str,
+        limit: int,
+    ) -> tuple[list[Node], int]:
+        """search() for broad queries, with the name buckets computed in NumPy.
+
+        Ranks exactly like _score_text() followed by _rank(). Summary-only
+        matches come from str.find over ``summary_text``, or from a byte
+        scan in NumPy when the query is also common in the summaries.
+        """
+        arrays = self.name_arrays
+        if arrays is None:
+            arrays = self.name_arrays = _build_name_arrays(self)
+        pos = _column_find(arrays.names, query_lower)
+        keep = np.ones(len(pos), dtype=bool)
+        if language:
+            keep &= arrays.languages.equals(language)
+        if node_type:
+            keep &= arrays.types.equals(node_type)
+        if file_lower:
+            keep &= _column_find(arrays.files, file_lower) >= 0
+
+        at_start = (pos == 0) & keep
+        exact = at_start & (arrays.name_lengths == len(query_lower))
+        name_hit = pos >= 0
+        summary_columns = arrays.summary_columns
+        if self.summary_text.count(query_lower) >= VECTOR_MIN_HITS:
+            summary_hit = np.zeros(len(pos), dtype=bool)
+            summary_hit[summary_columns[_byte_hit_rows(
+                arrays.summary_bytes, arrays.summary_starts, query_lower.encode()
+            )]] = True
+            summary = np.flatnonzero(summary_hit & keep & ~name_hit)
+        else:
+            summary = np.array([
+                j for row, _ in _first_hits(self.summary_text, self.summary_offsets, query_lower)
+                if keep[j := summary_columns[row]] and not name_hit[j]
+            ], dtype=np.intp)
+
+        buckets = [
+            np.flatnonzero(exact),
+            np.flatnonzero(at_start & ~exact),
+            np.flatnonzero((pos > 0) & keep),
+            summary,
+        ]
+        results: list[Node] = []
+        lowered, name_rows = self.lowered, self.name_rows
+        for bucket in buckets:
+            if len(results) >= limit:
+                break
+            order = bucket[np.argsort(arrays.sort_keys[bucket], kind="stable")]
+            results.extend(lowered[name_rows[j]][0] for j in order[: limit - len(results)])
+        return results, sum(len(b) for b in buckets)
+
+    def _score_text(
+        self,
+        query_lower: str,
+        language: str,
+        node_type: str,
+        file_lower: str,
+    ) -> tuple[list[tuple[int, Node]], ...]:
+        """Bucket matches found by str.find over ``name_text``/``summary_text``.
+
+        The search itself runs in C over the joined columns; Python work is
+        proportional to the number of matching symbols, not the index size.
+        """
+        lowered, types, languages = self.lowered, self.types, self.languages
+        exact: list[tuple[int, Node]] = []
+        prefix: list[tuple[int, Node]] = []
+        substring: list[tuple[int, Node]] = []
+        summary: list[tuple[int, Node]] = []
+        query_len = len(query_lower)
+
+        name_hits: set[int] = set()
+        name_rows = self.name_rows
+        for row, pos in _first_hits(self.name_text, self.name_offsets, query_lower):
+            i = name_rows[row]
+            name_hits.add(i)
+            if (language and languages[i] != language) or (node_type and types[i] != node_type):
+                continue
+            node, name_lower, _, loc_file_lower = lowered[i]
+            if file_lower and file_lower not in loc_file_lower:
+                continue
+            if pos == 0:
+                bucket = exact if len(name_lower) == query_len else prefix
+            else:
+                bucket = substring
+            bucket.append((len(node.name), node))
+
+        summary_rows = self.summary_rows
+        for row, _ in _first_hits(self.summary_text, self.summary_offsets, query_lower):
+            i = summary_rows[row]
+            if i in name_hits:
+                continue
+            if (language and languages[i] != language) or (node_type and types[i] != node_type):
+                continue
+            node, _, _, loc_file_lower = lowered[i]
+            if file_lower and file_lower not in loc_file_lower:
+                continue
+            summary.append((len(node.name), node))
+
+        return exact, prefix, substring, summary
+
+    def render(self, style: str, node: Node, fmt: Callable[[Node], str]) -> str:
+        """Return ``fmt(node)``, cached per node and output style.
+
+        A cached entry is reused only while the node still holds the same
+        summary object, so an in-place enrichment re-renders the node.
+        """
+        key = (style, node.id)
+        hit = self.rendered.get(key)
+        if hit is not None and hit[0] is node.summary:
+            return hit[1]
+        text = fmt(node)
+        self.rendered[key] = (node.summary, text)
+        return text
+
+    def cached(self, key: tuple[Any, ...], compute: Callable[[], str]) -> str:
+        """Return ``compute()``, memoized on this index under ``key``.
+
+        For tool output that is a function of the indexed nodes and edges
+        and of ``key`` alone. A reindex builds a new SymbolIndex, which
+        starts empty, so entries never need invalidating. The
+        OUTPUT_CACHE_SIZE most recently used keys are kept.
+        """
+        outputs = self.outputs
+        text = outputs.get(key)
+        if text is not None:
+            outputs.move_to_end(key)
+            return text
+        text = outputs[key] = compute()
+        if len(outputs) > OUTPUT_CACHE_SIZE:
+            outputs.popitem(last=False)
+        return text
+
+    def calls_from(self, node_ids: Iterable[str]) -> list[tuple[str, str, str]]:
+        """Return the ``calls`` made by any of ``node_ids``, in edge order."""
+        positions: list[int] = []
+        for node_id in node_ids:
+            positions.extend(self.calls_by_source.get(node_id, ()))
+        return [self.calls[i] for i in sorted(positions)]
+
+    def files_with_prefix(self, prefix: str) -> list[str]:
+        """Return the indexed file paths starting with ``prefix``, sorted.
+
+        The matches form one run of ``sorted_files``, found by bisection
+        instead of testing every path.
+        """
+        files = self.sorted_files
+        start = end = bisect_left(files, prefix)
+        while end < len(files) and files[end].startswith(prefix):
+            end += 1
+        return files[start:end]
+
+    def word_matches(
+        self, name: str, node_type: str = "", limit: int | None = None
+    ) -> list[Node]:
+        """Return symbols whose name contains ``name`` as a whole word.
+
+        This is the lookup tools' fallback when no name matches exactly.
+        A plain identifier is answered from ``name_tokens``; any other name
+        is narrowed by its rarest identifier (see _rarest_postings()),
+        pre-checked as a substring and confirmed with word_pattern().
+        Comments are excluded, nodes keep node order, and at most ``limit``
+        are returned.
+        """
+        key = name.casefold()
+        lowered, name_rows = self.lowered, self.name_rows
+        if _IDENT_RE.fullmatch(key):
+            rows = (name_rows[j] for j in self.name_tokens.get(key, ()))
+        else:
+            candidates = _rarest_postings(key, self.name_tokens)
+            if candidates is None:
+                candidates = range(len(name_rows))
+            elif not candidates:
+                return []
+            pattern = word_pattern(name)
+            rows = (
+                i for j in candidates
+                if key in lowered[i := name_rows[j]][1] and pattern.search(lowered[i][0].name)
+            )
+        if node_type:
+            types = self.types
+            rows = (i for i in rows if types[i] == node_type)
+        return [lowered[i][0] for i in islice(rows, limit)]
+
+    def calls_mentioning(self, names: Iterable[str]) -> list[tuple[str, str, str]]:
+        """Return the ``calls`` whose context may mention any of ``names``.
+
+        Plain identifiers are answered from ``call_tokens`` so only matching
+        calls are visited; any other name keeps the calls whose context
+        contains it as a substring. Calls keep edge order. Callers still
+        confirm with word_pattern() or names_matcher(), which also decides
+        which name matched.
+        """
+        return [self.calls[i] for i in self._mentioning(names)]
+
+    def callers_mentioning(self, names: Iterable[str]) -> list[tuple[Node, str]]:
+        """Like calls_mentioning(), as (caller node, context) pairs.
+
+        Callers are resolved by position through ``call_callers`` rather
+        than an id lookup per call; calls from unindexed sources are
+        dropped. This is the inner loop of the caller traversals.
+        """
+        calls, callers = self.calls, self.call_callers
+        return [
+            (caller, calls[i][1])
+            for i in self._mentioning(names)
+            if (caller := callers[i]) is not None
+        ]
+
+    def _mentioning(self, names: Iterable[str]) -> list[int]:
+        """Sorted ``calls`` positions whose context may mention any of ``names``."""
+        positions: set[int] = set()
+        for name in names:
+            key = name.casefold()
+            if _IDENT_RE.fullmatch(key):
+                positions.update(self.call_tokens.get(key, ()))
+            else:
+                positions.update(self._containing(key))
+        return sorted(positions)
+
+    def _folded_contexts(self) -> list[str]:
+        folded = self.folded_contexts
+        if folded is None:
+            folded = self.folded_contexts = [ctx.casefold() for _, ctx, _ in self.calls]
+        return folded
+
+    def _containing(self, key: str) -> list[int]:
+        """Positions of ``calls`` whose casefolded context contains ``key``.
+
+        Only calls holding the rarest identifier of ``key`` as a token are
+        tested (see _rarest_postings()), and a substring test runs at C
+        speed, so the whole-word regex only sees the few that can match.
+        """
+        folded = self._folded_contexts()
+        candidates = _rarest_postings(key, self.call_tokens)
+        if candidates is None:
+            return [i for i, ctx in enumerate(folded) if key in ctx]
+        return [i for i in candidates if key in folded[i]]
+
+    def calls_naming(self, name: str) -> list[tuple[str, str, str]]:
+        """Return the ``calls`` whose context contains ``name`` as a whole word.
+
+        Matching is case-insensitive. For a plain identifier the
+        ``call_tokens`` posting list is already exact, so no regex runs;
+        other names are pre-checked as a substring of the casefolded context
+        and confirmed with word_pattern().
+        """
+        calls = self.calls
+        return [calls[i] for i in self._naming(name)]
+
+    def usages(
+        self, name: str, argument_filter: str = "", file_filter: str = ""
+    ) -> list[tuple[Node, str]]:
+        """Return (caller node, context) for each call naming ``name``, in edge order.
+
+        Like calls_naming(), dropping calls from unindexed sources.
+        ``argument_filter`` and ``file_filter`` are case-insensitive
+        substrings of the call context and the caller's path, tested
+        against the casefolded copies kept on the index.
+
+        When the files matching ``file_filter`` hold fewer calls than those
+        naming ``name``, the calls in those files are walked instead, each
+        looked up in the sorted name positions by bisection.
+        """
+        positions = self._naming(name)
+        file_key, folded_files = file_filter.casefold(), self.folded_files
+        if file_key and positions:
+            in_files = [
+                calls for file, calls in self.calls_by_file.items()
+                if file_key in folded_files[file]
+            ]
+            if sum(map(len, in_files)) < len(positions):
+                candidates = sorted(chain.from_iterable(in_files))
+                positions = [i for i in candidates if _contains_sorted(positions, i)]
+                file_key = ""
+        if argument_filter:
+            key, folded = argument_filter.casefold(), self._folded_contexts()
+            positions = [i for i in positions if key in folded[i]]
+        calls, callers = self.calls, self.call_callers
+        return [
+            (caller, calls[i][1])
+            for i in positions
+            if (caller := callers[i]) is not None
+            and (not file_key or file_key in folded_files[caller.loc.file])
+        ]
+
+    def _naming(self, name: str) -> list[int]:
+        """Positions of the ``calls`` naming ``name``; see calls_naming()."""
+        key = name.casefold()
+        if _IDENT_RE.fullmatch(key):
+            return self.call_tokens.get(key, [])
+        positions = self._containing(key)
+        if not positions:
+            return []
+        pattern = word_pattern(name)
+        calls = self.calls
+        return [i for i in positions if pattern.search(calls[i][1])]
+
+
+def build_symbol_index(nodes: list[Node], edges: Iterable[Edge] = ()) -> SymbolIndex:
+    """Build a SymbolIndex from the current node and edge lists.
+
+    Casefolds every node's name, summary and file path once so
+    case-insensitive matching in the tools is a plain string comparison,
+    and fills the inverted indexes in the same pass.
+    """
+    idx = SymbolIndex()
+    # Posting lists are filled through defaultdicts (no setdefault call and
+    # spare list per row) and stored as plain dicts, so a lookup of a
+    # missing key can never insert one.
+    by_name: defaultdict[str, list[Node]] = defaultdict(list)
+    name_positions: defaultdict[str, list[int]] = defaultdict(list)
+    comments_by_parent: defaultdict[str, list[Node]] = defaultdict(list)
+    by_type: defaultdict[str, list[int]] = defaultdict(list)
+    by_language: defaultdict[str, list[int]] = defaultdict(list)
+    by_type_language: defaultdict[tuple[str, str], list[int]] = defaultdict(list)
+    by_file: defaultdict[str, list[Node]] = defaultdict(list)
+    name_tokens: defaultdict[str, list[int]] = defaultdict(list)
+    lowered, meta_lowered, by_id = idx.lowered, idx.meta_lowered, idx.by_id
+    types, languages, folded_files = idx.types, idx.languages, idx.folded_files
+    name_rows, summary_rows = idx.name_rows, idx.summary_rows
+    names: list[str] = []
+    summaries: list[str] = []
+    comment = NodeType.COMMENT
+    findall = _IDENT_RE.findall
+    for i, n in enumerate(nodes):
+        name_lower = n.name.casefold()
+        summary_lower = n.summary.casefold()
+        file = n.loc.file
+        file_lower = file.casefold()
+        meta = n.meta
+        lowered.append((n, name_lower, summary_lower, file_lower))
+        meta_lowered.append(
+            ((meta.visibility or "").casefold(), (meta.return_type or "").casefold())
+        )
+        by_id[n.id] = n
+        type_value = n.type.value
+        language = n.language
+        types.append(type_value)
+        languages.append(language)
+        by_type[type_value].append(i)
+        by_language[language].append(i)
+        by_type_language[type_value, language].append(i)
+        by_file[file].append(n)
+        folded_files[file] = file_lower
+        if n.type == comment:
+            if meta.parent_symbol:
+                comments_by_parent[meta.parent_symbol].append(n)
+            continue
+        by_name[name_lower].append(n)
+        name_positions[name_lower].append(i)
+        row = len(name_rows)
+        for token in set(findall(name_lower)):
+            name_tokens[token].append(row)
+        name_rows.append(i)
+        names.append(name_lower)
+        # Most symbols have no summary until enrichment runs; leaving them
+        # out keeps the summary scan proportional to the summarized rows.
+        if summary_lower:
+            summary_rows.append(i)
+            summaries.append(summary_lower)
+    idx.by_name = dict(by_name)
+    idx.name_positions = dict(name_positions)
+    idx.comments_by_parent = dict(comments_by_parent)
+    idx.by_type = dict(by_type)
+    idx.by_language = dict(by_language)
+    idx.by_type_language = dict(by_type_language)
+    idx.by_file = dict(by_file)
+    idx.name_tokens = dict(name_tokens)
+    idx.name_text, idx.name_offsets = _join_column(names)
+    idx.summary_text, idx.summary_offsets = _join_column(summaries)
+    idx.sorted_files = sorted(idx.by_file)
+    for path in idx.sorted_files:
+        langs = sorted({n.language for n in idx.by_file[path]})
+        idx.file_languages[path] = langs
+        for lang in langs:
+            idx.files_by_language.setdefault(lang, []).append(path)
+
+    calls, call_callers = idx.calls, idx.call_callers
+    calls_by_source: defaultdict[str, list[int]] = defaultdict(list)
+    calls_by_file: defaultdict[str, list[int]] = defaultdict(list)
+    callee_sources: defaultdict[str, set[str]] = defaultdict(set)
+    call_tokens: defaultdict[str, list[int]] = defaultdict(list)
+    # Call expressions repeat a lot ("$this->save()"), so each distinct
+    # context is parsed for its callee and identifiers once.
+    parsed: dict[str, tuple[str, set[str]]] = {}
+    calls_relation = RelationType.CALLS
+    for e in edges:
+        if e.relation != calls_relation:
+            continue
+        ctx = e.metadata.context or ""
+        hit = parsed.get(ctx)
+        if hit is None:
+            hit = parsed[ctx] = (callee_name(ctx), set(findall(ctx.casefold())))
+        callee, tokens = hit
+        source = e.source
+        i = len(calls)
+        calls_by_source[source].append(i)
+        calls.append((source, ctx, callee))
+        caller = by_id.get(source)
+        call_callers.append(caller)
+        if caller is not None:
+            calls_by_file[caller.loc.file].append(i)
+        if callee:
+            callee_sources[callee].add(source)
+        for token in tokens:
+            call_tokens[token].append(i)
+    idx.calls_by_source = dict(calls_by_source)
+    idx.calls_by_file = dict(calls_by_file)
+    idx.callee_sources = dict(callee_sources)
+    idx.call_tokens = dict(call_tokens)
+    return idx
+
+
+def _rarest_postings(key: str, postings: dict[str, list[int]]) -> Sequence[int] | None:
+    """Return the shortest posting list among the identifiers in ``key``.
+
+    Each identifier inside a whole-word match of ``key`` is a complete
+    token of the matched text, so every match lies in each identifier's
+    posting list. A name with an unknown identifier gets an empty list
+    without scanning anything. None means ``key`` has no identifier.
+    """
+    tokens = set(_IDENT_RE.findall(key))
+    if not tokens:
+        return None
+    return min((postings.get(t, ()) for t in tokens), key=len)
+
+
+def _contains_sorted(values: Sequence[int], value: int) -> bool:
+    """Whether ``value`` is in the ascending sequence ``values``."""
+    i = bisect_left(values, value)
+    return i < len(values) and values[i] == value
+
+
+def callee_name(context: str) -> str:
+    """Extract the casefolded name of the function a call expression calls.
+
+    Takes the last identifier followed by '(' (``$this->repo->save($x)`` ->
+    ``save``), else the last segment after '.', ':' or whitespace. Returns
+    "" when nothing is found.
+    """
+    if "(" in context:
+        m = _CALLEE_RE.findall(context)
+        if m:
+            return m[-1].casefold()
+    # Last segment without splitting the whole context: rsplit() drops
+    # everything up to the last whitespace run, rfind() the qualifiers.
+    if not context or context[-1].isspace():
+        return ""
+    segment = context.rsplit(None, 1)[-1]
+    return segment[max(segment.rfind(":"), segment.rfind(".")) + 1 :].casefold()
+
+
+@dataclass
+class _Categories:
+    """A string column stored as integer codes, so equality filters compare ints."""
+
+    codes: Any
+    ids: dict[str, int]
+
+    def equals(self, value: str) -> Any:
+        """Boolean mask of the rows holding ``value``."""
+        return self.codes == self.ids.get(value, -1)
+
+
+def _categories(values: Iterable[str]) -> _Categories:
+    ids: dict[str, int] = {}
+    codes = np.fromiter((ids.setdefault(v, len(ids)) for v in values), dtype=np.int32)
+    return _Categories(codes, ids)
+
+
+@dataclass
+class _NameArrays:
+    """Per-``name_rows`` NumPy columns used by SymbolIndex._search_arrays()."""
+
+    names: Any  # casefolded names; see _text_column()
+    name_lengths: Any  # len() of each casefolded name
+    sort_keys: Any  # len(node.name), the ranking key within a bucket
+    types: _Categories
+    languages: _Categories
+    files: Any  # casefolded loc.file
+    summary_columns: Any  # summary row -> position in the arrays
+    summary_bytes: Any  # ``summary_text`` encoded as UTF-8, as uint8
+    summary_starts: Any  # byte offset of each summary row in ``summary_bytes``
+
+
+def _build_name_arrays(idx: SymbolIndex) -> _NameArrays:
+    rows = [idx.lowered[i] for i in idx.name_rows]
+    names = _text_column([r[1] for r in rows])
+    # _COLUMN_SEP is one byte in UTF-8, like every separator in the text.
+    summary_lengths = np.array(
+        [len(idx.lowered[i][2].encode()) + 1 for i in idx.summary_rows], dtype=np.intp
+    )
+    return _NameArrays(
+        names=names,
+        name_lengths=np.strings.str_len(names),
+        sort_keys=np.array([len(r[0].name) for r in rows], dtype=np.intp),
+        types=_categories(idx.types[i] for i in idx.name_rows),
+        languages=_categories(idx.languages[i] for i in idx.name_rows),
+        files=_text_column([r[3] for r in rows]),
+        summary_columns=np.searchsorted(idx.name_rows, idx.summary_rows).astype(np.intp),
+        summary_bytes=np.frombuffer(idx.summary_text.encode(), dtype=np.uint8),
+        summary_starts=np.cumsum(summary_lengths) - summary_lengths,
+    )
+
+
+@dataclass
+class _MetaArrays:
+    """Per-``lowered`` NumPy columns used by SymbolIndex.structural_filter()."""
+
+    types: _Categories
+    languages: _Categories
+    visibility: _Categories  # casefolded
+    is_async: Any
+    param_counts: Any
+    return_types: Any  # casefolded; see _text_column()
+    complexity: Any  # None counts as 0
+    files: Any  # casefolded loc.file; see _text_column()
+
+
+def _build_meta_arrays(idx: SymbolIndex) -> _MetaArrays:
+    nodes = [r[0] for r in idx.lowered]
+    return _MetaArrays(
+        types=_categories(idx.types),
+        languages=_categories(idx.languages),
+        visibility=_categories(m[0] for m in idx.meta_lowered),
+        is_async=np.array([n.meta.is_async for n in nodes], dtype=bool),
+        param_counts=np.array([len(n.meta.parameters) for n in nodes], dtype=np.intp),
+        return_types=_text_column([m[1] for m in idx.meta_lowered]),
+        complexity=np.array([n.meta.complexity_score or 0 for n in nodes], dtype=np.intp),
+        files=_text_column([r[3] for r in idx.lowered]),
+    )
+
+
+def _text_column(values: list[str]) -> Any:
+    """Return ``values`` as a fixed-width NumPy string array for _column_find().
+
+    Identifiers and paths are nearly always ASCII; those columns are
+    stored as bytes, a quarter of the size of the UCS-4 str dtype and
+    faster to scan. Any non-ASCII value keeps the whole column as str.
+    """
+    if "".join(values).isascii():
+        return np.array([v.encode() for v in values], dtype=bytes)
+    return np.array(values, dtype=str)
+
+
+def _column_find(column: Any, query: str) -> Any:
+    """np.strings.find() of ``query`` in a _text_column() array.
+
+    A bytes column is searched with the query's UTF-8 encoding, so a
+    non-ASCII query finds nothing, as it would in the str column.
+    """
+    if column.dtype.kind == "S":
+        return np.strings.find(column, query.encode())
+    return np.strings.find(column, query)
+
+
+def _join_column(values: list[str]) -> tuple[str, list[int]]:
+    """Join strings with _COLUMN_SEP and return the text and each start offset."""
+    offsets: list[int] = []
+    pos = 0
+    for v in values:
+        offsets.append(pos)
+        pos += len(v) + 1
+    return _COLUMN_SEP.join(values), offsets
+
+
+def _byte_hit_rows(buf: Any, starts: Any, query: bytes) -> Any:
+    """Return the rows of a joined UTF-8 column that contain ``query``.
+
+    Rows are ascending and repeated once per occurrence. Candidate offsets
+    are narrowed one byte of ``query`` at a time, so past the first
+    comparison the work is proportional to the partial matches. UTF-8 is
+    self-synchronizing, so a byte match is a character match.
+    """
+    if not query:
+        return np.arange(len(starts))
+    candidates = np.flatnonzero(buf[: max(len(buf) - len(query) + 1, 0)] == query[0])
+    for k in range(1, len(query)):
+        candidates = candidates[buf[candidates + k] == query[k]]
+    return np.searchsorted(starts, candidates, side="right") - 1
+
+
+def _first_hits(text: str, offsets: list[int], query: str) -> Iterator[tuple[int, int]]:
+    """Yield (row, offset in row) of the first ``query`` match in each row of ``text``.
+
+    ``query`` must not contain _COLUMN_SEP, so a match never spans rows.
+    Rows are yielded in order; after a hit the scan resumes at the next row.
+    """
+    if not offsets:
+        return
+    last = len(offsets) - 1
+    find = text.find
+    i = find(query)
+    while i >= 0:
+        row = bisect_right(offsets, i) - 1
+        yield row, i - offsets[row]
+        if row == last:
+            return
+        i = find(query, offsets[row + 1])
+
+
+def _rank(
+    exact: list[tuple[int, Node]],
+    prefix: list[tuple[int, Node]],
+    substring: list[tuple[int, Node]],
+    summary: list[tuple[int, Node]],
+    limit: int,
+) -> tuple[list[Node], int]:
+    """Order the buckets, shortest name first within each, and apply ``limit``.
+
+    Only the ``limit`` shortest entries of each bucket are selected, so a
+    broad query does not sort thousands of matches to keep a page of them.
+    """
+    results: list[Node] = []
+    for bucket in (exact, prefix, substring, summary):
+        room = limit - len(results)
+        if room <= 0:
+            break
+        results.extend(n for _, n in heapq.nsmallest(room, bucket, key=itemgetter(0)))
+    total = len(exact) + len(prefix) + len(substring) + len(summary)
+    return results, total
+
+
+def _score_rows(
+    rows: list[tuple[Node, str, str, str]],
+    query_lower: str,
+    file_lower: str,
+) -> tuple[list[tuple[int, Node]], ...]:
+    """Split matching rows into exact / prefix / substring / summary buckets."""
+    exact: list[tuple[int, Node]] = []
+    prefix: list[tuple[int, Node]] = []
+    substring: list[tuple[int, Node]] = []
+    summary: list[tuple[int, Node]] = []
+    query_len = len(query_lower)
+
+    for node, name_lower, summary_lower, loc_file_lower in rows:
+        # Most rows miss the query, so reject on the precomputed strings
+        # first; node attributes are only read for candidate matches.
+        # One find() classifies all three name buckets.
+        pos = name_lower.find(query_lower)
+        if pos < 0 and query_lower not in summary_lower:
+            continue
+        if file_lower and file_lower not in loc_file_lower:
+            continue
+        if node.type == NodeType.COMMENT:
+            continue
+
+        if pos == 0:
+            bucket = exact if len(name_lower) == query_len else prefix
+        elif pos > 0:
+            bucket = substring
+        else:
+            bucket = summary
+        bucket.append((len(node.name), node))
+
+    return exact, prefix, substring, summary
+
+
+def _scan_workers(n_rows: int) -> int:
+    """Number of threads to split a scan of ``n_rows`` rows across.
+
+    Threads only pay off on a free-threaded interpreter; with the GIL the
+    scan stays on the calling thread. Small scans are never split since
+    the pool overhead outweighs the work.
+    """
+    if n_rows < PARALLEL_MIN_ROWS:
+        return 1
+    gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    if gil_enabled:
+        return 1
+    return os.cpu_count() or 1
+
+
+def _scan_pool() -> ThreadPoolExecutor:
+    """Return the shared scan thread pool, creating it on first use."""
+    global _POOL
+    if _POOL is None:
+        _POOL = ThreadPoolExecutor(thread_name_prefix="hammy-scan")
+    return _POOL
+
+
+@lru_cache(maxsize=1024)
+def word_pattern(name: str) -> re.Pattern[str]:
+    """Return a compiled case-insensitive whole-word pattern for ``name``.
+
+    Memoized so repeated lookups of the same symbol reuse one compiled regex.
+    """
+    return re.compile(r"\b" + re.escape(name) + r"\b", re.IGNORECASE)
+
+
+@lru_cache(maxsize=256)
+def name_filter(pattern: str) -> re.Pattern[str]:
+    """Compile a user-supplied case-insensitive name regex, memoized.
+
+    Raises re.error for an invalid pattern, like re.compile().
+    """
+    return re.compile(pattern, re.IGNORECASE)
+
+
+def strip_qualifier(name: str, split_dots: bool = True) -> str:
+    """Return the last segment of a qualified symbol name.
+
+    ``App\\Billing::renew`` -> ``renew``. Splits on ``::`` and ``\\``,
+    and also on ``.`` unless ``split_dots`` is False.
+    """
+    sep = _QUALIFIER_SEP_RE if split_dots else _NAMESPACE_SEP_RE
+    return sep.split(name)[-1]
+
+
+def names_pattern(names: Iterable[str]) -> re.Pattern[str] | None:
+    """Return one whole-word alternation matching any of ``names``.
+
+    Group 1 holds the matched name, so a single scan over a set of call
+    contexts replaces one search per name. Returns None when no non-empty
+    name is given (an empty alternation would match everywhere).
+    """
+    alts = sorted({n for n in names if n}, key=len, reverse=True)
+    if not alts:
+        return None
+    return re.compile(
+        r"\b(" + "|".join(re.escape(n) for n in alts) + r")\b", re.IGNORECASE
+    )
+
+
+def names_matcher(names: Iterable[str]) -> Callable[[str], str | None] | None:
+    """Return a function finding the first whole-word match of any of ``names``.
+
+    The function takes a call context and returns the matched name
+    casefolded, or None. Like names_pattern(), the leftmost match wins and
+    the longest name wins at the same position. Returns None when no
+    non-empty name is given.
+
+    Matchers are memoized per set of casefolded names, so repeating an
+    impact analysis reuses the compiled alternation or automaton.
+    """
+    folded = frozenset(n.casefold() for n in names if n)
+    if not folded:
+        return None
+    use_automaton = ahocorasick is not None and len(folded) >= AHOCORASICK_MIN_NAMES
+    return _compiled_matcher(folded, use_automaton)
+
+
+@lru_cache(maxsize=128)
+def _compiled_matcher(folded: frozenset[str], use_automaton: bool) -> Callable[[str], str | None]:
+    if not use_automaton:
+        pattern = names_pattern(folded)
+
+        def match_regex(ctx: str) -> str | None:
+            m = pattern.search(ctx)
+            return m.group(1).casefold() if m else None
+
+        return match_regex
+
+    automaton = ahocorasick.Automaton()
+    for name in folded:
+        automaton.add_word(name, name)
+    automaton.make_automaton()
+    longest = max(map(len, folded))
+
+    def match_automaton(ctx: str) -> str | None:
+        text = ctx.casefold()
+        best: tuple[int, int, str] | None = None
+        for end, name in automaton.iter(text):
+            if best is not None and end - longest >= best[0]:
+                # Hits come in end order; none of the rest can start earlier.
+                break
+            start = end - len(name) + 1
+            if best is not None and (start, -len(name)) >= best[:2]:
+                continue
+            if _word_boundary(text, start) and _word_boundary(text, end + 1):
+                best = (start, -len(name), name)
+        return best[2] if best else None
+
+    return match_automaton
+
+
+def _is_word_char(c: str) -> bool:
+    return c.isalnum() or c == "_"
+
+
+def _word_boundary(text: str, i: int) -> bool:
+    """True if position ``i`` of ``text`` is a word boundary, as regex ``\\b``."""
+    before = i > 0 and _is_word_char(text[i - 1])
+    after = i < len(text) and _is_word_char(text[i])
+    return before != after
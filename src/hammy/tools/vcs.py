@@ -7,10 +7,13 @@ interface for log, blame, churn, and diff operations.
 from __future__ import annotations
 
 import subprocess
+import tempfile
+import threading
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from enum import Enum
 from pathlib import Path
+from typing import Iterator
 
 
 class VCSType(str, Enum):
@@ -64,10 +67,26 @@ class VCSWrapper:
         limit: int = 50,
     ) -> list[CommitInfo]:
         """Get commit history, optionally filtered to a specific path."""
+        return list(self.iter_log(path, limit, timeout=30))
+
+    def iter_log(
+        self,
+        path: str | None = None,
+        limit: int = 50,
+        *,
+        timeout: float | None = None,
+    ) -> Iterator[CommitInfo]:
+        """Like log(), but yields commits as the VCS prints them.
+
+        The full history output is never held in memory, so this suits
+        large limits when each commit is handled once. With a timeout, the
+        VCS command is killed and subprocess.TimeoutExpired raised if it
+        runs longer than that many seconds.
+        """
         if self.vcs_type == VCSType.GIT:
-            return self._git_log(path, limit)
+            return self._git_log(path, limit, timeout)
         else:
-            return self._hg_log(path, limit)
+            return self._hg_log(path, limit, timeout)
 
     def blame(self, path: str) -> list[BlameLine]:
         """Get line-by-line authorship for a file."""
@@ -82,7 +101,7 @@ class VCSWrapper:
         Returns a dict of {file_path: change_count}.
         """
         cutoff = datetime.now(timezone.utc) - timedelta(days=window_days)
-        commits = self.log(path, limit=10000)
+        commits = self.iter_log(path, limit=10000)
 
         churn: dict[str, int] = {}
         for commit in commits:
@@ -109,7 +128,9 @@ class VCSWrapper:
 
     # --- Git Implementation ---
 
-    def _git_log(self, path: str | None, limit: int) -> list[CommitInfo]:
+    def _git_log(
+        self, path: str | None, limit: int, timeout: float | None
+    ) -> Iterator[CommitInfo]:
         # Use a record separator to clearly delineate commits
         sep = "---HAMMY_SEP---"
         record_sep = "---HAMMY_RECORD---"
@@ -119,35 +140,31 @@ class VCSWrapper:
         if path:
             cmd.extend(["--", path])
 
-        output = self._run(cmd)
-        if not output.strip():
-            return []
-
-        commits: list[CommitInfo] = []
-        # Split by record separator to get individual commits
-        records = output.split(record_sep)
-        for record in records:
-            record = record.strip()
-            if not record:
-                continue
-
-            lines = record.split("\n")
-            parts = lines[0].split(sep)
-            if len(parts) < 4:
-                continue
-
-            date = datetime.fromisoformat(parts[2])
-            files = [l for l in lines[1:] if l.strip()]
-
-            commits.append(CommitInfo(
-                revision=parts[0],
-                author=parts[1],
-                date=date,
-                message=parts[3],
-                files_changed=files,
-            ))
+        # Each record is a header line starting with the record separator,
+        # followed by the names of the files it changed
+        header: list[str] | None = None
+        files: list[str] = []
+        for line in self._stream(cmd, timeout):
+            if line.startswith(record_sep):
+                if header is not None:
+                    yield self._git_commit(header, files)
+                parts = line[len(record_sep):].split(sep)
+                header = parts if len(parts) >= 4 else None
+                files = []
+            elif line.strip():
+                files.append(line)
+        if header is not None:
+            yield self._git_commit(header, files)
 
-        return commits
+    @staticmethod
+    def _git_commit(parts: list[str], files: list[str]) -> CommitInfo:
+        return CommitInfo(
+            revision=parts[0],
+            author=parts[1],
+            date=datetime.fromisoformat(parts[2]),
+            message=parts[3],
+            files_changed=files,
+        )
 
     def _git_blame(self, path: str) -> list[BlameLine]:
         output = self._run(["git", "blame", "--porcelain", path])
@@ -182,7 +199,9 @@ class VCSWrapper:
 
     # --- Mercurial Implementation ---
 
-    def _hg_log(self, path: str | None, limit: int) -> list[CommitInfo]:
+    def _hg_log(
+        self, path: str | None, limit: int, timeout: float | None
+    ) -> Iterator[CommitInfo]:
         sep = "---HAMMY_SEP---"
         template = f"{{node|short}}{sep}{{author|user}}{sep}{{date|isodatesec}}{sep}{{desc|firstline}}{sep}{{files}}\n"
 
@@ -190,12 +209,7 @@ class VCSWrapper:
         if path:
             cmd.append(path)
 
-        output = self._run(cmd)
-        if not output.strip():
-            return []
-
-        commits: list[CommitInfo] = []
-        for line in output.strip().split("\n"):
+        for line in self._stream(cmd, timeout):
             if not line.strip():
                 continue
             parts = line.split(sep)
@@ -209,15 +223,13 @@ class VCSWrapper:
 
             files = [f.strip() for f in parts[4].split() if f.strip()]
 
-            commits.append(CommitInfo(
+            yield CommitInfo(
                 revision=parts[0],
                 author=parts[1],
                 date=date,
                 message=parts[3],
                 files_changed=files,
-            ))
-
-        return commits
+            )
 
     def _hg_blame(self, path: str) -> list[BlameLine]:
         output = self._run(["hg", "annotate", "-u", "-c", path])
@@ -260,3 +272,51 @@ class VCSWrapper:
                 f"stderr: {result.stderr}"
             )
         return result.stdout
+
+    def _stream(self, cmd: list[str], timeout: float | None = None) -> Iterator[str]:
+        """Run a VCS command and yield its stdout line by line, without newlines.
+
+        Raises RuntimeError like _run() if the command fails, and
+        subprocess.TimeoutExpired if it is still running after ``timeout``
+        seconds. If the consumer stops early, the command is killed.
+        """
+        # stderr goes to a file rather than a pipe: a pipe nobody reads
+        # until stdout ends would block a command that warns a lot
+        with tempfile.TemporaryFile("w+") as stderr_file, subprocess.Popen(
+            cmd,
+            cwd=self.project_root,
+            stdout=subprocess.PIPE,
+            stderr=stderr_file,
+            text=True,
+        ) as proc:
+            timed_out = threading.Event()
+
+            def kill() -> None:
+                timed_out.set()
+                proc.kill()
+
+            timer = threading.Timer(timeout, kill) if timeout is not None else None
+            if timer is not None:
+                timer.daemon = True
+                timer.start()
+            try:
+                for line in proc.stdout:
+                    if timed_out.is_set():
+                        break
+                    yield line.rstrip("\n")
+            except BaseException:
+                proc.kill()
+                raise
+            finally:
+                if timer is not None:
+                    timer.cancel()
+            proc.wait()
+            if timed_out.is_set():
+                raise subprocess.TimeoutExpired(cmd, timeout)
+            stderr_file.seek(0)
+            stderr = stderr_file.read()
+        if proc.returncode != 0:
+            raise RuntimeError(
+                f"VCS command failed: {' '.join(cmd)}\n"
+                f"stderr: {stderr}"
+            )
@@ -104,20 +104,29 @@ def create_viz_app(project_root: Path) -> FastAPI:
         if n.type == NodeType.COMMENT and n.meta.parent_symbol:
             comments_by_symbol[n.meta.parent_symbol].append(n)
 
+    # Non-comment symbols with their lowercased names, and the exact-name
+    # lookup built from them; the index never changes while the app runs
+    symbols_lower: list[tuple[Any, str]] = [
+        (n, n.name.lower()) for n in nodes if n.type != NodeType.COMMENT
+    ]
+    symbols_by_name: dict[str, list] = defaultdict(list)
+    for n, name_lower in symbols_lower:
+        symbols_by_name[name_lower].append(n)
+
+    stats: dict[str, Any] = {
+        "symbols": len(symbols_lower),
+        "comments": len(nodes) - len(symbols_lower),
+        "edges": len(edges),
+        "files": len({n.loc.file for n, _ in symbols_lower}),
+        "project": project_root.name,
+    }
+
     # ── App ────────────────────────────────────────────────────────────────
     app = FastAPI(title="Hammy Viz", docs_url=None, redoc_url=None)
 
     @app.get("/api/stats")
     def get_stats() -> dict[str, Any]:
-        symbol_nodes = [n for n in nodes if n.type != NodeType.COMMENT]
-        files = len({n.loc.file for n in symbol_nodes})
-        return {
-            "symbols": len(symbol_nodes),
-            "comments": sum(1 for n in nodes if n.type == NodeType.COMMENT),
-            "edges": len(edges),
-            "files": files,
-            "project": project_root.name,
-        }
+        return dict(stats)
 
     @app.get("/api/search")
     def search(
@@ -128,10 +137,8 @@ def create_viz_app(project_root: Path) -> FastAPI:
             return []
         q_lower = q.lower()
         results = []
-        for n in nodes:
-            if n.type == NodeType.COMMENT:
-                continue
-            if q_lower in n.name.lower():
+        for n, name_lower in symbols_lower:
+            if q_lower in name_lower:
                 results.append({
                     "id": n.id,
                     "name": n.name,
@@ -158,9 +165,9 @@ def create_viz_app(project_root: Path) -> FastAPI:
         """Return a BFS subgraph centered on all symbols matching `name`."""
         name_lower = name.lower()
         # Exact match first, then substring
-        seeds = [n for n in nodes if n.type != NodeType.COMMENT and n.name.lower() == name_lower]
+        seeds = list(symbols_by_name.get(name_lower, ()))
         if not seeds:
-            seeds = [n for n in nodes if n.type != NodeType.COMMENT and name_lower in n.name.lower()]
+            seeds = [n for n, lowered in symbols_lower if name_lower in lowered]
         if not seeds:
             raise HTTPException(status_code=404, detail=f"Symbol '{name}' not found")
 
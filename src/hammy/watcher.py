@@ -57,19 +57,17 @@ def process_changed_files(
 
     files_to_reindex: list[Path] = []
     files_deleted: list[str] = []
+    # All relative paths affected (both changed and deleted)
+    affected_rel: set[str] = set()
 
     for path in changed_paths:
         rel = str(path.relative_to(project_root))
+        affected_rel.add(rel)
         if path.exists():
             files_to_reindex.append(path)
         else:
             files_deleted.append(rel)
 
-    # Collect all relative paths affected (both changed and deleted)
-    affected_rel = {
-        str(p.relative_to(project_root)) for p in files_to_reindex
-    } | set(files_deleted)
-
     # Remove old nodes/edges for affected files
     old_ids: set[str] = set()
     for rel in affected_rel:
@@ -246,6 +246,62 @@ class TestContextPackGeneration:
         assert "Cross-Language Bridges" in md
         assert "95%" in md
 
+    def test_layout(self):
+        from hammy.core.context_pack import generate_context_pack_markdown
+
+        pack = ContextPack(
+            query="q",
+            summary="s",
+            warnings=["w"],
+            nodes=[
+                Node(
+                    id="n1",
+                    type=NodeType.FUNCTION,
+                    name="f",
+                    loc=Location(file="a.py", lines=(1, 2)),
+                    language="python",
+                    meta=NodeMeta(is_async=True),
+                ),
+            ],
+            edges=[
+                Edge(
+                    source="n1",
+                    target="n2",
+                    relation=RelationType.CALLS,
+                    metadata=EdgeMetadata(context="ctx"),
+                ),
+            ],
+        )
+        assert generate_context_pack_markdown(pack) == (
+            "# Hammy Context Pack\n\n**Query:** q\n\n"
+            "## Summary\n\ns\n\n"
+            "## Warnings\n\n- w\n\n"
+            "## Code Entities\n\n### Functions\n\n"
+            "- **f** (`a.py:1-2`, python)\n  - async\n\n"
+            "## Relationships\n\n### Dependencies\n\n"
+            "- `n1` —[calls]→ `n2` — ctx\n"
+        )
+
+    def test_sections_follow_node_type_order(self):
+        from hammy.core.context_pack import generate_context_pack_markdown
+
+        def node(name: str, node_type: NodeType) -> Node:
+            return Node(
+                id=name,
+                type=node_type,
+                name=name,
+                loc=Location(file="a.py", lines=(1, 2)),
+                language="python",
+            )
+
+        pack = ContextPack(
+            query="q",
+            nodes=[node("f", NodeType.FUNCTION), node("C", NodeType.CLASS), node("g", NodeType.FUNCTION)],
+        )
+        md = generate_context_pack_markdown(pack)
+        assert md.index("### Classs") < md.index("### Functions") < md.index("**g**")
+        assert "### Methods" not in md
+
 
 class TestExplorerTools:
     def test_creates_core_tools_without_qdrant(self, tmp_path: Path):
@@ -254,9 +310,10 @@ class TestExplorerTools:
 
         factory = ParserFactory()
         tools = make_explorer_tools(tmp_path, factory, [], [])
-        assert len(tools) == 15
+        assert len(tools) == 16
         tool_names = [t.name for t in tools]
         assert "AST Query" in tool_names
+        assert "AST Query Batch" in tool_names
         assert "Search Code Symbols" in tool_names
         assert "Hybrid Code Search" in tool_names
         assert "Lookup Symbol" in tool_names
@@ -276,6 +333,90 @@ class TestExplorerTools:
         assert "Recall Context" not in tool_names
         assert "List Context" not in tool_names
 
+    def test_ast_query_batch(self, tmp_path: Path):
+        from hammy.agents.explorer import make_explorer_tools
+        from hammy.tools.parser import ParserFactory
+
+        (tmp_path / "a.py").write_text("def alpha():\n    pass\n")
+        (tmp_path / "b.py").write_text("class Beta:\n    pass\n")
+        tools = make_explorer_tools(tmp_path, ParserFactory(["python"]), [], [])
+        batch = next(t for t in tools if t.name == "AST Query Batch")
+        single = next(t for t in tools if t.name == "AST Query")
+        result = batch.func("a.py, missing.py, b.py")
+        assert result == "\n\n".join([
+            f"=== a.py ===\n{single.func('a.py')}",
+            "=== missing.py ===\nFile not found: missing.py",
+            f"=== b.py ===\n{single.func('b.py')}",
+        ])
+        assert "alpha" in result and "Beta" in result
+        assert batch.func(" , ") == "Provide at least one file path."
+
+    def test_search_comments_symbol_filter(self, tmp_path: Path):
+        from hammy.agents.explorer import make_explorer_tools
+        from hammy.tools.parser import ParserFactory
+
+        def comment(text: str, parent: str, line: int) -> Node:
+            return Node(
+                id=Node.make_id("a.py", f"c{line}"),
+                type=NodeType.COMMENT,
+                name=text,
+                loc=Location(file="a.py", lines=(line, line)),
+                language="python",
+                meta=NodeMeta(parent_symbol=parent),
+            )
+
+        nodes = [
+            comment("order matters", "Cache::save", 1),
+            comment("file note", "", 2),
+            comment("retry twice", "save_all", 3),
+            comment("keep in sync", "Cache::save", 4),
+        ]
+        tools = make_explorer_tools(tmp_path, ParserFactory(), nodes, [])
+        search = next(t for t in tools if t.name == "Search Comments")
+        result = search.func(symbol="SAVE")
+        assert result.startswith("2 comment(s) found:")
+        assert "order matters" in result and "keep in sync" in result
+        assert "retry twice" not in result
+        assert search.func(symbol="missing") == "No comments found matching the given filters."
+
+    def test_find_bridges_resolves_once(self, tmp_path: Path, monkeypatch, sample_nodes, sample_edges):
+        import hammy.agents.explorer as explorer_module
+        from hammy.agents.explorer import make_explorer_tools
+        from hammy.tools.parser import ParserFactory
+
+        calls = []
+
+        def counting(nodes, edges):
+            calls.append(1)
+            return resolve_bridges(nodes, edges)
+
+        monkeypatch.setattr(explorer_module, "resolve_bridges", counting)
+        tools = make_explorer_tools(tmp_path, ParserFactory(), sample_nodes, sample_edges)
+        find = next(t for t in tools if t.name == "Find Cross-Language Bridges")
+        first = find.func()
+        assert first.startswith("BRIDGE:")
+        assert find.func() == first
+        assert calls == [1]
+
+    def test_module_summary_directory_prefix(self, tmp_path: Path):
+        from hammy.agents.explorer import make_explorer_tools
+        from hammy.tools.parser import ParserFactory
+
+        nodes = [
+            _make_node("PayService", NodeType.CLASS, "app/Services/PayService.php"),
+            _make_node("Kernel", NodeType.CLASS, "app/Http/Kernel.php"),
+            _make_node("helper", NodeType.FUNCTION, "apps/helper.php"),
+        ]
+        tools = make_explorer_tools(tmp_path, ParserFactory(), nodes, [])
+        summary = next(t for t in tools if t.name == "Module Summary")
+        result = summary.func("app")
+        assert "(3 files, 3 symbols)" in result
+        result = summary.func("app/")
+        assert "(2 files, 2 symbols)" in result
+        assert "apps/helper.php" not in result
+        assert "(1 files, 1 symbols)" in summary.func("app/Services")
+        assert summary.func("vendor/") == "No symbols found under 'vendor/'."
+
     def test_adds_brain_tools_with_qdrant(self, tmp_path: Path):
         from unittest.mock import MagicMock
         from hammy.agents.explorer import make_explorer_tools
@@ -283,12 +424,75 @@ class TestExplorerTools:
 
         mock_qdrant = MagicMock()
         tools = make_explorer_tools(tmp_path, ParserFactory(), [], [], qdrant=mock_qdrant)
-        assert len(tools) == 18
+        assert len(tools) == 19
         tool_names = [t.name for t in tools]
         assert "Store Context" in tool_names
         assert "Recall Context" in tool_names
         assert "List Context" in tool_names
 
+    def test_list_context_summarizes_first_line(self, tmp_path: Path):
+        from unittest.mock import MagicMock
+        from hammy.agents.explorer import make_explorer_tools
+        from hammy.tools.parser import ParserFactory
+
+        mock_qdrant = MagicMock()
+        mock_qdrant.list_brain_entries.return_value = [
+            {"key": "long", "content": "x" * 100 + "\nsecond"},
+            {"key": "crlf", "content": "first\r\n" + "y" * 100},
+            {"key": "short", "content": "only line"},
+            {"key": "empty", "content": ""},
+        ]
+        tools = make_explorer_tools(tmp_path, ParserFactory(), [], [], qdrant=mock_qdrant)
+        list_context = next(t for t in tools if t.name == "List Context")
+        lines = list_context.func().splitlines()
+        assert lines[3] == "    " + "x" * 80 + "…"
+        assert lines[5] == "    first…"
+        assert lines[7] == "    only line"
+        assert lines[9] == "    "
+
+    def test_recall_context_caches_until_store(self, tmp_path: Path):
+        from unittest.mock import MagicMock
+        from hammy.agents.explorer import make_explorer_tools
+        from hammy.tools.parser import ParserFactory
+
+        mock_qdrant = MagicMock()
+        mock_qdrant.search_brain.return_value = [
+            {"key": "renew-flow", "content": "Renewals run nightly.", "created_at": "2025-01-01T00:00:00"}
+        ]
+        tools = {t.name: t for t in make_explorer_tools(tmp_path, ParserFactory(), [], [], qdrant=mock_qdrant)}
+        recall = tools["Recall Context"]
+
+        first = recall.func(query="renewal flow")
+        assert recall.func(query="  Renewal Flow ") == first
+        assert mock_qdrant.search_brain.call_count == 1
+
+        tools["Store Context"].func(key="renew-flow", content="Renewals run hourly.")
+        recall.func(query="renewal flow")
+        assert mock_qdrant.search_brain.call_count == 2
+
+    def test_batched_store_context(self, tmp_path: Path):
+        from unittest.mock import MagicMock
+        from hammy.agents.explorer import make_explorer_tools
+        from hammy.tools.parser import ParserFactory
+
+        mock_qdrant = MagicMock()
+        mock_qdrant.search_brain.return_value = []
+        tools = {
+            t.name: t
+            for t in make_explorer_tools(
+                tmp_path, ParserFactory(), [], [], qdrant=mock_qdrant,
+                brain_batch_size=10, brain_flush_ms=60_000,
+            )
+        }
+        tools["Store Context"].func(key="a", content="alpha")
+        tools["Store Context"].func(key="b", content="beta")
+        mock_qdrant.upsert_brain_entries.assert_not_called()
+        mock_qdrant.upsert_brain_entry.assert_not_called()
+
+        tools["Recall Context"].func(key="a")
+        batch = mock_qdrant.upsert_brain_entries.call_args.args[0]
+        assert [e["key"] for e in batch] == ["a", "b"]
+
 
 def _make_node(name: str, ntype: NodeType, file: str, language: str = "php") -> Node:
     return Node(
@@ -354,6 +558,17 @@ class TestSearchSymbolsRanking:
         assert "controllers" in result
         assert "models" not in result
 
+    def test_full_page_of_exact_matches_is_not_miscounted(self, tmp_path: Path):
+        from hammy.agents.explorer import make_explorer_tools
+        from hammy.tools.parser import ParserFactory
+
+        nodes = [_make_node("save", NodeType.METHOD, f"m{i}.php") for i in range(30)]
+        nodes.append(_make_node("saveAll", NodeType.METHOD, "a.php"))
+        tools = make_explorer_tools(tmp_path, ParserFactory(), nodes, [])
+        search = next(t for t in tools if t.name == "Search Code Symbols")
+        result = search.func(query="save")
+        assert "... and possibly more (at least 25 symbols are named 'save')" in result
+
 
 class TestLookupSymbol:
     """Verify lookup_symbol exact definition lookup."""
@@ -584,6 +799,14 @@ class TestStructuralSearch:
         assert "fetchData" in result
         assert "syncFunc" not in result
 
+    def test_limit_keeps_total_count(self, tmp_path: Path):
+        nodes = [_make_node_meta(f"fn{i}", NodeType.FUNCTION) for i in range(5)]
+        tool = self._tool(tmp_path, nodes)
+        result = tool.func(limit=2)
+        assert result.startswith("5 symbol(s) matched")
+        assert "fn1" in result and "fn2" not in result
+        assert "... and 3 more" in result
+
     def test_min_params(self, tmp_path: Path):
         nodes = [
             _make_node_meta("noArgs", NodeType.FUNCTION, params=[]),
@@ -744,6 +967,26 @@ class TestHotspotScore:
         results = compute_hotspots(nodes, edges, node_type="function", top_n=10)
         assert all(r["type"] == "function" for r in results)
 
+    def test_prebuilt_index_matches_scan(self, tmp_path: Path):
+        from hammy.tools.hotspot import compute_hotspots
+        from hammy.tools.symbol_index import build_symbol_index
+
+        nodes, edges = self._nodes_and_edges()
+        index = build_symbol_index(nodes, edges)
+        for filters in ({}, {"node_type": "method"}, {"language": "php", "file_filter": "RENEWAL"}):
+            assert compute_hotspots(nodes, edges, index=index, **filters) == compute_hotspots(
+                nodes, edges, **filters
+            )
+
+    def test_top_n_matches_full_sort(self, tmp_path: Path):
+        from hammy.tools.hotspot import compute_hotspots
+
+        nodes = [_make_node(f"fn{i}", NodeType.FUNCTION, f"f{i % 4}.php") for i in range(12)]
+        file_churn = {"f0.php": 3, "f1.php": 3, "f2.php": 1}
+        everything = compute_hotspots(nodes, [], file_churn=file_churn, top_n=100)
+        assert [r["name"] for r in everything] == [f"fn{i}" for i in range(12)]
+        assert compute_hotspots(nodes, [], file_churn=file_churn, top_n=5) == everything[:5]
+
     def test_empty_nodes(self, tmp_path: Path):
         from hammy.tools.hotspot import compute_hotspots
         assert compute_hotspots([], [], top_n=10) == []
@@ -768,6 +1011,28 @@ class TestHotspotScore:
         assert "getRenew" in result or "processRenewal" in result
         assert "# 1" in result or "#1" in result  # rank indicator
 
+    def test_explorer_tool_caches_output(self, tmp_path: Path, monkeypatch):
+        import hammy.agents.explorer as explorer_module
+        from hammy.agents.explorer import make_explorer_tools
+        from hammy.tools.parser import ParserFactory
+
+        calls = []
+        real = explorer_module.compute_hotspots
+
+        def counting(*args, **kwargs):
+            calls.append(kwargs)
+            return real(*args, **kwargs)
+
+        monkeypatch.setattr(explorer_module, "compute_hotspots", counting)
+        nodes, edges = self._nodes_and_edges()
+        tools = make_explorer_tools(tmp_path, ParserFactory(), nodes, edges)
+        hotspot = next(t for t in tools if t.name == "Hotspot Score")
+        first = hotspot.func(top_n=5)
+        assert hotspot.func(top_n=5) == first
+        assert len(calls) == 1
+        hotspot.func(top_n=5, node_type="function")
+        assert len(calls) == 2
+
 
 class TestHistorianTools:
     def test_creates_tools_with_vcs(self, tmp_path: Path):
@@ -857,6 +1122,17 @@ class TestPRDiff:
             assert getRenew_impact["indexed"] is True
             assert getRenew_impact["caller_count"] >= 1
 
+    def test_analyze_diff_prebuilt_index(self):
+        from hammy.tools.diff_analysis import analyze_diff
+        from hammy.tools.symbol_index import build_symbol_index
+
+        nodes, edges = self._nodes_and_edges()
+        expected = analyze_diff(self.SAMPLE_DIFF, nodes, edges)
+        report = analyze_diff(
+            self.SAMPLE_DIFF, nodes, edges, index=build_symbol_index(nodes, edges)
+        )
+        assert report.impact == expected.impact
+
     def test_analyze_diff_unknown_symbol(self):
         from hammy.tools.diff_analysis import analyze_diff
 
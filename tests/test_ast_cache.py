@@ -0,0 +1,122 @@
+"""Tests for the per-file extracted-symbol cache."""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from hammy.indexer.ast_cache import AstCache, ast_cache_path
+from hammy.tools.parser import ParserFactory
+
+SOURCE = "def foo():\n    bar()\n\ndef bar():\n    pass\n"
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    (tmp_path / "app.py").write_text(SOURCE)
+    return tmp_path
+
+
+class CountingParser(ParserFactory):
+    def __init__(self) -> None:
+        super().__init__(["python"])
+        self.parses = 0
+
+    def parse_bytes(self, source, language):
+        self.parses += 1
+        return super().parse_bytes(source, language)
+
+
+class TestAstCache:
+    def test_extracts_symbols(self, project: Path) -> None:
+        nodes, edges = AstCache(project, ParserFactory(["python"])).extract("app.py")
+        assert {n.name for n in nodes} >= {"foo", "bar"}
+        assert ast_cache_path(project).exists()
+
+    def test_unsupported_file_type(self, project: Path) -> None:
+        (project / "notes.txt").write_text("hello")
+        assert AstCache(project, ParserFactory(["python"])).extract("notes.txt") is None
+
+    def test_hit_skips_parse(self, project: Path) -> None:
+        parser = CountingParser()
+        cache = AstCache(project, parser)
+        first = cache.extract("app.py")
+        second = cache.extract("app.py")
+        assert parser.parses == 1
+        assert first == second
+
+    def test_persists_across_instances(self, project: Path) -> None:
+        first = AstCache(project, CountingParser()).extract("app.py")
+        parser = CountingParser()
+        assert AstCache(project, parser).extract("app.py") == first
+        assert parser.parses == 0
+
+    def test_unreadable_entry_is_reparsed(self, project: Path) -> None:
+        AstCache(project, CountingParser()).extract("app.py")
+        conn = sqlite3.connect(ast_cache_path(project))
+        conn.execute("UPDATE symbols SET payload = ?", ('{"nodes": [{"id": 1}]}',))
+        conn.commit()
+        conn.close()
+        parser = CountingParser()
+        nodes, _ = AstCache(project, parser).extract("app.py")
+        assert parser.parses == 1
+        assert {n.name for n in nodes} >= {"foo", "bar"}
+
+    def test_touched_but_unchanged_file_reuses_entry(self, project: Path) -> None:
+        parser = CountingParser()
+        cache = AstCache(project, parser)
+        cache.extract("app.py")
+        st = (project / "app.py").stat()
+        os.utime(project / "app.py", ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        cache.extract("app.py")
+        assert parser.parses == 1
+
+    def test_changed_file_is_reparsed(self, project: Path) -> None:
+        parser = CountingParser()
+        cache = AstCache(project, parser)
+        cache.extract("app.py")
+        (project / "app.py").write_text(SOURCE + "\ndef baz():\n    pass\n")
+        nodes, _ = cache.extract("app.py")
+        assert parser.parses == 2
+        assert "baz" in {n.name for n in nodes}
+
+    def test_unwritable_cache_falls_back_to_parsing(self, project: Path) -> None:
+        (project / ".hammy").write_text("not a directory")
+        parser = CountingParser()
+        cache = AstCache(project, parser, memory_size=0)
+        assert cache.extract("app.py") is not None
+        assert cache.extract("app.py") is not None
+        assert parser.parses == 2
+
+    def test_memory_hit_skips_database(self, project: Path) -> None:
+        parser = CountingParser()
+        cache = AstCache(project, parser)
+        first = cache.extract("app.py")
+        ast_cache_path(project).unlink()
+        cache._conn = None
+        cache._disabled = True
+        second = cache.extract("app.py")
+        assert second == first
+        assert second[0] is not first[0]
+        assert parser.parses == 1
+
+    def test_memory_is_bounded(self, project: Path) -> None:
+        (project / "other.py").write_text(SOURCE)
+        parser = CountingParser()
+        cache = AstCache(project, parser, memory_size=1)
+        cache.extract("app.py")
+        cache.extract("other.py")
+        assert len(cache._memory) == 1
+
+    def test_extract_many_keeps_order(self, project: Path) -> None:
+        (project / "other.py").write_text("def other():\n    pass\n")
+        (project / "notes.txt").write_text("hello")
+        cache = AstCache(project, ParserFactory(["python"]))
+        results = cache.extract_many(["other.py", "notes.txt", "app.py"])
+        assert [n.name for n in results[0][0]] == ["other"]
+        assert results[1] is None
+        assert {n.name for n in results[2][0]} >= {"foo", "bar"}
+        assert results == [cache.extract(p) for p in ("other.py", "notes.txt", "app.py")]
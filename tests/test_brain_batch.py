@@ -0,0 +1,123 @@
+"""Tests for the batching brain writer."""
+
+from __future__ import annotations
+
+import gc
+import time
+import weakref
+from unittest.mock import MagicMock
+
+from hammy.tools.brain_batch import BatchingBrain, unsaved_warning
+
+
+def _keys(call) -> list[str]:
+    return [e["key"] for e in call.args[0]]
+
+
+class TestBatchingBrain:
+    def test_writes_are_queued(self):
+        qdrant = MagicMock()
+        brain = BatchingBrain(qdrant, max_batch=10, interval=60)
+        brain.upsert_brain_entry("a", "alpha", tags=["t"])
+        brain.upsert_brain_entry("b", "beta")
+        assert brain.pending() == 2
+        qdrant.upsert_brain_entries.assert_not_called()
+        brain.flush()
+        assert _keys(qdrant.upsert_brain_entries.call_args) == ["a", "b"]
+        assert qdrant.upsert_brain_entries.call_args.args[0][0]["tags"] == ["t"]
+        assert brain.pending() == 0
+
+    def test_full_queue_flushes(self):
+        qdrant = MagicMock()
+        brain = BatchingBrain(qdrant, max_batch=2, interval=60)
+        brain.upsert_brain_entry("a", "alpha")
+        brain.upsert_brain_entry("b", "beta")
+        assert qdrant.upsert_brain_entries.call_count == 1
+        assert brain.pending() == 0
+
+    def test_timer_flushes(self):
+        qdrant = MagicMock()
+        brain = BatchingBrain(qdrant, max_batch=10, interval=0.01)
+        brain.upsert_brain_entry("a", "alpha")
+        deadline = time.monotonic() + 2
+        while not qdrant.upsert_brain_entries.called and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert _keys(qdrant.upsert_brain_entries.call_args) == ["a"]
+
+    def test_reads_flush_first(self):
+        qdrant = MagicMock()
+        brain = BatchingBrain(qdrant, max_batch=10, interval=60)
+        brain.upsert_brain_entry("a", "alpha")
+        brain.search_brain(key="a")
+        qdrant.upsert_brain_entries.assert_called_once()
+        qdrant.search_brain.assert_called_once_with("", key="a")
+
+        brain.upsert_brain_entry("b", "beta")
+        brain.list_brain_entries(tag="x")
+        brain.upsert_brain_entry("c", "gamma")
+        brain.delete_brain_entry("c")
+        assert [_keys(c) for c in qdrant.upsert_brain_entries.call_args_list] == [["a"], ["b"], ["c"]]
+        qdrant.delete_brain_entry.assert_called_once_with("c")
+
+    def test_empty_flush_skips_qdrant(self):
+        qdrant = MagicMock()
+        assert BatchingBrain(qdrant).flush() == 0
+        qdrant.upsert_brain_entries.assert_not_called()
+
+    def test_failed_flush_is_kept_and_retried(self, caplog):
+        qdrant = MagicMock()
+        qdrant.upsert_brain_entries.side_effect = RuntimeError("connection refused")
+        brain = BatchingBrain(qdrant, max_batch=10, interval=60)
+        brain.upsert_brain_entry("a", "alpha")
+        assert brain.flush() == 0
+        assert brain.pending() == 1
+        assert brain.unsaved_keys() == ["a"]
+        assert "connection refused" in caplog.text
+        assert "not yet saved" in unsaved_warning(brain)
+
+        qdrant.upsert_brain_entries.side_effect = None
+        qdrant.upsert_brain_entries.return_value = 2
+        brain.upsert_brain_entry("a", "newer")
+        brain.upsert_brain_entry("b", "beta")
+        assert brain.flush() == 2
+        sent = qdrant.upsert_brain_entries.call_args.args[0]
+        assert [(e["key"], e["content"]) for e in sent] == [
+            ("a", "alpha"), ("a", "newer"), ("b", "beta"),
+        ]
+        assert brain.pending() == 0
+        assert brain.unsaved_keys() == []
+        assert unsaved_warning(brain) == ""
+
+    def test_delete_drops_unsaved_entry(self):
+        qdrant = MagicMock()
+        qdrant.upsert_brain_entries.side_effect = RuntimeError("connection refused")
+        brain = BatchingBrain(qdrant, max_batch=10, interval=60)
+        brain.upsert_brain_entry("a", "alpha")
+        brain.upsert_brain_entry("b", "beta")
+        brain.delete_brain_entry("a")
+        assert brain.unsaved_keys() == ["b"]
+        assert brain.pending() == 1
+
+    def test_no_warning_for_unbatched_brain(self):
+        assert unsaved_warning(MagicMock()) == ""
+
+    def test_failed_flush_is_retried_without_further_calls(self, monkeypatch):
+        import hammy.tools.brain_batch as brain_batch
+
+        monkeypatch.setattr(brain_batch, "_MIN_RETRY_DELAY", 0.01)
+        qdrant = MagicMock()
+        qdrant.upsert_brain_entries.side_effect = [RuntimeError("connection refused"), 1]
+        brain = BatchingBrain(qdrant, max_batch=10, interval=0.01)
+        brain.upsert_brain_entry("a", "alpha")
+        brain.flush()
+        deadline = time.monotonic() + 2
+        while qdrant.upsert_brain_entries.call_count < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert qdrant.upsert_brain_entries.call_count == 2
+        assert brain.pending() == 0
+        assert brain.unsaved_keys() == []
+
+    def test_exit_hook_keeps_no_instance_alive(self):
+        ref = weakref.ref(BatchingBrain(MagicMock()))
+        gc.collect()
+        assert ref() is None
@@ -59,3 +59,34 @@ class TestStatus:
         result = runner.invoke(app, ["status", str(tmp_path)])
         assert result.exit_code == 0
         assert "Project root" in result.output
+
+
+class TestKeywordMatches:
+    def _node(self, name: str, summary: str = ""):
+        from hammy.schema.models import Location, Node, NodeType
+
+        return Node(
+            id=Node.make_id("app.py", name),
+            type=NodeType.FUNCTION,
+            name=name,
+            loc=Location(file="app.py", lines=(1, 2)),
+            language="python",
+            summary=summary,
+        )
+
+    def test_matches_name_or_summary_substrings(self):
+        from hammy.cli import _keyword_matches
+
+        nodes = [
+            self._node("processPayment"),
+            self._node("renew", "Charges the Card on file"),
+            self._node("unrelated"),
+        ]
+        matched = _keyword_matches(nodes, "Payment card", limit=20)
+        assert [n.name for n in matched] == ["processPayment", "renew"]
+
+    def test_stops_at_limit(self):
+        from hammy.cli import _keyword_matches
+
+        nodes = [self._node(f"pay{i}") for i in range(5)]
+        assert len(_keyword_matches(nodes, "pay", limit=3)) == 3
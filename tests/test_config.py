@@ -0,0 +1,64 @@
+"""Tests for configuration loading."""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+from pydantic import ValidationError
+
+from hammy.config import HammyConfig, ParsingConfig, load_yaml
+
+
+class TestLoadYaml:
+    def test_reuses_parse_until_mtime_changes(self, tmp_path):
+        path = tmp_path / "agents.yaml"
+        path.write_text("explorer:\n  llm: gpt-4o\n")
+        assert load_yaml(path) == {"explorer": {"llm": "gpt-4o"}}
+
+        path.write_text("explorer:\n  llm: claude\n")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert load_yaml(path) == {"explorer": {"llm": "claude"}}
+
+    def test_returns_a_copy(self, tmp_path):
+        path = tmp_path / "agents.yaml"
+        path.write_text("explorer:\n  llm: gpt-4o\n")
+        load_yaml(path)["explorer"]["llm"] = None
+        assert load_yaml(path)["explorer"]["llm"] == "gpt-4o"
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / "hammy.yaml"
+        path.write_text("")
+        assert load_yaml(path) == {}
+        assert HammyConfig.from_yaml(path) == HammyConfig()
+
+    def test_relative_path_follows_working_directory(self, tmp_path, monkeypatch):
+        from pathlib import Path
+
+        for name, llm in (("a", "gpt-4o"), ("b", "claude")):
+            (tmp_path / name).mkdir()
+            path = tmp_path / name / "agents.yaml"
+            path.write_text(f"explorer:\n  llm: {llm}\n")
+            os.utime(path, ns=(0, 1_000_000_000))
+
+        monkeypatch.chdir(tmp_path / "a")
+        assert load_yaml(Path("agents.yaml"))["explorer"]["llm"] == "gpt-4o"
+        monkeypatch.chdir(tmp_path / "b")
+        assert load_yaml(Path("agents.yaml"))["explorer"]["llm"] == "claude"
+
+    def test_uses_libyaml_loader_when_available(self):
+        import yaml
+
+        from hammy import config
+
+        if yaml.__with_libyaml__:
+            assert config._SafeLoader is yaml.CSafeLoader
+        else:
+            assert config._SafeLoader is yaml.SafeLoader
+
+
+class TestParsingConfig:
+    def test_negative_workers_rejected(self):
+        with pytest.raises(ValidationError):
+            ParsingConfig(workers=-1)
@@ -7,9 +7,11 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import pytest
+from pydantic import ValidationError
 
 from hammy.config import EnrichmentConfig
 from hammy.indexer.enricher import (
@@ -90,6 +92,37 @@ class TestGetCodeSnippet:
         snippet = get_code_snippet(node, project_dir)
         assert "UserService" in snippet
 
+    def test_snippets_by_file_reads_each_file_once(self, project_dir, monkeypatch):
+        import builtins
+
+        from hammy.indexer import enricher
+
+        nodes = [
+            _make_node("process_payment", lines=(1, 4)),
+            _make_node("missing", file="src/missing.py"),
+            _make_node("UserService", ntype=NodeType.CLASS, lines=(6, 8)),
+            _make_node("get_user", ntype=NodeType.METHOD, lines=(7, 8)),
+        ]
+        expected = [get_code_snippet(n, project_dir) for n in nodes]
+
+        opened = []
+
+        def counting_open(path, *args, **kwargs):
+            opened.append(str(path))
+            return builtins.open(path, *args, **kwargs)
+
+        monkeypatch.setattr(enricher, "open", counting_open, raising=False)
+        assert enricher._snippets_by_file(nodes, project_dir) == expected
+        assert sorted(opened) == sorted(
+            str(project_dir / f) for f in ("src/example.py", "src/missing.py")
+        )
+
+    def test_truncation_counts_only_lines_in_the_file(self, tmp_path):
+        (tmp_path / "short.py").write_text("".join(f"x_{i} = {i}\n" for i in range(15)))
+        node = _make_node("short", file="short.py", lines=(3, 100))
+        snippet = get_code_snippet(node, tmp_path, max_lines=10)
+        assert snippet.splitlines() == [f"x_{i} = {i}" for i in range(2, 12)] + ["... (3 more lines)"]
+
 
 # ---------------------------------------------------------------------------
 # _parse_summaries
@@ -292,3 +325,408 @@ class TestEnrichNodes:
         count, errors = enrich_nodes(nodes, project_dir, config)
         assert count == 0
         assert any("openai" in e.lower() or "anthropic" in e.lower() for e in errors)
+
+
+class TestConcurrentEnrichment:
+    def test_batches_run_concurrently(self, project_dir, monkeypatch):
+        import threading
+        import time
+
+        from hammy.indexer import enricher
+
+        nodes = [_make_node(f"fn_{i}", file="src/example.py", lines=(1, 2)) for i in range(6)]
+        config = EnrichmentConfig(batch_size=2, concurrency=3, skip_if_summary=False)
+
+        lock = threading.Lock()
+        in_flight = 0
+        peak = 0
+
+        def fake_summarize(items, model, api_key=None, api_base=None):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.05)
+            with lock:
+                in_flight -= 1
+            return [f"Summary of {node.name}." for node, _ in items]
+
+        monkeypatch.setattr(enricher, "_summarize_batch_litellm", fake_summarize)
+        progress = []
+        count, errors = enrich_nodes(
+            nodes, project_dir, config, progress_callback=lambda d, t: progress.append((d, t))
+        )
+
+        assert count == 6 and errors == []
+        assert all(n.summary == f"Summary of {n.name}." for n in nodes)
+        assert peak > 1
+        assert [d for d, _ in progress] == [2, 4, 6]
+
+    def test_errors_reported_in_batch_order(self, project_dir, monkeypatch):
+        from hammy.indexer import enricher
+
+        nodes = [_make_node(f"fn_{i}", file="src/example.py", lines=(1, 2)) for i in range(4)]
+        config = EnrichmentConfig(batch_size=1, concurrency=4, skip_if_summary=False)
+
+        def fake_summarize(items, model, api_key=None, api_base=None):
+            if items[0][0].name in ("fn_1", "fn_3"):
+                raise RuntimeError(f"failed {items[0][0].name}")
+            return ["Fine."]
+
+        monkeypatch.setattr(enricher, "_summarize_batch_litellm", fake_summarize)
+        count, errors = enrich_nodes(nodes, project_dir, config)
+
+        assert count == 2
+        assert errors == ["Batch 2: failed fn_1", "Batch 4: failed fn_3"]
+
+
+class TestSummaryCache:
+    def _run(self, project_dir, monkeypatch, names, config=None):
+        from hammy.indexer import enricher
+
+        calls: list[str] = []
+
+        def fake_summarize(items, model, api_key=None, api_base=None):
+            calls.extend(node.name for node, _ in items)
+            return [f"Summary of {node.name}." for node, _ in items]
+
+        monkeypatch.setattr(enricher, "_summarize_batch_litellm", fake_summarize)
+        nodes = [_make_node(name, lines=(1, 4)) for name in names]
+        count, errors = enrich_nodes(nodes, project_dir, config or EnrichmentConfig())
+        assert errors == []
+        return nodes, count, calls
+
+    def test_unchanged_symbols_skip_the_llm(self, project_dir, monkeypatch):
+        from hammy.indexer.summary_cache import summary_cache_path
+
+        _, _, calls = self._run(project_dir, monkeypatch, ["a", "b"])
+        assert calls == ["a", "b"]
+        assert summary_cache_path(project_dir).exists()
+
+        nodes, count, calls = self._run(project_dir, monkeypatch, ["a", "b", "c"])
+        assert calls == ["c"]
+        assert count == 3
+        assert [n.summary for n in nodes] == ["Summary of a.", "Summary of b.", "Summary of c."]
+
+    def test_changed_source_misses(self, project_dir, monkeypatch):
+        self._run(project_dir, monkeypatch, ["a"])
+        source = project_dir / "src" / "example.py"
+        source.write_text(source.read_text().replace("1.02", "1.03"))
+
+        _, _, calls = self._run(project_dir, monkeypatch, ["a"])
+        assert calls == ["a"]
+
+    def test_model_is_part_of_the_key(self, project_dir, monkeypatch):
+        self._run(project_dir, monkeypatch, ["a"])
+        _, _, calls = self._run(
+            project_dir, monkeypatch, ["a"], EnrichmentConfig(model="other-model")
+        )
+        assert calls == ["a"]
+
+    def test_disabled(self, project_dir, monkeypatch):
+        from hammy.indexer.summary_cache import summary_cache_path
+
+        config = EnrichmentConfig(cache=False)
+        self._run(project_dir, monkeypatch, ["a"], config)
+        _, _, calls = self._run(project_dir, monkeypatch, ["a"], config)
+        assert calls == ["a"]
+        assert not summary_cache_path(project_dir).exists()
+
+    def test_fuzzy_cache_ignores_formatting(self, project_dir, monkeypatch):
+        config = EnrichmentConfig(fuzzy_cache=True)
+        self._run(project_dir, monkeypatch, ["a"], config)
+        source = project_dir / "src" / "example.py"
+        source.write_text(
+            source.read_text().replace("charge = amount * 1.02", "charge  =  amount * 1.02  ")
+        )
+
+        _, _, calls = self._run(project_dir, monkeypatch, ["a"], config)
+        assert calls == []
+        _, _, calls = self._run(project_dir, monkeypatch, ["a"])
+        assert calls == ["a"]
+
+
+class TestNormalizeSnippet:
+    def test_python(self):
+        from hammy.indexer.enricher import _normalize_snippet
+
+        snippet = "def f(x):\n    # double it\n\n    return   x * 2  # inline\n"
+        assert _normalize_snippet(snippet, "python") == "def f(x):\nreturn x * 2 # inline"
+
+    def test_c_style(self):
+        from hammy.indexer.enricher import _normalize_snippet
+
+        snippet = "/**\n * Doubles.\n */\nfunction f(x) {\n  // twice\n  return x * 2;\n}"
+        assert _normalize_snippet(snippet, "javascript") == "function f(x) {\nreturn x * 2;\n}"
+
+
+class TestRateLimiting:
+    def _rate_limit_error(self):
+        import litellm
+
+        return litellm.RateLimitError("slow down", llm_provider="anthropic", model="m")
+
+    def test_rate_limited_call_is_retried(self, project_dir, monkeypatch):
+        from hammy.indexer import enricher
+
+        monkeypatch.setattr(enricher, "_RETRY_BASE_DELAY", 0)
+        attempts = []
+
+        def fake_summarize(items, model, api_key=None, api_base=None):
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise self._rate_limit_error()
+            return ["Fine."]
+
+        monkeypatch.setattr(enricher, "_summarize_batch_litellm", fake_summarize)
+        nodes = [_make_node("fn")]
+        count, errors = enrich_nodes(nodes, project_dir, EnrichmentConfig(cache=False))
+
+        assert (count, errors, len(attempts)) == (1, [], 3)
+
+    def test_gives_up_after_max_retries(self, project_dir, monkeypatch):
+        from hammy.indexer import enricher
+
+        monkeypatch.setattr(enricher, "_RETRY_BASE_DELAY", 0)
+        attempts = []
+
+        def fake_summarize(items, model, api_key=None, api_base=None):
+            attempts.append(1)
+            raise self._rate_limit_error()
+
+        monkeypatch.setattr(enricher, "_summarize_batch_litellm", fake_summarize)
+        config = EnrichmentConfig(cache=False, max_retries=2)
+        count, errors = enrich_nodes([_make_node("fn")], project_dir, config)
+
+        assert count == 0 and len(errors) == 1
+        assert len(attempts) == 3
+
+    def test_limiter_spaces_calls(self):
+        import time
+
+        from hammy.indexer.enricher import _RateLimiter
+
+        limiter = _RateLimiter(rate=100, burst=2)
+        start = time.monotonic()
+        for _ in range(6):
+            limiter.acquire()
+        # Two from the burst, then four at 10 ms intervals
+        assert time.monotonic() - start >= 0.035
+
+
+class TestBatchMode:
+    """Batch API calls are faked at the litellm functions llm_batch uses."""
+
+    @pytest.fixture
+    def fake_api(self, monkeypatch):
+        from hammy.indexer import llm_batch
+
+        state = {
+            "files": {}, "batches": {}, "submitted": 0, "retrieve_error": None,
+            "status": "completed",
+        }
+
+        def create_file(file, purpose, custom_llm_provider, **kwargs):
+            file_id = f"file-{len(state['files'])}"
+            state["files"][file_id] = file[1].decode()
+            return SimpleNamespace(id=file_id)
+
+        def create_batch(completion_window, endpoint, input_file_id, custom_llm_provider, **kwargs):
+            state["submitted"] += 1
+            output = []
+            for line in state["files"][input_file_id].splitlines():
+                request = json.loads(line)
+                prompt = request["body"]["messages"][1]["content"]
+                n = int(prompt.split("exactly ")[1].split(" ")[0])
+                body = {"choices": [{"message": {"content": json.dumps([f"S{i}" for i in range(n)])}}]}
+                output.append(json.dumps({
+                    "custom_id": request["custom_id"],
+                    "response": {"status_code": 200, "body": body},
+                }))
+            out_id = f"file-{len(state['files'])}"
+            state["files"][out_id] = "\n".join(output)
+            batch_id = f"batch-{len(state['batches'])}"
+            state["batches"][batch_id] = out_id
+            return SimpleNamespace(id=batch_id)
+
+        def retrieve_batch(batch_id, custom_llm_provider, **kwargs):
+            if state["retrieve_error"]:
+                raise state["retrieve_error"]
+            return SimpleNamespace(status=state["status"], output_file_id=state["batches"][batch_id])
+
+        def file_content(file_id, custom_llm_provider, **kwargs):
+            return SimpleNamespace(text=state["files"][file_id])
+
+        for name, fn in [
+            ("create_file", create_file),
+            ("create_batch", create_batch),
+            ("retrieve_batch", retrieve_batch),
+            ("file_content", file_content),
+        ]:
+            monkeypatch.setattr(llm_batch.litellm, name, fn)
+        return state
+
+    def _no_online_calls(self, monkeypatch):
+        from hammy.indexer import enricher
+
+        def fail(*args, **kwargs):
+            raise AssertionError("online call in batch mode")
+
+        monkeypatch.setattr(enricher, "_summarize_batch_litellm", fail)
+
+    def test_summaries_come_from_the_batch(self, project_dir, monkeypatch, fake_api):
+        from hammy.indexer.llm_batch import pending_batches_path
+
+        self._no_online_calls(monkeypatch)
+        nodes = [_make_node(f"fn_{i}", lines=(1, 4)) for i in range(3)]
+        config = EnrichmentConfig(mode="batch", batch_size=2, batch_timeout=60)
+
+        count, errors = enrich_nodes(nodes, project_dir, config)
+
+        assert (count, errors) == (3, [])
+        assert [n.summary for n in nodes] == ["S0", "S1", "S0"]
+        assert fake_api["submitted"] == 1
+        assert not pending_batches_path(project_dir).exists()
+
+    def test_unfinished_job_is_collected_next_run(self, project_dir, monkeypatch, fake_api):
+        from hammy.indexer.llm_batch import load_pending
+
+        self._no_online_calls(monkeypatch)
+        config = EnrichmentConfig(mode="batch")
+        fake_api["status"] = "in_progress"
+        still_running = "Batch batch-0 is still running; a later run will collect its summaries"
+
+        nodes = [_make_node("fn", lines=(1, 4))]
+        count, errors = enrich_nodes(nodes, project_dir, config)
+        assert count == 0 and errors == [still_running]
+        assert [job.batch_id for job in load_pending(project_dir)] == ["batch-0"]
+
+        # Not resubmitted while the job runs
+        nodes = [_make_node("fn", lines=(1, 4))]
+        assert enrich_nodes(nodes, project_dir, config) == (0, [still_running])
+        assert fake_api["submitted"] == 1
+
+        fake_api["status"] = "completed"
+        nodes = [_make_node("fn", lines=(1, 4))]
+        count, errors = enrich_nodes(nodes, project_dir, config)
+        assert (count, errors) == (1, [])
+        assert nodes[0].summary == "S0"
+        assert fake_api["submitted"] == 1
+        assert load_pending(project_dir) == []
+
+    def test_status_check_errors_are_retried(self, project_dir, monkeypatch, fake_api):
+        from hammy.indexer import llm_batch
+
+        calls = []
+
+        def flaky(batch_id, custom_llm_provider, **kwargs):
+            calls.append(batch_id)
+            if len(calls) == 1:
+                raise RuntimeError("connection reset")
+            return SimpleNamespace(status="completed", output_file_id=fake_api["batches"][batch_id])
+
+        monkeypatch.setattr(llm_batch.litellm, "retrieve_batch", flaky)
+        self._no_online_calls(monkeypatch)
+        config = EnrichmentConfig(mode="batch", batch_poll_interval=0, batch_timeout=60)
+
+        nodes = [_make_node("fn", lines=(1, 4))]
+        assert enrich_nodes(nodes, project_dir, config) == (1, [])
+        assert len(calls) == 2
+
+    def test_failed_job_is_dropped_and_enriched_online(
+        self, project_dir, monkeypatch, fake_api
+    ):
+        from hammy.indexer import enricher, llm_batch
+
+        monkeypatch.setattr(
+            llm_batch.litellm, "retrieve_batch",
+            lambda batch_id, custom_llm_provider, **kwargs: SimpleNamespace(
+                status="failed", output_file_id=None
+            ),
+        )
+        monkeypatch.setattr(
+            enricher, "_summarize_batch_litellm", lambda items, *a, **k: ["Online."] * len(items)
+        )
+        config = EnrichmentConfig(mode="batch", batch_timeout=60)
+
+        nodes = [_make_node("fn", lines=(1, 4))]
+        count, errors = enrich_nodes(nodes, project_dir, config)
+        assert count == 1 and nodes[0].summary == "Online."
+        assert errors == [
+            "Batch batch-0 ended with status 'failed' and no output; enriching online"
+        ]
+        assert llm_batch.load_pending(project_dir) == []
+        assert not llm_batch.pending_batches_path(project_dir).exists()
+
+    def test_failed_pending_job_is_dropped(self, project_dir, monkeypatch, fake_api):
+        from hammy.indexer import llm_batch
+
+        self._no_online_calls(monkeypatch)
+        config = EnrichmentConfig(mode="batch")
+        fake_api["status"] = "in_progress"
+        enrich_nodes([_make_node("fn", lines=(1, 4))], project_dir, config)
+        assert len(llm_batch.load_pending(project_dir)) == 1
+
+        monkeypatch.setattr(
+            llm_batch.litellm, "retrieve_batch",
+            lambda batch_id, custom_llm_provider, **kwargs: SimpleNamespace(
+                status="expired", output_file_id=None
+            ),
+        )
+        nodes = [_make_node("other", lines=(5, 8))]
+        count, errors = enrich_nodes(nodes, project_dir, config)
+        assert errors[0] == (
+            "Pending batch batch-0: Batch batch-0 ended with status 'expired' and no output"
+        )
+        assert not llm_batch.pending_batches_path(project_dir).exists()
+
+    def test_batch_mode_requires_cache(self):
+        with pytest.raises(ValidationError):
+            EnrichmentConfig(mode="batch", cache=False)
+
+    def test_falls_back_online_when_submission_fails(self, project_dir, monkeypatch, fake_api):
+        from hammy.indexer import enricher, llm_batch
+
+        def unsupported(*args, **kwargs):
+            raise ValueError("no batch support")
+
+        monkeypatch.setattr(llm_batch.litellm, "create_batch", unsupported)
+        monkeypatch.setattr(
+            enricher, "_summarize_batch_litellm", lambda items, *a, **k: ["Online."] * len(items)
+        )
+        nodes = [_make_node("fn", lines=(1, 4))]
+        count, errors = enrich_nodes(nodes, project_dir, EnrichmentConfig(mode="batch"))
+
+        assert count == 1 and nodes[0].summary == "Online."
+        assert errors == ["Batch API unavailable (no batch support); enriching online"]
+
+
+class TestPromptPrefix:
+    def _sent_messages(self, monkeypatch, model):
+        from hammy.indexer import enricher
+
+        sent = {}
+
+        def completion(**kwargs):
+            sent.update(kwargs)
+            message = SimpleNamespace(content='["Does things."]')
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+        monkeypatch.setattr(enricher.litellm, "completion", completion)
+        enricher._summarize_batch_litellm([(_make_node("fn"), "def fn(): pass")], model)
+        return sent["messages"]
+
+    def test_system_prompt_marked_cacheable_for_anthropic(self, monkeypatch):
+        from hammy.indexer.enricher import _SYSTEM_PROMPT
+
+        system, user = self._sent_messages(monkeypatch, "anthropic/claude-haiku-4-5-20251001")
+        assert system["content"] == [
+            {"type": "text", "text": _SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}
+        ]
+        assert user["content"].startswith("Return a JSON array with exactly 1 strings")
+
+    def test_plain_system_prompt_for_other_providers(self, monkeypatch):
+        from hammy.indexer.enricher import _SYSTEM_PROMPT
+
+        system, _ = self._sent_messages(monkeypatch, "openai/gpt-4o-mini")
+        assert system["content"] == _SYSTEM_PROMPT
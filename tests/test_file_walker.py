@@ -119,3 +119,58 @@ class TestWalkProject:
         # Should include non-code files like CSS and MD
         assert "styles.css" in names
         assert "README.md" in names
+
+    def test_rel_path_matches_path(self, project_dir: Path):
+        manager = IgnoreManager(project_dir)
+        for f in walk_project(project_dir, manager):
+            assert f.rel_path == str(f.path.relative_to(project_dir.resolve()))
+
+    def test_does_not_stat_for_ignore_checks(self, project_dir: Path, monkeypatch):
+        manager = IgnoreManager(project_dir)
+
+        def no_stat(self):
+            raise AssertionError("is_dir() should not be called")
+
+        monkeypatch.setattr(Path, "is_dir", no_stat)
+        names = [f.path.name for f in walk_project(project_dir, manager)]
+        assert "User.php" in names
+
+    def test_subdirectory_uses_manager_root_patterns(self, project_dir: Path):
+        (project_dir / ".gitignore").write_text("src/models/\n")
+        manager = IgnoreManager(project_dir)
+        files = list(walk_project(project_dir / "src", manager))
+        rel_paths = [f.rel_path for f in files]
+        assert "api.js" in rel_paths
+        assert not any(p.startswith("models") for p in rel_paths)
+
+    def test_order_matches_sorted_os_walk(self, project_dir: Path):
+        import os
+
+        for name in ("b", "a/z", "a/c"):
+            (project_dir / "src" / name).mkdir(parents=True)
+            (project_dir / "src" / name / "f.py").write_text("x = 1\n")
+        manager = IgnoreManager(project_dir)
+        root = project_dir.resolve()
+
+        expected = []
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = sorted(d for d in dirnames if d not in ("vendor", "node_modules"))
+            for filename in sorted(filenames):
+                rel = os.path.relpath(os.path.join(dirpath, filename), root)
+                if filename != "huge.js":
+                    expected.append(rel)
+
+        assert [f.rel_path for f in walk_project(project_dir, manager)] == expected
+
+    def test_symlinked_directories_not_followed(self, project_dir: Path):
+        (project_dir / "link").symlink_to(project_dir / "src", target_is_directory=True)
+        manager = IgnoreManager(project_dir)
+        rel_paths = [f.rel_path for f in walk_project(project_dir, manager)]
+        assert not any(p.startswith("link") for p in rel_paths)
+
+    def test_stopping_early(self, project_dir: Path):
+        manager = IgnoreManager(project_dir)
+        walk = walk_project(project_dir, manager)
+        first = next(walk)
+        walk.close()
+        assert first.rel_path == next(walk_project(project_dir, manager)).rel_path
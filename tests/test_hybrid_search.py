@@ -8,7 +8,7 @@ from unittest.mock import MagicMock
 import pytest
 
 from hammy.schema.models import Location, Node, NodeMeta, NodeType
-from hammy.tools.hybrid_search import _rrf, _tokenize, hybrid_search
+from hammy.tools.hybrid_search import _rrf, _tokenize, build_bm25_index, hybrid_search
 
 
 def _make_node(
@@ -174,6 +174,35 @@ class TestHybridSearch:
         assert results == []
 
 
+class TestBM25Index:
+    def _nodes(self):
+        return [
+            _make_node("processPayment", summary="handles payment processing", file="a.py"),
+            _make_node("refundPayment", summary="reverses a payment", file="b.php", language="php"),
+            _make_node("getUser", summary="fetches user by id", file="c.py"),
+        ]
+
+    def test_matches_unindexed_search(self):
+        nodes = self._nodes()
+        idx = build_bm25_index(nodes)
+        for language in (None, "python", "php"):
+            assert hybrid_search("payment", nodes, bm25_index=idx, language=language) == (
+                hybrid_search("payment", nodes, language=language)
+            )
+
+    def test_scorer_reused_per_filter(self):
+        idx = build_bm25_index(self._nodes())
+        positions, bm25 = idx.scorer("python", None)
+        assert positions == [0, 2]
+        assert idx.scorer("python", None)[1] is bm25
+        assert idx.scorer(None, None)[1] is not bm25
+
+    def test_scorer_for_empty_filter(self):
+        idx = build_bm25_index(self._nodes())
+        assert idx.scorer("go", None) == ([], None)
+        assert hybrid_search("payment", [], bm25_index=idx, language="go") == []
+
+
 # ---------------------------------------------------------------------------
 # Integration via explorer tool
 # ---------------------------------------------------------------------------
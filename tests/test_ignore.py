@@ -65,6 +65,36 @@ class TestGitignore:
         manager = IgnoreManager(project_dir)
         assert manager.is_ignored(project_dir / "debug.log")
 
+    def test_negation_can_reinclude_a_default(self, project_dir: Path):
+        (project_dir / ".gitignore").write_text("!vendor/lib.php\n")
+
+        manager = IgnoreManager(project_dir)
+        assert not manager.is_ignored(project_dir / "vendor" / "lib.php")
+        assert manager.is_ignored(project_dir / "node_modules" / "pkg.js")
+
+    def test_repeated_patterns_are_compiled_once(self, project_dir: Path):
+        (project_dir / ".gitignore").write_text("node_modules/\n__pycache__/\n")
+        (project_dir / ".hammyignore").write_text("node_modules/\n")
+
+        manager = IgnoreManager(project_dir)
+        assert manager._project_spec is None
+        assert manager.is_ignored(Path("node_modules"), is_dir=True)
+
+    def test_repeated_pattern_after_negation_still_applies(self, project_dir: Path):
+        (project_dir / ".gitignore").write_text("*.log\n!keep.log\n*.log\n")
+
+        manager = IgnoreManager(project_dir)
+        assert manager.is_ignored(Path("keep.log"))
+
+    def test_directory_pattern_matches_with_trailing_slash(self, project_dir: Path):
+        (project_dir / ".gitignore").write_text("tmp/\n")
+        (project_dir / "tmp").mkdir()
+
+        manager = IgnoreManager(project_dir)
+        assert manager.is_ignored(project_dir / "tmp")
+        assert manager.is_ignored(Path("tmp"), is_dir=True)
+        assert not manager.is_ignored(Path("tmp"))
+
     def test_gitignore_disabled(self, project_dir: Path):
         (project_dir / ".gitignore").write_text("*.log\n")
         (project_dir / "debug.log").write_text("log data")
@@ -138,3 +168,22 @@ class TestFilterPaths:
         manager = IgnoreManager(project_dir)
         assert manager.is_ignored(Path("vendor/lib.php"))
         assert not manager.is_ignored(Path("src/app.php"))
+
+    def test_repeated_lookups_are_cached(self, project_dir: Path):
+        manager = IgnoreManager(project_dir)
+        for _ in range(3):
+            assert manager.is_ignored(project_dir / "vendor" / "lib.php")
+        info = manager._match_cached.cache_info()
+        assert (info.misses, info.hits) == (1, 2)
+
+    def test_explicit_is_dir_skips_filesystem_check(self, project_dir: Path, monkeypatch):
+        (project_dir / ".gitignore").write_text("tmp/\n")
+        (project_dir / "tmp").mkdir()
+        manager = IgnoreManager(project_dir)
+
+        def no_stat(self):
+            raise AssertionError("is_dir() should not be called")
+
+        monkeypatch.setattr(Path, "is_dir", no_stat)
+        assert manager.is_ignored(project_dir / "tmp", is_dir=True)
+        assert not manager.is_ignored(project_dir / "tmp", is_dir=False)
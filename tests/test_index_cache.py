@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import gc
 from pathlib import Path
 
 import pytest
@@ -79,6 +80,27 @@ class TestSaveAndLoad:
         assert len(nodes) == 2
         assert {n.name for n in nodes} == {"new1", "new2"}
 
+    def test_load_restores_gc_state(self, tmp_path: Path) -> None:
+        save_index(tmp_path, [_make_node("foo")], [])
+        load_index(tmp_path, pause_gc=True)
+        assert gc.isenabled()
+
+        gc.disable()
+        try:
+            load_index(tmp_path, pause_gc=True)
+            assert not gc.isenabled()
+        finally:
+            gc.enable()
+
+    def test_gc_left_alone_by_default(self, tmp_path: Path, monkeypatch) -> None:
+        save_index(tmp_path, [_make_node("foo")], [])
+
+        def fail():
+            raise AssertionError("gc.disable() called")
+
+        monkeypatch.setattr(gc, "disable", fail)
+        assert load_index(tmp_path) is not None
+
 
 class TestLoadMissing:
     def test_returns_none_when_no_cache(self, tmp_path: Path) -> None:
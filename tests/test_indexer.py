@@ -199,6 +199,20 @@ class TestBrain:
         assert len(results) == 1
         assert results[0]["content"] == "second content"
 
+    def test_bulk_upsert(self, qdrant: QdrantManager):
+        qdrant.upsert_brain_entry("kept", "original", tags=["old"])
+        created = qdrant.search_brain(key="kept")[0]["created_at"]
+        count = qdrant.upsert_brain_entries([
+            {"key": "kept", "content": "first"},
+            {"key": "new", "content": "new content", "tags": ["sprint-1"]},
+            {"key": "kept", "content": "second"},
+        ])
+        assert count == 2
+        kept = qdrant.search_brain(key="kept")[0]
+        assert kept["content"] == "second"
+        assert kept["created_at"] == created
+        assert qdrant.search_brain(key="new")[0]["tags"] == ["sprint-1"]
+
     def test_semantic_search(self, qdrant: QdrantManager):
         qdrant.upsert_brain_entry("payment-research", "The payment flow uses Stripe for billing.", tags=["payment"])
         qdrant.upsert_brain_entry("auth-research", "JWT tokens are verified in middleware.", tags=["auth"])
@@ -289,6 +303,137 @@ class TestCodeIndexer:
         assert result.nodes_indexed == 0  # Nothing stored
 
 
+class TestParallelIndexing:
+    def _project(self, root: Path) -> Path:
+        for i in range(40):
+            (root / f"mod{i}.py").write_text(f"def f{i}(a):\n    return g{i}(a)\n")
+        (root / "notes.txt").write_text("not code")
+        (root / "broken.py").write_text("def broken(:\n")
+        return root
+
+    def test_workers_match_in_process_indexing(self, tmp_path: Path, monkeypatch):
+        import hammy.indexer.code_indexer as code_indexer
+
+        monkeypatch.setattr(code_indexer, "PARALLEL_MIN_FILES", 1)
+        monkeypatch.setattr(code_indexer, "_CHUNKSIZE", 4)
+        root = self._project(tmp_path)
+
+        def run(workers: int):
+            config = HammyConfig(parsing=ParsingConfig(languages=["python"], workers=workers))
+            config.project.root = str(root)
+            return code_indexer.index_codebase(config, store_in_qdrant=False)
+
+        serial = run(1)
+        parallel = run(3)
+        assert parallel == serial
+        assert serial[0].files_processed == 41
+        assert {n.name for n in serial[1]} >= {"f0", "f39"}
+
+
+class TestBatchedUpsert:
+    def test_nodes_are_upserted_in_batches(self, tmp_path: Path):
+        from hammy.indexer.code_indexer import index_codebase
+
+        for i in range(10):
+            (tmp_path / f"mod{i}.py").write_text(f"def f{i}():\n    pass\n")
+
+        class FakeQdrant:
+            def __init__(self):
+                self.batches: list[int] = []
+                self.ensured = 0
+
+            def ensure_collections(self):
+                self.ensured += 1
+
+            def upsert_nodes(self, nodes):
+                self.batches.append(len(nodes))
+                return len(nodes)
+
+        config = HammyConfig(parsing=ParsingConfig(languages=["python"], workers=1))
+        config.project.root = str(tmp_path)
+        fake = FakeQdrant()
+        result, nodes, _ = index_codebase(config, qdrant=fake, batch_size=4)
+
+        assert sum(fake.batches) == len(nodes) == result.nodes_indexed
+        assert all(size >= 4 for size in fake.batches[:-1])
+        assert len(fake.batches) > 1
+        assert fake.ensured == 1
+
+    def test_only_enriched_nodes_are_upserted_again(self, tmp_path: Path, monkeypatch):
+        from hammy.indexer import enricher
+        from hammy.indexer.code_indexer import index_codebase
+
+        for i in range(3):
+            (tmp_path / f"mod{i}.py").write_text(f"def f{i}():\n    pass\n")
+
+        def fake_enrich(nodes, project_root, config, progress_callback=None):
+            target = next(n for n in nodes if n.name == "f1")
+            target.summary = "Does f1 things."
+            return 1, []
+
+        monkeypatch.setattr(enricher, "enrich_nodes", fake_enrich)
+
+        upserts: list[list[str]] = []
+
+        class FakeQdrant:
+            def ensure_collections(self):
+                pass
+
+            def upsert_nodes(self, nodes):
+                upserts.append([n.name for n in nodes])
+                return len(nodes)
+
+        config = HammyConfig(parsing=ParsingConfig(languages=["python"], workers=1))
+        config.project.root = str(tmp_path)
+        result, _, _ = index_codebase(config, qdrant=FakeQdrant(), enrich=True)
+
+        assert result.nodes_enriched == 1
+        assert upserts[-1] == ["f1"]
+
+
+class TestUpsertCommitsStreaming:
+    def test_generator_is_consumed_in_batches(self):
+        import numpy as np
+        from qdrant_client import QdrantClient
+
+        class FakeModel:
+            def encode(self, texts):
+                return np.ones((len(texts), 4), dtype=np.float32)
+
+        manager = QdrantManager.__new__(QdrantManager)
+        manager._client = QdrantClient(":memory:")
+        manager._prefix = "test_stream"
+        manager._model = FakeModel()
+        manager._embedding_dim = 4
+        manager.BATCH_SIZE = 2
+        manager.ensure_collections()
+
+        pulled: list[int] = []
+
+        def commits():
+            for i in range(5):
+                pulled.append(i)
+                yield {
+                    "revision": f"r{i}",
+                    "author": "Dan",
+                    "date": "2025-01-01T00:00:00",
+                    "message": f"change {i}",
+                }
+
+        upserts: list[int] = []
+        upsert = manager._client.upsert
+
+        def counting_upsert(**kwargs):
+            upserts.append(len(pulled))
+            return upsert(**kwargs)
+
+        manager._client.upsert = counting_upsert
+        assert manager.upsert_commits(commits()) == 5
+        # Each batch is written before the next is pulled from the generator
+        assert upserts == [2, 4, 5]
+        assert manager.get_stats()["commits"] == 5
+
+
 @requires_qdrant
 class TestCommitIndexer:
     def test_index_commits(self, qdrant: QdrantManager, tmp_path: Path):
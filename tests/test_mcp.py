@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import re
 import shutil
 import textwrap
 from pathlib import Path
@@ -55,6 +56,7 @@ class TestMCPServerCreation:
 
         # Core tools should always be present
         assert "ast_query" in tool_names
+        assert "ast_query_batch" in tool_names
         assert "search_symbols" in tool_names
         assert "lookup_symbol" in tool_names
         assert "find_usages" in tool_names
@@ -314,6 +316,15 @@ class TestIndexStatus:
         assert "Total files" in text
         assert "Total symbols" in text
 
+    @pytest.mark.asyncio
+    async def test_index_status_counts_add_up(self, mcp_server):
+        text = _extract_text(await mcp_server.call_tool("index_status", {}))
+        total = int(re.search(r"Total symbols: (\d+)", text).group(1))
+        by_lang = text.split("By language:")[1].split("By type:")[0]
+        by_type = text.split("By type:")[1].split("\n\n")[0]
+        assert sum(int(c) for c in re.findall(r": (\d+) symbols", by_lang)) == total
+        assert sum(int(c) for c in re.findall(r": (\d+)$", by_type, re.M)) == total
+
     @pytest.mark.asyncio
     async def test_status_resource(self, mcp_server):
         results = await mcp_server.read_resource("hammy://status")
@@ -877,6 +888,9 @@ def _extract_text(result) -> str:
     """Extract text content from MCP tool result."""
     if isinstance(result, str):
         return result
+    if isinstance(result, tuple):
+        # Newer FastMCP returns (content blocks, structured output).
+        result = result[0]
     if isinstance(result, list):
         parts = []
         for item in result:
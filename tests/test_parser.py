@@ -617,6 +617,27 @@ class TestCallTracking:
         calls = [e for e in edges if e.relation == RelationType.CALLS]
         assert all(c.metadata.confidence == 0.8 for c in calls)
 
+    def test_nested_calls_in_document_order(self, tmp_path):
+        f = tmp_path / "nested.py"
+        f.write_text("def f():\n    a(b(1))\n    c()\n\n\ndef g():\n    d()\n")
+        tree, lang = ParserFactory(["python"]).parse_file(f)
+        nodes, edges = extract_symbols(tree, lang, "nested.py")
+        f_id = next(n.id for n in nodes if n.name == "f")
+        calls = [e for e in edges if e.relation == RelationType.CALLS]
+        assert [e.metadata.context for e in calls if e.source == f_id] == ["a(b(1))", "b(1)", "c()"]
+        assert len(calls) == 4
+
+    def test_call_edge_matches_explicit_construction(self):
+        from hammy.schema.models import Edge, EdgeMetadata, Node
+        from hammy.tools.languages.helpers import call_edge
+
+        assert call_edge("src", "save", "save(x)") == Edge(
+            source="src",
+            target=Node.make_id("", "save"),
+            relation=RelationType.CALLS,
+            metadata=EdgeMetadata(confidence=0.8, context="save(x)"),
+        )
+
 class TestCommentExtraction:
     """Tests for comment node extraction across languages."""
 
@@ -0,0 +1,55 @@
+"""Tests for the brain recall result cache."""
+
+from __future__ import annotations
+
+from hammy.tools.recall_cache import RecallCache
+
+RESULTS = [{"key": "renew-flow", "content": "Renewals run nightly."}]
+
+
+class TestRecallCache:
+    def test_miss_then_hit(self):
+        cache = RecallCache()
+        assert cache.get("renewal flow", "", "", 5) is None
+        cache.put("renewal flow", "", "", 5, RESULTS)
+        assert cache.get("renewal flow", "", "", 5) is RESULTS
+
+    def test_query_is_normalized(self):
+        cache = RecallCache()
+        cache.put("  Renewal Flow ", "", "", 5, RESULTS)
+        assert cache.get("renewal flow", "", "", 5) is RESULTS
+
+    def test_other_arguments_are_part_of_the_key(self):
+        cache = RecallCache()
+        cache.put("renewal", "", "billing", 5, RESULTS)
+        assert cache.get("renewal", "", "", 5) is None
+        assert cache.get("renewal", "", "billing", 3) is None
+        cache.put("", "Renew-Flow", "", 5, RESULTS)
+        assert cache.get("", "renew-flow", "", 5) is None
+
+    def test_evicts_least_recently_used(self):
+        cache = RecallCache(maxsize=2)
+        cache.put("a", "", "", 5, RESULTS)
+        cache.put("b", "", "", 5, RESULTS)
+        cache.get("a", "", "", 5)
+        cache.put("c", "", "", 5, RESULTS)
+        assert len(cache) == 2
+        assert cache.get("b", "", "", 5) is None
+        assert cache.get("a", "", "", 5) is RESULTS
+
+    def test_expired_entries_miss(self, monkeypatch):
+        import hammy.tools.recall_cache as recall_cache
+
+        now = [100.0]
+        monkeypatch.setattr(recall_cache.time, "monotonic", lambda: now[0])
+        cache = RecallCache(ttl=10)
+        cache.put("a", "", "", 5, RESULTS)
+        now[0] += 11
+        assert cache.get("a", "", "", 5) is None
+        assert len(cache) == 0
+
+    def test_clear(self):
+        cache = RecallCache()
+        cache.put("a", "", "", 5, RESULTS)
+        cache.clear()
+        assert cache.get("a", "", "", 5) is None
@@ -73,6 +73,23 @@ class TestEdge:
         assert edge.metadata.is_bridge is False
         assert edge.metadata.confidence == 1.0
 
+    def test_endpoints_share_node_id_object(self):
+        node_id = Node.make_id("src/app.js", "fetchUsers")
+        node = Node.model_validate({
+            "id": node_id,
+            "type": "function",
+            "name": "fetchUsers",
+            "loc": {"file": "src/app.js", "lines": [10, 25]},
+            "language": "javascript",
+        })
+        edge = Edge.model_validate({
+            "source": "".join([node_id[:8], node_id[8:]]),
+            "target": node_id,
+            "relation": "calls",
+        })
+        assert edge.source is node.id
+        assert edge.target is node.id
+
 
 class TestContextPack:
     def test_empty_context_pack(self):
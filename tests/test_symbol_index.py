@@ -0,0 +1,749 @@
+"""Tests for the precomputed in-memory symbol index."""
+
+from __future__ import annotations
+
+import pytest
+
+from hammy.schema.models import Edge, EdgeMetadata, Location, Node, NodeType, RelationType
+from hammy.tools.symbol_index import (
+    build_symbol_index,
+    callee_name,
+    name_filter,
+    names_matcher,
+    names_pattern,
+    strip_qualifier,
+    word_pattern,
+)
+
+
+def _make_node(
+    name: str,
+    ntype: NodeType = NodeType.FUNCTION,
+    file: str = "src/example.py",
+    language: str = "python",
+    summary: str = "",
+) -> Node:
+    return Node(
+        id=Node.make_id(file, name),
+        type=ntype,
+        name=name,
+        loc=Location(file=file, lines=(1, 10)),
+        language=language,
+        summary=summary,
+    )
+
+
+class TestBuildSymbolIndex:
+    def test_empty(self):
+        idx = build_symbol_index([])
+        assert idx.lowered == []
+
+    def test_casefolds_name_summary_and_file(self):
+        node = _make_node("GetRenew", file="src/Billing.py", summary="Returns The Straße")
+        idx = build_symbol_index([node])
+        assert idx.lowered == [(node, "getrenew", "returns the strasse", "src/billing.py")]
+
+    def test_preserves_node_order(self):
+        nodes = [_make_node("b"), _make_node("a"), _make_node("c")]
+        idx = build_symbol_index(nodes)
+        assert [n for n, *_ in idx.lowered] == nodes
+
+    def test_by_id_and_by_file(self):
+        a = _make_node("a", file="x.py")
+        b = _make_node("b", file="y.py")
+        idx = build_symbol_index([a, b])
+        assert idx.by_id[a.id] is a
+        assert idx.by_file == {"x.py": [a], "y.py": [b]}
+
+    def test_file_language_listing(self):
+        idx = build_symbol_index([
+            _make_node("b", file="b.php", language="php"),
+            _make_node("a", file="a.js", language="javascript"),
+            _make_node("c", file="a.js", language="php"),
+        ])
+        assert idx.file_languages == {"a.js": ["javascript", "php"], "b.php": ["php"]}
+        assert list(idx.file_languages) == ["a.js", "b.php"]
+        assert idx.files_by_language == {"javascript": ["a.js"], "php": ["a.js", "b.php"]}
+
+    def test_postings_are_plain_dicts(self):
+        edge = Edge(source="x", target="t", relation=RelationType.CALLS,
+                    metadata=EdgeMetadata(context="save()"))
+        idx = build_symbol_index([_make_node("save")], [edge, edge])
+        for postings in (idx.by_name, idx.by_type, idx.by_file, idx.name_tokens,
+                         idx.call_tokens, idx.calls_by_source, idx.callee_sources):
+            assert type(postings) is dict
+        assert idx.call_tokens == {"save": [0, 1]}
+        assert idx.callee_sources == {"save": {"x"}}
+
+    def test_files_with_prefix(self):
+        idx = build_symbol_index([
+            _make_node(name, file=file)
+            for name, file in [
+                ("a", "app/Services/Pay.php"), ("b", "app/Http/Kernel.php"),
+                ("c", "apps/x.php"), ("d", "lib/app.php"), ("e", "app/Services/Bill.php"),
+            ]
+        ])
+        assert idx.sorted_files == sorted(idx.by_file)
+        assert idx.files_with_prefix("app/Services/") == [
+            "app/Services/Bill.php", "app/Services/Pay.php",
+        ]
+        assert idx.files_with_prefix("app") == [
+            "app/Http/Kernel.php", "app/Services/Bill.php", "app/Services/Pay.php", "apps/x.php",
+        ]
+        assert idx.files_with_prefix("zzz") == []
+        assert idx.files_with_prefix("") == idx.sorted_files
+
+    def test_by_name_is_case_insensitive_and_skips_comments(self):
+        sym = _make_node("Save")
+        comment = _make_node("save", ntype=NodeType.COMMENT)
+        idx = build_symbol_index([sym, comment])
+        assert idx.by_name == {"save": [sym]}
+
+    def test_comments_by_parent(self):
+        sym = _make_node("save")
+        first = _make_node("TODO: retry", ntype=NodeType.COMMENT)
+        second = _make_node("NOTE: slow", ntype=NodeType.COMMENT, file="b.py")
+        loose = _make_node("file header", ntype=NodeType.COMMENT)
+        first.meta.parent_symbol = second.meta.parent_symbol = "save"
+        idx = build_symbol_index([sym, first, second, loose])
+        assert idx.comments_by_parent == {"save": [first, second]}
+
+    def test_calls_keeps_only_call_edges(self):
+        edges = [
+            Edge(source="a", target="b", relation=RelationType.CALLS,
+                 metadata=EdgeMetadata(context="b()")),
+            Edge(source="a", target="m", relation=RelationType.IMPORTS),
+            Edge(source="c", target="b", relation=RelationType.CALLS),
+        ]
+        idx = build_symbol_index([], edges)
+        assert idx.calls == [("a", "b()", "b"), ("c", "", "")]
+        assert idx.calls_by_source == {"a": [0], "c": [1]}
+
+    def test_call_tokens_index_identifiers(self):
+        edges = [
+            Edge(source="a", target="x", relation=RelationType.CALLS,
+                 metadata=EdgeMetadata(context="$this->Save($item, $item)")),
+            Edge(source="b", target="x", relation=RelationType.CALLS,
+                 metadata=EdgeMetadata(context="saveAll()")),
+        ]
+        idx = build_symbol_index([], edges)
+        assert idx.call_tokens["save"] == [0]
+        assert idx.call_tokens["item"] == [0]
+        assert idx.call_tokens["saveall"] == [1]
+
+
+class TestSelect:
+    def _nodes(self) -> list[Node]:
+        return [
+            _make_node("a", NodeType.FUNCTION, language="python"),
+            _make_node("b", NodeType.METHOD, language="php"),
+            _make_node("c", NodeType.METHOD, language="python"),
+            _make_node("d", NodeType.FUNCTION, language="php"),
+        ]
+
+    def test_no_filters_returns_all(self):
+        idx = build_symbol_index(self._nodes())
+        assert idx.select() is idx.lowered
+
+    def test_language_filter(self):
+        idx = build_symbol_index(self._nodes())
+        assert [n.name for n, *_ in idx.select(language="php")] == ["b", "d"]
+
+    def test_type_filter(self):
+        idx = build_symbol_index(self._nodes())
+        assert [n.name for n, *_ in idx.select(node_type="method")] == ["b", "c"]
+
+    def test_combined_filters(self):
+        idx = build_symbol_index(self._nodes())
+        rows = idx.select(language="python", node_type="method")
+        assert [n.name for n, *_ in rows] == ["c"]
+
+    def test_row_types_and_languages(self):
+        idx = build_symbol_index(self._nodes())
+        assert idx.types == ["function", "method", "method", "function"]
+        assert idx.languages == ["python", "php", "python", "php"]
+
+    def test_unknown_value_returns_empty(self):
+        idx = build_symbol_index(self._nodes())
+        assert idx.select(language="cobol") == []
+
+    def test_positions(self):
+        idx = build_symbol_index(self._nodes())
+        assert list(idx.positions()) == [0, 1, 2, 3]
+        assert list(idx.positions(language="php")) == [1, 3]
+        assert list(idx.positions(language="php", node_type="method")) == [1]
+        assert idx.by_type_language[("function", "php")] == [3]
+
+    def test_meta_lowered(self):
+        node = _make_node("save")
+        node.meta.visibility = "Public"
+        node.meta.return_type = "?User"
+        idx = build_symbol_index([node, _make_node("load")])
+        assert idx.meta_lowered == [("public", "?user"), ("", "")]
+
+
+class TestPatterns:
+    def test_word_pattern_is_whole_word_and_case_insensitive(self):
+        p = word_pattern("save")
+        assert p.search("$this->Save($x)")
+        assert not p.search("saveAll()")
+        assert not p.search("isSaved()")
+
+    def test_word_pattern_is_memoized(self):
+        assert word_pattern("renew") is word_pattern("renew")
+
+    def test_names_pattern_reports_matched_name(self):
+        p = names_pattern(["save", "saveAll"])
+        assert p.search("repo.saveAll(items)").group(1) == "saveAll"
+        assert p.search("repo.save(item)").group(1) == "save"
+        assert p.search("repo.isSaved()") is None
+
+    def test_names_pattern_empty(self):
+        assert names_pattern([]) is None
+        assert names_pattern([""]) is None
+
+    def test_name_filter_is_case_insensitive_and_memoized(self):
+        assert name_filter("^get.*renew").search("GetAutoRenewal")
+        assert name_filter("^get") is name_filter("^get")
+
+    def test_name_filter_invalid_pattern_raises(self):
+        import re
+
+        with pytest.raises(re.error):
+            name_filter("(")
+
+    def test_strip_qualifier(self):
+        assert strip_qualifier("App\\Billing::renew") == "renew"
+        assert strip_qualifier("billing.Plan.renew") == "renew"
+        assert strip_qualifier("billing.Plan.renew", split_dots=False) == "billing.Plan.renew"
+        assert strip_qualifier("renew") == "renew"
+
+
+class TestCached:
+    def test_computes_once_per_key(self):
+        idx = build_symbol_index([])
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return "out"
+
+        assert idx.cached(("tool", 1), compute) == "out"
+        assert idx.cached(("tool", 1), compute) == "out"
+        assert idx.cached(("tool", 2), compute) == "out"
+        assert len(calls) == 2
+
+    def test_evicts_least_recent(self, monkeypatch):
+        import hammy.tools.symbol_index as symbol_index
+
+        monkeypatch.setattr(symbol_index, "OUTPUT_CACHE_SIZE", 2)
+        idx = build_symbol_index([])
+        for key in ("a", "b", "a", "c"):
+            idx.cached((key,), lambda: key)
+        assert list(idx.outputs) == [("a",), ("c",)]
+
+
+class TestStructuralFilter:
+    def _index(self):
+        specs = [
+            ("getUser", NodeType.METHOD, "php", "public", False, ["id"], "User", 3),
+            ("saveUser", NodeType.METHOD, "php", "Private", True, ["u", "opts"], "bool", None),
+            ("fetchAll", NodeType.FUNCTION, "python", None, True, [], "list[User]", 9),
+            ("TODO fix", NodeType.COMMENT, "python", None, False, [], None, None),
+            ("isValid", NodeType.FUNCTION, "python", None, False, ["x"], "bool", 1),
+        ]
+        nodes = []
+        for name, ntype, lang, vis, is_async, params, ret, complexity in specs:
+            n = _make_node(name, ntype=ntype, file=f"src/{name}.{lang}", language=lang)
+            n.meta.visibility = vis
+            n.meta.is_async = is_async
+            n.meta.parameters = params
+            n.meta.return_type = ret
+            n.meta.complexity_score = complexity
+            nodes.append(n)
+        return build_symbol_index(nodes)
+
+    FILTERS = [
+        {},
+        {"node_type": "method"},
+        {"language": "python"},
+        {"visibility": "PRIVATE"},
+        {"async_only": True},
+        {"min_params": 1},
+        {"max_params": 0},
+        {"return_type": "user"},
+        {"name_re": name_filter("^(get|is)")},
+        {"file_filter": "SRC/SAVE"},
+        {"min_complexity": 2},
+        {"language": "php", "min_params": 2, "async_only": True},
+    ]
+
+    def test_filters(self):
+        idx = self._index()
+        assert idx.structural_filter() == [0, 1, 2, 4]
+        assert idx.structural_filter(visibility="private") == [1]
+        assert idx.structural_filter(return_type="USER", min_complexity=5) == [2]
+        assert idx.structural_filter("python", min_params=1) == [4]
+
+    def test_array_filter_matches_row_filter(self, monkeypatch):
+        import hammy.tools.symbol_index as symbol_index
+
+        if not symbol_index._HAS_NP_STRINGS:
+            pytest.skip("needs numpy.strings (NumPy 2.0+)")
+        idx = self._index()
+        rows = [idx.structural_filter(**f) for f in self.FILTERS]
+        assert idx.meta_arrays is None
+        monkeypatch.setattr(symbol_index, "VECTOR_MIN_ROWS", 0)
+        arrays = [idx.structural_filter(**f) for f in self.FILTERS]
+        assert idx.meta_arrays is not None
+        assert arrays == rows
+
+
+class TestWordMatches:
+    def _index(self):
+        return build_symbol_index([
+            _make_node("Cache::save"),
+            _make_node("save_all"),
+            _make_node("save note", NodeType.COMMENT),
+            _make_node("SaveHandler", NodeType.CLASS),
+            _make_node("save", NodeType.METHOD),
+        ])
+
+    def test_identifier_uses_whole_name_tokens(self):
+        idx = self._index()
+        assert [n.name for n in idx.word_matches("SAVE")] == ["Cache::save", "save"]
+        assert idx.name_tokens["cache"] == [0]
+
+    def test_matches_word_pattern_scan(self):
+        idx = self._index()
+        for name in ("save", "cache", "Cache::save", "e::s", "handler", "save_all"):
+            pattern = word_pattern(name)
+            expected = [
+                n for n, *_ in idx.lowered
+                if n.type != NodeType.COMMENT and pattern.search(n.name)
+            ]
+            assert idx.word_matches(name) == expected
+
+    def test_unknown_identifier_in_qualified_name(self, monkeypatch):
+        import hammy.tools.symbol_index as symbol_index
+
+        def no_regex(name):
+            raise AssertionError(f"compiled a pattern for {name!r}")
+
+        monkeypatch.setattr(symbol_index, "word_pattern", no_regex)
+        assert self._index().word_matches("Missing::save") == []
+        assert self._index().calls_naming("Missing::save") == []
+
+    def test_node_type_and_limit(self):
+        idx = self._index()
+        assert [n.name for n in idx.word_matches("save", "method")] == ["save"]
+        assert [n.name for n in idx.word_matches("save", limit=1)] == ["Cache::save"]
+
+
+class TestCallsMentioning:
+    def _index(self):
+        contexts = ["repo.save(x)", "repo.saveAll(xs)", "Cache::save()", "log(x)"]
+        edges = [
+            Edge(source=f"n{i}", target="t", relation=RelationType.CALLS,
+                 metadata=EdgeMetadata(context=ctx))
+            for i, ctx in enumerate(contexts)
+        ]
+        return build_symbol_index([], edges)
+
+    def test_identifier_lookup_is_case_insensitive(self):
+        idx = self._index()
+        assert [s for s, *_ in idx.calls_mentioning(["SAVE"])] == ["n0", "n2"]
+
+    def test_union_keeps_edge_order(self):
+        idx = self._index()
+        assert [s for s, *_ in idx.calls_mentioning(["log", "saveAll"])] == ["n1", "n3"]
+
+    def test_unknown_name(self):
+        assert self._index().calls_mentioning(["delete"]) == []
+
+    def test_non_identifier_is_prechecked_as_substring(self):
+        idx = self._index()
+        assert [s for s, *_ in idx.calls_mentioning(["cache::SAVE"])] == ["n2"]
+        assert idx.calls_mentioning(["repo::save"]) == []
+
+    def test_non_identifier_with_unknown_identifier(self):
+        idx = self._index()
+        assert idx.calls_mentioning(["Cache::delete"]) == []
+        assert idx.calls_naming("Missing::save") == []
+        assert idx.folded_contexts is not None
+
+    def test_non_identifier_mixed_with_identifier(self):
+        idx = self._index()
+        assert [s for s, *_ in idx.calls_mentioning(["Cache::save", "log"])] == ["n2", "n3"]
+
+    def test_calls_naming_is_whole_word(self):
+        idx = self._index()
+        assert [s for s, *_ in idx.calls_naming("Save")] == ["n0", "n2"]
+        assert idx.calls_naming("sav") == []
+
+    def test_calls_naming_qualified_name(self):
+        idx = self._index()
+        assert [s for s, *_ in idx.calls_naming("Cache::save")] == ["n2"]
+
+    def test_callee_sources(self):
+        idx = self._index()
+        assert idx.callee_sources == {
+            "save": {"n0", "n2"}, "saveall": {"n1"}, "log": {"n3"},
+        }
+
+    def test_callers_mentioning_resolves_by_position(self):
+        nodes = [_make_node("handler"), _make_node("job")]
+        edges = [
+            Edge(source=nodes[1].id, target="t", relation=RelationType.CALLS,
+                 metadata=EdgeMetadata(context="repo.save(x)")),
+            Edge(source="unindexed", target="t", relation=RelationType.CALLS,
+                 metadata=EdgeMetadata(context="save()")),
+            Edge(source=nodes[0].id, target="t", relation=RelationType.CALLS,
+                 metadata=EdgeMetadata(context="Cache::save()")),
+        ]
+        idx = build_symbol_index(nodes, edges)
+        assert idx.call_callers == [nodes[1], None, nodes[0]]
+        assert idx.callers_mentioning(["save"]) == [
+            (nodes[1], "repo.save(x)"), (nodes[0], "Cache::save()"),
+        ]
+        assert idx.callers_mentioning(["Cache::save"]) == [(nodes[0], "Cache::save()")]
+
+    def test_usages_filters_on_folded_copies(self):
+        handler = _make_node("handler", file="app/Http/Handler.php")
+        job = _make_node("job", file="app/Jobs/Job.php")
+        edges = [
+            Edge(source=src, target="t", relation=RelationType.CALLS,
+                 metadata=EdgeMetadata(context=ctx))
+            for src, ctx in [
+                (job.id, "repo.save(Issue_Builder)"),
+                ("unindexed", "save()"),
+                (handler.id, "Cache::save($x)"),
+                (handler.id, "repo.Save(issue_builder)"),
+            ]
+        ]
+        idx = build_symbol_index([handler, job], edges)
+        assert idx.folded_files == {"app/Http/Handler.php": "app/http/handler.php",
+                                    "app/Jobs/Job.php": "app/jobs/job.php"}
+        assert idx.usages("save") == [
+            (job, "repo.save(Issue_Builder)"),
+            (handler, "Cache::save($x)"),
+            (handler, "repo.Save(issue_builder)"),
+        ]
+        assert idx.usages("SAVE", argument_filter="ISSUE_builder") == [
+            (job, "repo.save(Issue_Builder)"), (handler, "repo.Save(issue_builder)"),
+        ]
+        assert idx.usages("save", file_filter="HTTP/") == [
+            (handler, "Cache::save($x)"), (handler, "repo.Save(issue_builder)"),
+        ]
+        assert idx.usages("Cache::save", file_filter="jobs") == []
+
+    def test_usages_walks_the_smaller_file_side(self):
+        nodes = [_make_node(f"f{i}", file=f"src/mod{i % 10}.py") for i in range(40)]
+        edges = [
+            Edge(source=nodes[i % 40].id, target="t", relation=RelationType.CALLS,
+                 metadata=EdgeMetadata(context="save()" if i % 3 else f"load({i})"))
+            for i in range(400)
+        ]
+        idx = build_symbol_index(nodes, edges)
+        everything = idx.usages("save")
+        for file_filter in ("MOD3", "mod1", "src/", "missing"):
+            expected = [
+                (n, ctx) for n, ctx in everything
+                if file_filter.casefold() in n.loc.file.casefold()
+            ]
+            assert idx.usages("save", file_filter=file_filter) == expected
+        assert idx.usages("load", argument_filter="99", file_filter="mod9") == [
+            (nodes[19], "load(99)"), (nodes[39], "load(399)"),
+        ]
+
+    def test_calls_from_keeps_edge_order(self):
+        idx = self._index()
+        assert [s for s, *_ in idx.calls_from(["n3", "n0"])] == ["n0", "n3"]
+        assert idx.calls_from(["missing"]) == []
+
+
+class TestCalleeName:
+    def test_last_call_before_paren(self):
+        assert callee_name("$this->repo->Save($x)") == "save"
+        assert callee_name("audit.log(format(x))") == "format"
+
+    def test_falls_back_to_last_segment(self):
+        assert callee_name("Cache::flush") == "flush"
+
+    def test_empty(self):
+        assert callee_name("") == ""
+
+    def test_segment_fallback_whitespace(self):
+        assert callee_name("new  Mailer") == "mailer"
+        assert callee_name("a.b\tc") == "c"
+        assert callee_name("Cache::flush ") == ""
+
+
+class TestNamed:
+    def _index(self):
+        return build_symbol_index([
+            _make_node("Renew", file="src/Billing.py"),
+            _make_node("renew", ntype=NodeType.METHOD, file="src/plan.php", language="php"),
+            _make_node("renew", ntype=NodeType.COMMENT),
+            _make_node("renewAll"),
+        ])
+
+    def test_exact_casefolded_name_in_node_order(self):
+        idx = self._index()
+        assert [n.loc.file for n in idx.named("renew")] == ["src/Billing.py", "src/plan.php"]
+        assert idx.named("missing") == []
+
+    def test_filters(self):
+        idx = self._index()
+        assert [n.language for n in idx.named("renew", language="php")] == ["php"]
+        assert [n.type for n in idx.named("renew", node_type="function")] == [NodeType.FUNCTION]
+        assert [n.name for n in idx.named("renew", file_lower="billing")] == ["Renew"]
+        assert idx.named("renew", language="php", node_type="function") == []
+
+
+class TestSearch:
+    def _index(self):
+        return build_symbol_index([
+            _make_node("getRenewal", summary="renew a plan"),
+            _make_node("renew"),
+            _make_node("renewAll"),
+            _make_node("autoRenewPlan", file="src/billing.py"),
+            _make_node("charge", summary="calls renew when due"),
+            _make_node("renew", ntype=NodeType.COMMENT),
+        ])
+
+    def test_bucket_order_then_name_length(self):
+        results, total = self._index().search("renew")
+        assert [n.name for n in results] == [
+            "renew", "renewAll", "getRenewal", "autoRenewPlan", "charge",
+        ]
+        assert total == 5
+
+    def test_limit_reports_total(self):
+        results, total = self._index().search("renew", limit=2)
+        assert [n.name for n in results] == ["renew", "renewAll"]
+        assert total == 5
+
+    def test_file_filter_is_case_insensitive(self):
+        results, _ = self._index().search("renew", file_filter="BILLING")
+        assert [n.name for n in results] == ["autoRenewPlan"]
+
+    def test_no_match(self):
+        assert self._index().search("invoice") == ([], 0)
+
+    def test_sharded_scan_matches_serial(self, monkeypatch):
+        import hammy.tools.symbol_index as symbol_index
+
+        nodes = [_make_node(f"renew{i % 7}", file=f"src/f{i}.py") for i in range(50)]
+        idx = build_symbol_index(nodes)
+        serial = idx.search("renew", limit=100)
+        monkeypatch.setattr(symbol_index, "_scan_workers", lambda n_rows: 4)
+        assert idx.search("renew", limit=100) == serial
+
+    def test_text_scan_matches_row_scan(self, monkeypatch):
+        import hammy.tools.symbol_index as symbol_index
+
+        nodes = [
+            _make_node(name, ntype=ntype, file=f"src/{name}.py", summary=summary)
+            for name, ntype, summary in [
+                ("renew", NodeType.FUNCTION, "renew renew"),
+                ("charge", NodeType.METHOD, "renews later"),
+                ("renewrenew", NodeType.METHOD, ""),
+                ("autoRenew", NodeType.FUNCTION, "no match"),
+                ("renew later", NodeType.COMMENT, ""),
+                ("Renewal", NodeType.CLASS, "renew"),
+            ]
+        ]
+        idx = build_symbol_index(nodes)
+        queries = [("renew", "", ""), ("renew", "method", ""), ("w", "", "AUTO"), ("", "", "")]
+        text = [idx.search(q, node_type=t, file_filter=f, limit=100) for q, t, f in queries]
+        monkeypatch.setattr(symbol_index, "_COLUMN_SEP", "")
+        rows = [idx.search(q, node_type=t, file_filter=f, limit=100) for q, t, f in queries]
+        assert text == rows
+
+    def test_array_scan_matches_text_scan(self, monkeypatch):
+        import hammy.tools.symbol_index as symbol_index
+
+        if not symbol_index._HAS_NP_STRINGS:
+            pytest.skip("needs numpy.strings (NumPy 2.0+)")
+        nodes = [
+            _make_node(name, ntype=ntype, file=f"src/{name}.py", language=lang, summary=summary)
+            for name, ntype, lang, summary in [
+                ("renew", NodeType.FUNCTION, "python", "renew renew"),
+                ("charge", NodeType.METHOD, "php", "renews later"),
+                ("renewRenew", NodeType.METHOD, "python", ""),
+                ("autoRenew", NodeType.FUNCTION, "php", "no match"),
+                ("renew later", NodeType.COMMENT, "python", ""),
+                ("Renewal", NodeType.CLASS, "python", "renew"),
+                ("Straße", NodeType.CLASS, "python", "renew streets"),
+            ]
+        ]
+        idx = build_symbol_index(nodes)
+        queries = [
+            ("renew", {}),
+            ("renew", {"node_type": "method"}),
+            ("e", {"language": "php"}),
+            ("w", {"file_filter": "AUTO"}),
+            ("ss", {}),
+            ("", {}),
+        ]
+        text = [idx.search(q, limit=3, **f) for q, f in queries]
+        assert idx.name_arrays is None
+        monkeypatch.setattr(symbol_index, "VECTOR_MIN_HITS", 0)
+        arrays = [idx.search(q, limit=3, **f) for q, f in queries]
+        assert idx.name_arrays is not None
+        assert arrays == text
+
+    def test_text_column_stores_ascii_as_bytes(self):
+        import hammy.tools.symbol_index as symbol_index
+
+        if not symbol_index._HAS_NP_STRINGS:
+            pytest.skip("needs numpy.strings (NumPy 2.0+)")
+        ascii_column = symbol_index._text_column(["renew", "", "src/app.py"])
+        assert ascii_column.dtype.kind == "S"
+        assert symbol_index._column_find(ascii_column, "re").tolist() == [0, -1, -1]
+        assert symbol_index._column_find(ascii_column, "é").tolist() == [-1, -1, -1]
+
+        mixed_column = symbol_index._text_column(["renew", "café"])
+        assert mixed_column.dtype.kind == "U"
+        assert symbol_index._column_find(mixed_column, "é").tolist() == [-1, 3]
+
+    def test_array_scan_matches_text_scan_with_non_ascii_names(self, monkeypatch):
+        import hammy.tools.symbol_index as symbol_index
+
+        if not symbol_index._HAS_NP_STRINGS:
+            pytest.skip("needs numpy.strings (NumPy 2.0+)")
+        names = ["café", "cafe", "caféBar", "décafé"]
+        idx = build_symbol_index([_make_node(n, file=f"src/{n}.py") for n in names])
+        queries = [("caf", {}), ("é", {}), ("fé", {"file_filter": "DÉ"})]
+        text = [idx.search(q, **f) for q, f in queries]
+        monkeypatch.setattr(symbol_index, "VECTOR_MIN_HITS", 0)
+        assert [idx.search(q, **f) for q, f in queries] == text
+        assert idx.name_arrays.names.dtype.kind == "U"
+
+    def test_byte_hit_rows(self):
+        import hammy.tools.symbol_index as symbol_index
+
+        if not symbol_index._HAS_NP_STRINGS:
+            pytest.skip("needs numpy.strings (NumPy 2.0+)")
+        np = symbol_index.np
+        values = ["straße", "", "aßa ßa", "ss"]
+        text, _ = symbol_index._join_column(values)
+        buf = np.frombuffer(text.encode(), dtype=np.uint8)
+        lengths = np.array([len(v.encode()) + 1 for v in values])
+        starts = np.cumsum(lengths) - lengths
+
+        def rows(query: str) -> list[int]:
+            return sorted(set(symbol_index._byte_hit_rows(buf, starts, query.encode()).tolist()))
+
+        assert rows("ß") == [0, 2]
+        assert rows("ßa") == [2]
+        assert rows("s") == [0, 3]
+        assert rows("ess") == []
+        assert rows("") == [0, 1, 2, 3]
+
+    def test_text_columns_skip_comments(self):
+        idx = build_symbol_index([
+            _make_node("a"), _make_node("note", ntype=NodeType.COMMENT), _make_node("bc"),
+        ])
+        assert idx.name_text == "a\0bc"
+        assert idx.name_offsets == [0, 2]
+        assert idx.name_rows == [0, 2]
+
+    def test_summary_column_skips_empty_summaries(self):
+        idx = build_symbol_index([
+            _make_node("a"), _make_node("b", summary="Renews"), _make_node("c"),
+            _make_node("d", summary="charges"),
+        ])
+        assert idx.summary_text == "renews\0charges"
+        assert idx.summary_offsets == [0, 7]
+        assert idx.summary_rows == [1, 3]
+
+    def test_small_scans_stay_serial(self):
+        from hammy.tools.symbol_index import PARALLEL_MIN_ROWS, _scan_workers
+
+        assert _scan_workers(PARALLEL_MIN_ROWS - 1) == 1
+
+    def test_exact_matches_filling_limit_skip_scan(self, monkeypatch):
+        import hammy.tools.symbol_index as symbol_index
+
+        nodes = [_make_node("render", file=f"src/v{i}.py") for i in range(3)]
+        nodes.append(_make_node("renderAll"))
+        idx = build_symbol_index(nodes)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("full scan should be skipped")
+
+        monkeypatch.setattr(symbol_index, "_score_rows", fail)
+        results, total = idx.search("RENDER", limit=2)
+        assert results == nodes[:2]
+        assert total is None
+
+
+class TestRender:
+    def test_caches_per_style_and_node(self):
+        node = _make_node("renew")
+        idx = build_symbol_index([node])
+        calls = []
+
+        def fmt(n):
+            calls.append(n.id)
+            return f"fn {n.name}"
+
+        assert idx.render("short", node, fmt) == "fn renew"
+        assert idx.render("short", node, fmt) == "fn renew"
+        assert len(calls) == 1
+        idx.render("long", node, fmt)
+        assert len(calls) == 2
+
+    def test_summary_change_invalidates(self):
+        node = _make_node("renew")
+        idx = build_symbol_index([node])
+
+        def fmt(n):
+            return f"{n.name} | {n.summary}"
+
+        assert idx.render("short", node, fmt) == "renew | "
+        node.summary = "Renews a plan"
+        assert idx.render("short", node, fmt) == "renew | Renews a plan"
+
+
+class TestNamesMatcher:
+    CONTEXTS = [
+        "repo.save(x)",
+        "repo.saveAll(xs)",
+        "repo.isSaved()",
+        "Cache::Save()",
+        "audit.log(save(x))",
+        "a.b.c()",
+        "",
+    ]
+
+    def _expected(self, names):
+        pattern = names_pattern(names)
+        return [
+            m.group(1).casefold() if (m := pattern.search(ctx)) else None
+            for ctx in self.CONTEXTS
+        ]
+
+    def test_regex_path(self):
+        names = ["save", "saveAll", "log"]
+        match = names_matcher(names)
+        assert [match(ctx) for ctx in self.CONTEXTS] == self._expected(names)
+
+    def test_automaton_path_agrees_with_regex(self, monkeypatch):
+        pytest.importorskip("ahocorasick")
+        import hammy.tools.symbol_index as symbol_index
+
+        monkeypatch.setattr(symbol_index, "AHOCORASICK_MIN_NAMES", 1)
+        names = ["save", "saveAll", "log", "a.b", "a", "audit"]
+        match = names_matcher(names)
+        assert [match(ctx) for ctx in self.CONTEXTS] == self._expected(names)
+
+    def test_memoized_per_casefolded_name_set(self):
+        assert names_matcher(["Save", "log"]) is names_matcher({"log", "save"})
+        assert names_matcher(["save"]) is not names_matcher(["save", "log"])
+
+    def test_empty(self):
+        assert names_matcher([]) is None
+        assert names_matcher([""]) is None
@@ -4,6 +4,7 @@ Creates temporary Git repositories as test fixtures.
 """
 
 import subprocess
+import sys
 from pathlib import Path
 
 import pytest
@@ -101,6 +102,48 @@ class TestGitLog:
         assert commits[0].message == "Add JavaScript file"
 
 
+class TestIterLog:
+    def test_matches_log(self, git_repo: Path):
+        wrapper = VCSWrapper(git_repo)
+        assert list(wrapper.iter_log()) == wrapper.log()
+
+    def test_stopping_early_ends_the_command(self, git_repo: Path):
+        wrapper = VCSWrapper(git_repo)
+        commits = wrapper.iter_log()
+        assert next(commits).message == "Update PHP greeting"
+        commits.close()
+
+    def test_failure_raises(self, tmp_path: Path):
+        wrapper = VCSWrapper(tmp_path, vcs_type=VCSType.GIT)  # not a repository
+        with pytest.raises(RuntimeError, match="VCS command failed"):
+            list(wrapper.iter_log())
+
+    def test_log_keeps_a_timeout(self, git_repo: Path, monkeypatch):
+        wrapper = VCSWrapper(git_repo)
+        timeouts = []
+        stream = wrapper._stream
+
+        def spy(cmd, timeout=None):
+            timeouts.append(timeout)
+            return stream(cmd, timeout)
+
+        monkeypatch.setattr(wrapper, "_stream", spy)
+        wrapper.log()
+        list(wrapper.iter_log())
+        assert timeouts == [30, None]
+
+    def test_slow_command_times_out(self, tmp_path: Path):
+        wrapper = VCSWrapper(tmp_path, vcs_type=VCSType.GIT)
+        cmd = [sys.executable, "-c", "import time; print('a', flush=True); time.sleep(30)"]
+        with pytest.raises(subprocess.TimeoutExpired):
+            list(wrapper._stream(cmd, timeout=0.5))
+
+    def test_heavy_stderr_does_not_block(self, tmp_path: Path):
+        wrapper = VCSWrapper(tmp_path, vcs_type=VCSType.GIT)
+        cmd = [sys.executable, "-c", "import sys; sys.stderr.write('w' * 500_000); print('done')"]
+        assert list(wrapper._stream(cmd, timeout=30)) == ["done"]
+
+
 class TestGitBlame:
     def test_blame_returns_lines(self, git_repo: Path):
         wrapper = VCSWrapper(git_repo)
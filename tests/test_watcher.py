@@ -138,6 +138,24 @@ class TestIndexFiles:
         nodes, edges, errors = index_files([txt_file], config, tmp_path)
         assert nodes == []
 
+    def test_relative_paths(self, tmp_path: Path):
+        from hammy.config import HammyConfig
+        from hammy.indexer.code_indexer import index_files
+
+        (tmp_path / "src").mkdir()
+        php_file = tmp_path / "src" / "foo.php"
+        php_file.write_text("<?php\nfunction fooBar() {}\n")
+        outside = tmp_path.parent / f"{tmp_path.name}-outside.php"
+        outside.write_text("<?php\nfunction elsewhere() {}\n")
+
+        config_file = tmp_path / "hammy.yaml"
+        config_file.write_text("project:\n  name: test\nparsing:\n  languages:\n    - php\n")
+        config = HammyConfig.load(tmp_path)
+
+        nodes, edges, errors = index_files([php_file, outside], config, tmp_path)
+        assert {n.loc.file for n in nodes} == {"src/foo.php"}
+        assert len(errors) == 1 and str(outside) in errors[0]
+
 
 # ---------------------------------------------------------------------------
 # process_changed_files — core incremental logic (no filesystem events needed)